@@ -0,0 +1,64 @@
+"""Synthetic task and schedule generators for the benchmark suite"""
+from datetime import date, timedelta
+import json
+import os
+import random
+
+PRIORITIES = ("high", "medium", "low")
+DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday")
+
+
+def parse_size(text):
+    """Convert '1k', '100k' or '1m' to an integer task count"""
+    text = text.strip().lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    return int(text.rstrip('km')) * multiplier
+
+
+def date_span(size):
+    """Number of distinct due dates used for a dataset of ``size`` tasks"""
+    return max(1, min(size // 10, 3650))
+
+
+def generate_tasks(tasks_dir, size, seed=0):
+    """Write ``size`` tasks spread over many due-date shards and return the shard count"""
+    rng = random.Random(seed)
+    os.makedirs(tasks_dir, exist_ok=True)
+    start = date.today() - timedelta(days=date_span(size) // 2)
+    shards = {}
+    for i in range(size):
+        due_date = (start + timedelta(days=i % date_span(size))).isoformat()
+        task_type = "daily" if rng.random() < 0.7 else "monthly"
+        task = {
+            "description": f"Synthetic task {i}",
+            "due_date": due_date,
+            "completed": rng.random() < 0.4,
+            "priority": rng.choice(PRIORITIES)
+        }
+        if rng.random() < 0.2:
+            task["notes"] = "generated"
+        shards.setdefault(due_date, {"daily": [], "monthly": []})[task_type].append(task)
+
+    for due_date, shard in shards.items():
+        with open(os.path.join(tasks_dir, f'tasks_{due_date}.json'), 'w') as f:
+            json.dump(shard, f)
+    return len(shards)
+
+
+def generate_schedule(schedule_path, sessions_per_day=40, seed=0):
+    """Write a dense schedule with overlapping sessions at arbitrary minutes"""
+    rng = random.Random(seed)
+    schedule = {}
+    for day in DAYS:
+        sessions = []
+        for n in range(sessions_per_day):
+            start = rng.randrange(7 * 60, 21 * 60)
+            end = min(start + rng.randrange(15, 180), 24 * 60)
+            sessions.append({
+                "time": f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}",
+                "subject": f"Session {n}"
+            })
+        schedule[day] = sessions
+    os.makedirs(os.path.dirname(schedule_path), exist_ok=True)
+    with open(schedule_path, 'w') as f:
+        json.dump({"schedule": schedule}, f)
@@ -0,0 +1,201 @@
+"""Offline benchmark suite for the Manager task and schedule operations
+
+Usage (from the repository root):
+
+    python -m benchmarks.run --sizes 1k,100k --output results.json
+    python -m benchmarks.run --sizes 1k --compare results.json
+
+Every dataset is generated in a temporary directory; nothing under src/ is
+touched. Interactive prompts are never used: operations go through the
+repository and Manager methods that take their input as arguments.
+"""
+from contextlib import redirect_stdout
+from datetime import datetime
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+  from benchmarks.datasets import generate_schedule, generate_tasks, parse_size
+  from src.config import load_config
+  from src.manager import Manager
+except ImportError:
+  sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+  from datasets import generate_schedule, generate_tasks, parse_size
+  from config import load_config
+  from manager import Manager
+
+
+def make_manager(data_dir, storage):
+    config = load_config(overrides={"data_dir": data_dir, "storage": storage})
+    return Manager(config)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(operation, iterations, time_budget):
+    """Run ``operation`` repeatedly and return latency percentiles and peak memory"""
+    samples = []
+    deadline = time.perf_counter() + time_budget
+    with redirect_stdout(io.StringIO()):
+        for i in range(iterations):
+            started = time.perf_counter()
+            operation()
+            samples.append((time.perf_counter() - started) * 1000)
+            if i >= 2 and time.perf_counter() > deadline:
+                break
+
+        tracemalloc.start()
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "iterations": len(samples),
+        "p50_ms": round(percentile(samples, 0.50), 3),
+        "p90_ms": round(percentile(samples, 0.90), 3),
+        "p99_ms": round(percentile(samples, 0.99), 3),
+        "max_ms": round(max(samples), 3),
+        "peak_kib": round(peak / 1024, 1)
+    }
+
+
+def task_operations(data_dir, storage):
+    """Return (name, callable) pairs exercising the task operations"""
+    warm = make_manager(data_dir, storage)
+    with redirect_stdout(sys.stderr):
+        warm.load_tasks()
+    sink = open(os.devnull, 'w')
+
+    def load_tasks():
+        make_manager(data_dir, storage).load_tasks()
+
+    def view_tasks():
+        with redirect_stdout(sink):
+            warm.view_tasks()
+
+    def view_window():
+        with redirect_stdout(sink):
+            warm.view_tasks(limit=50, pending_only=True, days=7)
+
+    def complete_and_save():
+        entries, _ = warm.repository.window(pending_only=True, limit=1)
+        if entries:
+            warm.repository.complete(*entries[0])
+        warm.save_tasks()
+
+    def remove_and_save():
+        entries, _ = warm.repository.window(limit=1)
+        if entries:
+            warm.repository.remove(*entries[0])
+        warm.save_tasks()
+
+    def plan_tasks():
+        with redirect_stdout(sink):
+            warm.plan_tasks(4)
+
+    def replan_after_complete():
+        blocks, _ = warm.planner.plan()
+        if blocks:
+            warm.repository.complete(blocks[0][3], blocks[0][4])
+            warm.save_tasks()
+        with redirect_stdout(sink):
+            warm.plan_tasks(4)
+
+    return [
+        ("load_tasks", load_tasks),
+        ("view_tasks", view_tasks),
+        ("view_tasks_window", view_window),
+        ("save_tasks", complete_and_save),
+        ("remove_task", remove_and_save),
+        ("plan_tasks", plan_tasks),
+        ("replan_task", replan_after_complete),
+    ]
+
+
+def schedule_operations(data_dir):
+    manager = make_manager(data_dir, "json")
+    manager.load_class_schedule(interactive=False)
+    return [("analyze_schedule", manager.analyze_schedule)]
+
+
+def run(sizes, storages, iterations, time_budget, sessions_per_day):
+    results = []
+    for storage in storages:
+        for size_text in sizes:
+            size = parse_size(size_text)
+            with tempfile.TemporaryDirectory(prefix='time_master_bench_') as data_dir:
+                started = time.perf_counter()
+                shards = generate_tasks(os.path.join(data_dir, 'tasks'), size)
+                print(f"[{storage}] generated {size} tasks in {shards} shards "
+                      f"({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+                for name, operation in task_operations(data_dir, storage):
+                    result = dict(op=name, storage=storage, size=size, shards=shards,
+                                  **measure(operation, iterations, time_budget))
+                    print(f"  {name:<18} p50 {result['p50_ms']:>10.3f} ms  "
+                          f"p99 {result['p99_ms']:>10.3f} ms  peak {result['peak_kib']:>10.1f} KiB",
+                          file=sys.stderr)
+                    results.append(result)
+
+    with tempfile.TemporaryDirectory(prefix='time_master_bench_') as data_dir:
+        generate_schedule(os.path.join(data_dir, 'schedule', 'schedule.json'), sessions_per_day)
+        for name, operation in schedule_operations(data_dir):
+            result = dict(op=name, storage="json", size=sessions_per_day * 6, shards=1,
+                          **measure(operation, iterations, time_budget))
+            print(f"  {name:<18} p50 {result['p50_ms']:>10.3f} ms", file=sys.stderr)
+            results.append(result)
+    return results
+
+
+def compare(results, baseline_path):
+    """Print the p50 ratio of every operation against a saved run"""
+    with open(baseline_path, 'r') as f:
+        baseline = {(r["op"], r["storage"], r["size"]): r for r in json.load(f)["results"]}
+    print(f"\n{'operation':<20}{'storage':<8}{'size':>9}{'before':>12}{'after':>12}{'ratio':>8}")
+    for result in results:
+        before = baseline.get((result["op"], result["storage"], result["size"]))
+        if not before:
+            continue
+        ratio = result["p50_ms"] / before["p50_ms"] if before["p50_ms"] else float('inf')
+        print(f"{result['op']:<20}{result['storage']:<8}{result['size']:>9}"
+              f"{before['p50_ms']:>12.3f}{result['p50_ms']:>12.3f}{ratio:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time Master benchmark suite")
+    parser.add_argument('--sizes', default='1k,100k', help="Comma-separated task counts, e.g. 1k,100k,1m")
+    parser.add_argument('--storage', default='json', help="Comma-separated backends: json,sqlite")
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--time-budget', type=float, default=10.0, help="Seconds per operation before stopping early")
+    parser.add_argument('--sessions-per-day', type=int, default=40)
+    parser.add_argument('--output', help="Write results to this JSON file")
+    parser.add_argument('--compare', help="Compare against a previous results file")
+    args = parser.parse_args()
+
+    results = run(args.sizes.split(','), args.storage.split(','), args.iterations,
+                  args.time_budget, args.sessions_per_day)
+    report = {
+        "created": datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.output}", file=sys.stderr)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
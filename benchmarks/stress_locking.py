@@ -0,0 +1,57 @@
+"""Multi-process stress test for concurrent writers sharing one tasks directory
+
+Usage (from the repository root):
+
+    python -m benchmarks.stress_locking --workers 8 --ops 200
+
+The workers and checks live in tests/concurrency.py, which the test suite
+runs at a smaller scale. At the end a fresh repository must contain every
+task that was added, none that was removed, and every completion and edit;
+otherwise the script lists the lost updates and exits with status 1.
+"""
+from multiprocessing import Pool
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path[:0] = [os.path.join(ROOT, 'src'), os.path.join(ROOT, 'tests')]
+from concurrency import check_results, seed_tasks, worker  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent writers stress test")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--ops', type=int, default=200, help="mutations per worker")
+    parser.add_argument('--seed-tasks', type=int, default=400)
+    parser.add_argument('--days', type=int, default=20, help="distinct due dates, fewer means more conflicts")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        tasks_dir = os.path.join(data_dir, 'tasks')
+        seed_ids = seed_tasks(tasks_dir, args.seed_tasks, args.days)
+
+        started = time.perf_counter()
+        jobs = [(tasks_dir, number, args.workers, args.ops, seed_ids, args.days) for number in range(args.workers)]
+        with Pool(args.workers) as pool:
+            results = pool.map(worker, jobs)
+        elapsed = time.perf_counter() - started
+
+        problems, total = check_results(tasks_dir, len(seed_ids), results)
+        mutations = sum(len(added) + len(completed) + len(edited) + len(removed)
+                        for added, completed, edited, removed in results)
+
+        print(f"{args.workers} workers, {mutations} mutations in {elapsed:.2f} s "
+              f"({mutations / elapsed:.0f}/s), {total} tasks on disk")
+        if problems:
+            print(f"{len(problems)} lost update(s):")
+            for problem in problems[:20]:
+                print(f"  {problem}")
+            sys.exit(1)
+        print("No lost updates")
+
+
+if __name__ == "__main__":
+    main()
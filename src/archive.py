@@ -0,0 +1,146 @@
+try:
+  from task import TASK_TYPES, Task
+  from task_index import ordinal_to_str
+except ImportError:
+  from src.task import TASK_TYPES, Task
+  from src.task_index import ordinal_to_str
+import gzip
+import json
+import lzma
+import os
+import shutil
+import time
+
+COMPRESSIONS = {"gzip": ".ndjson.gz", "lzma": ".ndjson.xz"}
+OPENERS = {".ndjson.gz": gzip.open, ".ndjson.xz": lzma.open}
+PREFIX = 'archive_'
+
+
+class TaskArchive:
+    """Compressed monthly archive of tasks moved out of the hot shards
+
+    Each month lives in ``archive/archive_YYYY-MM.ndjson.gz`` (or ``.xz``),
+    one task per line in the export schema. Both formats allow concatenated
+    streams, so an archiving run copies the existing compressed bytes and
+    appends one new stream to a temporary file, then replaces the month file
+    atomically; nothing already archived is decompressed. If a run stops
+    between writing the archive and removing the tasks from the shards, the
+    next run archives them again and readers skip the repeated ids. Callers
+    hold the repository's exclusive lock across append() and the removal.
+    """
+
+    MARKER = '.last_run'
+
+    def __init__(self, archive_dir, compression="gzip"):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"unknown archive compression {compression!r}, use {' or '.join(COMPRESSIONS)}")
+        self.archive_dir = archive_dir
+        self.compression = compression
+
+    def path(self, month):
+        return os.path.join(self.archive_dir, PREFIX + month + COMPRESSIONS[self.compression])
+
+    def months(self):
+        """Return {YYYY-MM: [paths]} of the archive files on disk"""
+        months = {}
+        try:
+            names = sorted(os.listdir(self.archive_dir))
+        except FileNotFoundError:
+            return months
+        for name in names:
+            for suffix in OPENERS:
+                if name.startswith(PREFIX) and name.endswith(suffix):
+                    month = name[len(PREFIX):-len(suffix)]
+                    months.setdefault(month, []).append(os.path.join(self.archive_dir, name))
+        return months
+
+    def append(self, pairs):
+        """Archive (task_type, task) pairs grouped by due month; return the months written"""
+        by_month = {}
+        for task_type, task in pairs:
+            row = dict(task.to_dict(), type=task_type)
+            by_month.setdefault(task.due_date[:7], []).append(json.dumps(row, ensure_ascii=False) + '\n')
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        opener = OPENERS[COMPRESSIONS[self.compression]]
+        for month, lines in sorted(by_month.items()):
+            path = self.path(month)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                if os.path.exists(path):
+                    with open(path, 'rb') as existing:
+                        shutil.copyfileobj(existing, f)
+                with opener(f, 'wt', encoding='utf-8') as stream:
+                    stream.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        return sorted(by_month)
+
+    def iter_shards(self, start=None, end=None):
+        """Yield (month, shard) of archived Task records, one month at a time
+
+        ``start``/``end`` are date ordinals; months outside them are not
+        opened. Matches the TaskRepository.iter_shards() interface, so the
+        exporter streams the archive the same way as the hot shards.
+        """
+        for month, shard in self._months(start, end):
+            tasks = {task_type: [] for task_type in TASK_TYPES}
+            for task_type, task in shard:
+                if (start is None or task.due >= start) and (end is None or task.due <= end):
+                    tasks[task_type].append(task)
+            if tasks["daily"] or tasks["monthly"]:
+                yield month, tasks
+
+    def search(self, query, start=None, end=None):
+        """Yield (task_type, task) whose description, notes or category contain ``query``"""
+        needle = query.lower()
+        for _, shard in self.iter_shards(start, end):
+            for task_type in TASK_TYPES:
+                for task in shard[task_type]:
+                    text = " ".join(str(task.get(key, "")) for key in ("description", "notes", "category"))
+                    if needle in text.lower():
+                        yield task_type, task
+
+    def _months(self, start, end):
+        low = None if start is None else _month_key(start)
+        high = None if end is None else _month_key(end)
+        for month, paths in sorted(self.months().items()):
+            if (low and month < low) or (high and month > high):
+                continue
+            seen = set()
+            pairs = []
+            for path in paths:
+                opener = OPENERS[next(suffix for suffix in OPENERS if path.endswith(suffix))]
+                with opener(path, 'rt', encoding='utf-8') as stream:
+                    for line in stream:
+                        try:
+                            data = json.loads(line)
+                        except ValueError:
+                            continue
+                        task_id = data.get("id")
+                        if task_id is not None:
+                            if task_id in seen:
+                                continue
+                            seen.add(task_id)
+                        task_type = data.pop("type", "daily")
+                        if task_type not in TASK_TYPES:
+                            task_type = "daily"
+                        pairs.append((task_type, Task.from_dict(task_type, data)))
+            yield month, pairs
+
+    def due(self, interval):
+        """Return True when the last automatic run is older than ``interval`` seconds"""
+        try:
+            return time.time() - os.stat(os.path.join(self.archive_dir, self.MARKER)).st_mtime >= interval
+        except FileNotFoundError:
+            return True
+
+    def mark_run(self):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        with open(os.path.join(self.archive_dir, self.MARKER), 'w'):
+            pass
+
+
+def _month_key(ordinal):
+    return ordinal_to_str(max(ordinal, 1))[:7]
@@ -1,5 +1,14 @@
+import os
+import sys
+
+
 class Colors:
-  def __init__(self):
+  def __init__(self, enabled=None):
+      # Styling is off when stdout is not a terminal or NO_COLOR is set
+      if enabled is None:
+          enabled = sys.stdout.isatty() and 'NO_COLOR' not in os.environ
+      self.enabled = enabled
+
       # Basic colors
       self.RED = '\033[31m'
       self.GREEN = '\033[32m'
@@ -17,6 +26,10 @@ class Colors:
       # Reset
       self.RESET = '\033[0m'
 
+      if not enabled:
+          for name in ('RED', 'GREEN', 'YELLOW', 'WHITE', 'B_C', 'BOLD', 'UNDERLINE', 'STRIKE', 'RESET'):
+              setattr(self, name, '')
+
   # Notification Methods
   def success_msg(self, text):
       return f"{self.GREEN}{text}{self.RESET}"
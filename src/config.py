@@ -0,0 +1,74 @@
+import json
+import os
+
+CONFIG_FILENAME = 'config.json'
+ENV_PREFIX = 'TIME_MASTER_'
+
+DEFAULT_CONFIG = {
+    "storage": "json",
+    "data_dir": None,
+    "database": "tasks.db",
+    "journal_max_bytes": 256 * 1024,
+    "load_workers": 8,
+    "archive_after_days": 90,
+    "archive_auto": False,
+    "archive_compression": "gzip",
+    "daemon_socket": None,
+    "daemon_timeout": 5.0,
+    "api_host": "127.0.0.1",
+    "api_port": 8765,
+    "plan_weeks": 2,
+    "plan_effort": 60,
+    "fast_startup": False,
+    "startup_budget_ms": 250,
+    "profile": False,
+    "profile_output": None,
+    "cprofile_output": None,
+    "days": ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday"],
+    "day_start": "09:00",
+    "day_end": "19:00",
+    "breaks": ["13:00-15:00"],
+}
+
+
+def load_config(base_dir=None, overrides=None):
+    """Merge defaults, the optional config.json and TIME_MASTER_* variables
+
+    Later sources win: built-in defaults, then ``config.json`` (looked up in
+    ``base_dir`` or the file named by ``TIME_MASTER_CONFIG``), then
+    environment variables such as ``TIME_MASTER_STORAGE=sqlite``, then any
+    explicit ``overrides``.
+    """
+    base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+    config = dict(DEFAULT_CONFIG)
+
+    config_path = os.environ.get(ENV_PREFIX + 'CONFIG', os.path.join(base_dir, CONFIG_FILENAME))
+    if os.path.exists(config_path):
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+
+    for key, default in DEFAULT_CONFIG.items():
+        value = os.environ.get(ENV_PREFIX + key.upper())
+        if value is not None:
+            config[key] = _coerce(value, default)
+
+    if overrides:
+        config.update({key: value for key, value in overrides.items() if value is not None})
+
+    if not config["data_dir"]:
+        config["data_dir"] = base_dir
+    config["storage"] = str(config["storage"]).lower()
+    return config
+
+
+def _coerce(value, default):
+    """Convert an environment string to the type of its default value"""
+    if isinstance(default, list):
+        return [item.strip() for item in value.split(',') if item.strip()]
+    if isinstance(default, bool):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    if isinstance(default, int):
+        return int(value)
+    if isinstance(default, float):
+        return float(value)
+    return value
@@ -0,0 +1,127 @@
+try:
+  from color import Colors
+  from daemon_client import forwardable, send_request
+except ImportError:
+  from src.color import Colors
+  from src.daemon_client import forwardable, send_request
+from contextlib import redirect_stderr, redirect_stdout
+import asyncio
+import io
+import json
+import os
+import signal
+import sys
+
+
+class TaskDaemon:
+    """Resident process that keeps one Manager loaded and answers CLI requests
+
+    Requests arrive as one JSON line on a Unix socket: the client's argv and
+    whether it wants colors. They are parsed with the CLI's own parser and
+    run through TimeMaster.handle_arguments() against the resident Manager,
+    one at a time, with stdout and stderr captured into the response. A
+    background task polls the data directory so edits made by other
+    processes are already loaded when the next request arrives.
+    """
+
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, time_master, path):
+        self.time_master = time_master
+        self.path = path
+        self.parser = time_master.build_parser()
+        self.server = None
+
+    def run(self):
+        """Serve until SIGINT/SIGTERM or a stop request; return the exit status"""
+        if send_request(self.path, {"op": "ping"}) is not None:
+            print(Colors().error_msg(f"A daemon is already listening on {self.path}"), file=sys.stderr)
+            return 1
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        try:
+            asyncio.run(self.serve())
+        finally:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        return 0
+
+    async def serve(self):
+        self.refresh()
+        self.server = await asyncio.start_unix_server(self.handle, path=self.path)
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.server.close)
+        print(Colors().success_msg(f"Time Master daemon listening on {self.path}"), file=sys.stderr)
+        watcher = asyncio.create_task(self.watch())
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            watcher.cancel()
+
+    async def watch(self):
+        while True:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            self.refresh()
+
+    def refresh(self):
+        """Pick up shards, journal records and schedule edits made by other processes"""
+        manager = self.time_master.manager
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            try:
+                manager.load_tasks()
+                manager.load_class_schedule(interactive=False)
+            except Exception:
+                pass
+
+    async def handle(self, reader, writer):
+        try:
+            request = json.loads(await reader.readline())
+            if not isinstance(request, dict):
+                raise ValueError("expected a JSON object")
+            argv = request.get("argv", [])
+            if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+                raise ValueError("argv must be a list of strings")
+            if request.get("op") == "stop":
+                response = {"status": 0, "stdout": "", "stderr": ""}
+                self.server.close()
+            elif request.get("op") == "ping":
+                response = {"status": 0, "stdout": "", "stderr": ""}
+            else:
+                response = self.execute(argv, request.get("color", False))
+        except ValueError as e:
+            response = {"status": 2, "stdout": "", "stderr": f"Invalid request: {e}\n"}
+        writer.write(json.dumps(response).encode('utf-8') + b'\n')
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    def execute(self, argv, color):
+        """Run one CLI invocation against the resident Manager and capture its output"""
+        time_master, manager = self.time_master, self.time_master.manager
+        style = Colors(enabled=bool(color))
+        time_master.style = manager.style = manager.repository.style = style
+        stdout, stderr = io.StringIO(), io.StringIO()
+        status = 0
+        stdin = sys.stdin
+        sys.stdin = io.StringIO()
+        try:
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                args = self.parser.parse_args(argv)
+                if not forwardable(args):
+                    print(style.error_msg("This command needs a terminal; run it with --no-daemon"), file=sys.stderr)
+                    status = 2
+                else:
+                    time_master.handle_arguments(args)
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            stderr.write(style.error_msg(f"Daemon error: {e}") + '\n')
+            status = 1
+        finally:
+            sys.stdin = stdin
+        return {"status": status, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
@@ -0,0 +1,50 @@
+import json
+import os
+import socket
+
+SOCKET_NAME = 'time_master.sock'
+DAEMON_COMMANDS = ('tasks', 'schedule', 'summary', 'complete', 'remove', 'edit', 'add_recurring', 'recurring',
+                   'plan', 'search_archive', 'export', 'export_schedule')
+
+
+def socket_path(config):
+    """Return the Unix socket the daemon listens on for this data directory"""
+    return config.get("daemon_socket") or os.path.join(config["data_dir"], SOCKET_NAME)
+
+
+def forwardable(args):
+    """Return True for commands the daemon can answer: non-interactive, output on stdout"""
+    if getattr(args, 'pager', False) or getattr(args, 'output', None) not in (None, '-'):
+        return False
+    return any(getattr(args, name, None) for name in DAEMON_COMMANDS)
+
+
+def send_request(path, request, connect_timeout=0.5, read_timeout=5.0):
+    """Send one request to a running daemon and return its response, or None if none answers
+
+    A daemon that accepts the connection but does not reply within
+    ``read_timeout`` seconds counts as not answering, so the caller runs
+    the command itself instead of hanging.
+    """
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(path):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(connect_timeout)
+        client.connect(path)
+        client.settimeout(read_timeout)
+        client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        chunks = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except OSError:
+        return None
+    finally:
+        client.close()
+    try:
+        return json.loads(b''.join(chunks))
+    except ValueError:
+        return None
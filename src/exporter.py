@@ -0,0 +1,133 @@
+try:
+  from intervals import format_range, format_time, parse_range
+  from task_index import ordinal_to_str
+except ImportError:
+  from src.intervals import format_range, format_time, parse_range
+  from src.task_index import ordinal_to_str
+import csv
+import json
+
+FORMATS = ("ndjson", "csv")
+REPORT_FORMATS = ("json", "tsv")
+TASK_FIELDS = ["id", "type", "description", "due_date", "priority", "completed", "notes", "category", "effort"]
+SESSION_FIELDS = ["day", "time", "subject", "professor", "room"]
+
+
+def task_rows(shards):
+    """Flatten (due_date, shard) pairs into export rows, one shard at a time"""
+    for _, shard in shards:
+        for task_type in ("daily", "monthly"):
+            for task in shard.get(task_type, []):
+                yield dict(task.to_dict(), type=task_type)
+
+
+def session_rows(schedule, days):
+    """Yield one row per session, ordered by weekday then start time"""
+    sessions = schedule.get("schedule", {})
+    for day in days:
+        entries = []
+        for session in sessions.get(day, []):
+            try:
+                start = parse_range(session["time"])
+            except (KeyError, ValueError):
+                continue
+            entries.append((start, session))
+        for interval, session in sorted(entries, key=lambda entry: entry[0]):
+            yield dict(session, day=day, time=format_range(interval))
+
+
+def write_rows(rows, out, fmt, fields):
+    """Stream rows to ``out`` as NDJSON or CSV and return how many were written"""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields, extrasaction='ignore', lineterminator='\n')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False) + '\n')
+            count += 1
+    out.flush()
+    return count
+
+
+def export_tasks(repository, out, fmt):
+    """Write every task in due-date order without loading them all at once"""
+    return write_rows(task_rows(repository.iter_shards()), out, fmt, TASK_FIELDS)
+
+
+def export_schedule(schedule, days, out, fmt):
+    """Write every class session of the weekly schedule"""
+    return write_rows(session_rows(schedule, days), out, fmt, SESSION_FIELDS)
+
+
+def _tsv(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value).replace('\t', ' ').replace('\n', ' ')
+
+
+def write_task_report(entries, summary, out, fmt, offset=0):
+    """Write one window of tasks plus summary counters as JSON or TSV"""
+    if fmt == "json":
+        tasks = [dict(task.to_dict(), type=task_type, number=number)
+                 for number, (task_type, task) in enumerate(entries, offset + 1)]
+        json.dump({"tasks": tasks, "summary": summary}, out, ensure_ascii=False)
+        out.write('\n')
+    else:
+        fields = ["number"] + TASK_FIELDS
+        out.write('\t'.join(fields) + '\n')
+        for number, (task_type, task) in enumerate(entries, offset + 1):
+            row = dict(task.to_dict(), type=task_type, number=number)
+            out.write('\t'.join(_tsv(row.get(field)) for field in fields) + '\n')
+    out.flush()
+
+
+def write_plan_report(blocks, summary, out, fmt):
+    """Write planner blocks plus summary counters as JSON or TSV"""
+    rows = [{"date": ordinal_to_str(ordinal), "start": format_time(begin), "end": format_time(end),
+             "part": part, "parts": parts, "late": bool(task.due) and ordinal > task.due,
+             "task": dict(task.to_dict(), type=task_type)}
+            for ordinal, begin, end, task_type, task, part, parts in blocks]
+    if fmt == "json":
+        json.dump({"plan": rows, "summary": summary}, out, ensure_ascii=False)
+        out.write('\n')
+    else:
+        fields = ["date", "start", "end", "part", "parts", "late"] + TASK_FIELDS
+        out.write('\t'.join(fields) + '\n')
+        for row in rows:
+            row.update(row.pop("task"))
+            out.write('\t'.join(_tsv(row.get(field)) for field in fields) + '\n')
+    out.flush()
+
+
+def write_schedule_report(schedule, free_slots, days, out, fmt):
+    """Write sessions and free slots of every weekday as JSON or TSV"""
+    sessions_by_day = {day: [] for day in days}
+    for row in session_rows(schedule, days):
+        sessions_by_day[row.pop("day")].append(row)
+
+    if fmt == "json":
+        report = {
+            day: {
+                "sessions": sessions_by_day[day],
+                "free": [format_range(slot) for slot in free_slots.get(day, [])]
+            }
+            for day in days
+        }
+        json.dump({"schedule": report}, out, ensure_ascii=False)
+        out.write('\n')
+    else:
+        fields = ["day", "kind", "time", "subject", "professor", "room"]
+        out.write('\t'.join(fields) + '\n')
+        for day in days:
+            for session in sessions_by_day[day]:
+                row = dict(session, day=day, kind="session")
+                out.write('\t'.join(_tsv(row.get(field)) for field in fields) + '\n')
+            for slot in free_slots.get(day, []):
+                out.write('\t'.join([day, "free", format_range(slot), '', '', '']) + '\n')
+    out.flush()
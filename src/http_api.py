@@ -0,0 +1,369 @@
+try:
+  from color import Colors
+  from exporter import write_schedule_report
+  from task_index import date_ordinal, today_ordinal
+except ImportError:
+  from src.color import Colors
+  from src.exporter import write_schedule_report
+  from src.task_index import date_ordinal, today_ordinal
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import base64
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import traceback
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class APIError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ThreadOutput:
+    """Stand-in for sys.stdout/sys.stderr that sends one thread's writes to its own buffer
+
+    contextlib.redirect_stdout() swaps the process-wide stream, so in the
+    threaded server it would also capture the request log lines and any
+    output of the other handler threads. Threads that are not capturing
+    write to the wrapped stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def target(self):
+        buffer = getattr(self.local, "buffer", None)
+        return self.stream if buffer is None else buffer
+
+    def write(self, text):
+        return self.target().write(text)
+
+    def flush(self):
+        self.target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+    @classmethod
+    @contextmanager
+    def capture(cls, name, buffer):
+        """Send this thread's writes to ``sys.<name>`` into ``buffer``, installing the wrapper once"""
+        stream = getattr(sys, name)
+        if not isinstance(stream, cls):
+            stream = cls(stream)
+            setattr(sys, name, stream)
+        stream.local.buffer = buffer
+        try:
+            yield
+        finally:
+            stream.local.buffer = None
+
+
+def task_json(task_type, task):
+    return dict(task.to_dict(), type=task_type)
+
+
+def encode_cursor(due, skip):
+    return base64.urlsafe_b64encode(f"{due}:{skip}".encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (due ordinal, tasks to skip on that date) from an opaque cursor"""
+    try:
+        due, skip = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii').split(':')
+        return int(due), int(skip)
+    except (ValueError, UnicodeDecodeError):
+        raise APIError(HTTPStatus.BAD_REQUEST, "invalid cursor") from None
+
+
+class TaskAPI:
+    """Local JSON API over a Manager, served by the stdlib ThreadingHTTPServer
+
+    ``GET /tasks`` pages through a date range with an opaque cursor: the due
+    date of the last task returned plus how many tasks of that date were
+    already seen, so tasks added or removed on earlier dates never shift
+    later pages. Every GET response carries an ETag computed from the
+    repository version (manifest hashes and journal signature for JSON
+    shards, the file signature for SQLite) or the schedule file signature,
+    so a matching If-None-Match is answered with 304 before the body is
+    built. Writes call the same Manager methods as the CLI. The Manager is
+    not thread-safe, so every request holds one lock while it uses it; the
+    console messages of a Manager call are captured for the calling thread
+    only (see ThreadOutput), so error messages can be returned to the
+    client. Every error, including an
+    unexpected exception (500), is answered with a JSON ``{"error": ...}``.
+    """
+
+    def __init__(self, manager, host="127.0.0.1", port=8765):
+        self.manager = manager
+        # Messages captured from the Manager become JSON error strings, never ANSI-styled
+        manager.style = manager.repository.style = Colors(enabled=False)
+        self.lock = threading.Lock()
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            server_version = "TimeMaster"
+
+            def do_GET(self):
+                api.dispatch(self, "GET")
+
+            def do_POST(self):
+                api.dispatch(self, "POST")
+
+            def do_PATCH(self):
+                api.dispatch(self, "PATCH")
+
+            def do_DELETE(self):
+                api.dispatch(self, "DELETE")
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self):
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server.server_close()
+
+    def dispatch(self, handler, method):
+        url = urlsplit(handler.path)
+        parts = [part for part in url.path.split('/') if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            with self.lock:
+                route = self.route(method, parts)
+                if method == "GET":
+                    etag = f'"{route[1](query)}"'
+                    if etag in [tag.strip() for tag in handler.headers.get('If-None-Match', '').split(',')]:
+                        self.respond(handler, HTTPStatus.NOT_MODIFIED, None, {"ETag": etag})
+                        return
+                    self.respond(handler, HTTPStatus.OK, route[0](query), {"ETag": etag})
+                else:
+                    status, body = route[0](self.read_body(handler) if method in ("POST", "PATCH") else None)
+                    self.respond(handler, status, body)
+        except APIError as e:
+            self.respond(handler, e.status, {"error": str(e)})
+        except Exception as e:
+            # Still answer in JSON rather than dropping the connection; the traceback goes to the server log
+            handler.log_error("%s %s failed:\n%s", method, url.path, traceback.format_exc())
+            self.respond(handler, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"internal error: {e}"})
+
+    def route(self, method, parts):
+        """Return the handler for a request: (body, etag) functions for GET, one function otherwise"""
+        if parts == ["tasks"]:
+            if method == "GET":
+                return self.list_tasks, self.tasks_etag
+            if method == "POST":
+                return (self.create_task,)
+        elif len(parts) == 2 and parts[0] == "tasks":
+            task_id = parts[1]
+            if method == "GET":
+                return (lambda query: self.task_or_404(task_id)), (lambda query: self.task_etag(task_id))
+            if method == "PATCH":
+                return (lambda body: self.edit_task(task_id, body),)
+            if method == "DELETE":
+                return (lambda body: self.remove_task(task_id),)
+        elif len(parts) == 3 and parts[0] == "tasks" and parts[2] == "complete" and method == "POST":
+            return (lambda body: self.complete_task(parts[1]),)
+        elif parts == ["summary"] and method == "GET":
+            return (lambda query: self.manager.repository.summary()), (lambda query: f"{self.version()}-{today_ordinal()}")
+        elif parts == ["schedule"] and method == "GET":
+            return self.schedule, self.schedule_etag
+        elif parts == ["plan"] and method == "GET":
+            return self.plan, self.plan_etag
+        raise APIError(HTTPStatus.NOT_FOUND, f"no route for {method} /{'/'.join(parts)}")
+
+    @staticmethod
+    def read_body(handler):
+        try:
+            length = int(handler.headers.get('Content-Length') or 0)
+        except ValueError:
+            raise APIError(HTTPStatus.BAD_REQUEST, "invalid Content-Length") from None
+        try:
+            body = json.loads(handler.rfile.read(length) or b'{}')
+        except ValueError as e:
+            raise APIError(HTTPStatus.BAD_REQUEST, f"invalid JSON: {e}") from None
+        if not isinstance(body, dict):
+            raise APIError(HTTPStatus.BAD_REQUEST, "expected a JSON object")
+        return body
+
+    @staticmethod
+    def respond(handler, status, body, headers=None):
+        payload = b'' if body is None else json.dumps(body, ensure_ascii=False).encode('utf-8')
+        handler.send_response(status)
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        if body is not None:
+            handler.send_header('Content-Type', 'application/json; charset=utf-8')
+        handler.send_header('Content-Length', str(len(payload)))
+        handler.end_headers()
+        if payload:
+            handler.wfile.write(payload)
+
+    @staticmethod
+    def date_range(query):
+        bounds = []
+        for key in ("start", "end"):
+            value = query.get(key)
+            ordinal = date_ordinal(value) if value else None
+            if value and not ordinal:
+                raise APIError(HTTPStatus.BAD_REQUEST, f"invalid {key} date {value!r}, use YYYY-MM-DD")
+            bounds.append(ordinal)
+        return bounds
+
+    def version(self, start=None, end=None):
+        return self.manager.repository.version(start, end)
+
+    def tasks_etag(self, query):
+        start, end = self.date_range(query)
+        canonical = "&".join(f"{key}={query[key]}" for key in sorted(query))
+        return hashlib.sha1(f"{self.version(start, end)}?{canonical}".encode('utf-8')).hexdigest()
+
+    def list_tasks(self, query):
+        """One page of tasks due in [start, end], optionally pending only"""
+        start, end = self.date_range(query)
+        pending_only = query.get("pending", "").lower() in ("1", "true", "yes")
+        try:
+            limit = min(max(int(query.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        except ValueError:
+            raise APIError(HTTPStatus.BAD_REQUEST, "limit must be an integer") from None
+        repository = self.manager.repository
+        first, skip = decode_cursor(query["cursor"]) if query.get("cursor") else (start, 0)
+
+        entries, _ = repository.window(first, end, pending_only, skip, limit + 1)
+        matching = repository.window(start, end, pending_only, 0, 0)[1]
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            last_due = entries[-1][1].due
+            seen = sum(1 for _, task in entries if task.due == last_due)
+            if last_due == first:
+                seen += skip
+            next_cursor = encode_cursor(last_due, seen)
+        return {"tasks": [task_json(*entry) for entry in entries], "matching": matching,
+                "next_cursor": next_cursor}
+
+    def task_or_404(self, task_id):
+        """Return a stored task, a recurring occurrence or a recurring rule as JSON"""
+        recurring = self.manager.recurring
+        if '@' in task_id:
+            task = recurring.get(task_id)
+            if task is None:
+                raise APIError(HTTPStatus.NOT_FOUND, f"no occurrence {task_id}")
+            return task_json(task.task_type, task)
+        rule = recurring.rules().get(task_id)
+        if rule is not None:
+            # The completion bitmask is storage detail; occurrences carry their own 'completed'
+            return dict({key: value for key, value in rule.items() if key != "done"}, id=task_id)
+        entry = self.manager.repository.get(task_id)
+        if entry is None:
+            raise APIError(HTTPStatus.NOT_FOUND, f"no task with id {task_id}")
+        return task_json(*entry)
+
+    def task_etag(self, task_id):
+        task = self.task_or_404(task_id)
+        if '@' in task_id or task_id in self.manager.recurring.rules():
+            version = self.manager.recurring.version()
+        else:
+            ordinal = date_ordinal(task["due_date"])
+            version = self.version(ordinal, ordinal)
+        return hashlib.sha1(f"{version}#{task_id}".encode('utf-8')).hexdigest()
+
+    def schedule(self, query):
+        self.manager.load_class_schedule(interactive=False)
+        out = io.StringIO()
+        write_schedule_report(self.manager.class_schedule, self.manager.free_slots, self.manager.days, out, "json")
+        return json.loads(out.getvalue())
+
+    def schedule_etag(self, query):
+        try:
+            stat = os.stat(self.manager.schedule_path)
+            signature = f"{stat.st_mtime_ns}-{stat.st_size}"
+        except FileNotFoundError:
+            signature = "none"
+        return hashlib.sha1(f"{signature}|{self.manager.days}".encode('utf-8')).hexdigest()
+
+    def weeks(self, query):
+        try:
+            weeks = int(query.get("weeks") or self.manager.config["plan_weeks"])
+        except ValueError:
+            raise APIError(HTTPStatus.BAD_REQUEST, "weeks must be an integer") from None
+        if not 1 <= weeks <= 52:
+            raise APIError(HTTPStatus.BAD_REQUEST, "weeks must be between 1 and 52")
+        return weeks
+
+    def plan(self, query):
+        """Pending tasks assigned to the free slots of the next ``weeks`` weeks"""
+        out = io.StringIO()
+        self.manager.plan_tasks(self.weeks(query), "json", out)
+        return json.loads(out.getvalue())
+
+    def plan_etag(self, query):
+        # Only the first free slot moves with the clock: today's slots are clipped at the current minute
+        today, _, slots = self.manager.plan_window(self.weeks(query))
+        signature = f"{self.version()}|{self.manager.recurring.version()}|{self.schedule_etag(query)}"
+        return hashlib.sha1(f"{signature}|{today}|{slots[:1]}|{self.weeks(query)}".encode('utf-8')).hexdigest()
+
+    def call(self, method, *args):
+        """Run a Manager method, turning a failure into an APIError with its message
+
+        The arguments come from the request, so a value of the wrong type
+        that the Manager trips over is the client's error too.
+        """
+        errors = io.StringIO()
+        try:
+            with ThreadOutput.capture("stdout", io.StringIO()), ThreadOutput.capture("stderr", errors):
+                result = method(*args)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise APIError(HTTPStatus.BAD_REQUEST, f"invalid request: {e}") from None
+        if not result:
+            message = errors.getvalue().strip() or "request failed"
+            status = HTTPStatus.NOT_FOUND if message.startswith(("No task with id", "No occurrence")) else HTTPStatus.BAD_REQUEST
+            raise APIError(status, message)
+        return result
+
+    def create_task(self, body):
+        _, task = self.call(self.manager.create_task, body)
+        return HTTPStatus.CREATED, self.task_or_404(task.id)
+
+    def edit_task(self, task_id, body):
+        assignments = []
+        for field, value in body.items():
+            if value is None:
+                # Like `--edit ID notes=`: clears notes, category or effort, and is rejected elsewhere
+                value = ""
+            elif isinstance(value, bool):
+                value = "true" if value else "false"
+            elif not isinstance(value, (str, int, float)):
+                raise APIError(HTTPStatus.BAD_REQUEST, f"invalid {field}: expected a string, number, boolean or null")
+            assignments.append(f"{field}={value}")
+        if not assignments:
+            raise APIError(HTTPStatus.BAD_REQUEST, "nothing to change")
+        self.call(self.manager.edit_task_by_id, task_id, assignments)
+        return HTTPStatus.OK, self.task_or_404(task_id)
+
+    def complete_task(self, task_id):
+        self.call(self.manager.complete_task_by_id, task_id)
+        return HTTPStatus.OK, self.task_or_404(task_id)
+
+    def remove_task(self, task_id):
+        self.call(self.manager.remove_task_by_id, task_id)
+        return HTTPStatus.NO_CONTENT, None
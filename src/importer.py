@@ -0,0 +1,125 @@
+try:
+  from task import PRIORITIES, TRUE_VALUES, Task, parse_effort
+  from task_index import date_ordinal, ordinal_to_str
+except ImportError:
+  from src.task import PRIORITIES, TRUE_VALUES, Task, parse_effort
+  from src.task_index import date_ordinal, ordinal_to_str
+from collections import defaultdict
+import csv
+import json
+import os
+import time
+
+FORMATS = ("csv", "ndjson")
+
+
+def detect_format(path, requested=None):
+    """Pick the input format from the explicit option or the file extension"""
+    if requested:
+        return requested
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return "csv"
+    if extension in ('.ndjson', '.jsonl'):
+        return "ndjson"
+    raise ValueError(f"Cannot infer import format of {path!r}; use --import-format")
+
+
+def read_rows(stream, fmt):
+    """Yield (line number, row dict) pairs without reading the whole input"""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, e
+            continue
+        yield line_number, row
+
+
+def _text(row, key, default="", numbers=False):
+    """Return a row value as stripped text, rejecting other types (numbers too unless ``numbers``)"""
+    value = row.get(key)
+    if value is None or value == "":
+        return default
+    allowed = (str, int, float) if numbers else str
+    if isinstance(value, bool) or not isinstance(value, allowed):
+        raise ValueError(f"invalid {key} {value!r}, expected text")
+    return str(value).strip()
+
+
+def parse_row(row):
+    """Validate one input row and return (task_type, task); raise ValueError on any invalid value"""
+    if not isinstance(row, dict):
+        raise ValueError("row is not an object")
+    task_type = (_text(row, "type") or _text(row, "task_type") or "daily").lower()
+    if task_type not in ("daily", "monthly"):
+        raise ValueError(f"invalid type {task_type!r}")
+    description = _text(row, "description")
+    if not description:
+        raise ValueError("missing description")
+    due_date = _text(row, "due_date")
+    ordinal = date_ordinal(due_date)
+    if not ordinal or ordinal_to_str(ordinal) != due_date:
+        raise ValueError(f"invalid due_date {row.get('due_date')!r}, use YYYY-MM-DD")
+    priority = (_text(row, "priority") or "medium").lower()
+    if priority not in PRIORITIES:
+        raise ValueError(f"invalid priority {priority!r}")
+    completed = row.get("completed", False)
+    if isinstance(completed, str):
+        completed = completed.strip().lower() in TRUE_VALUES
+    elif completed is None or completed in (0, 1):
+        completed = bool(completed)
+    else:
+        raise ValueError(f"invalid completed {completed!r}")
+
+    extra = {key: _text(row, key, numbers=True) for key in ("notes", "category") if _text(row, key, numbers=True)}
+    effort = _text(row, "effort", numbers=True)
+    if effort:
+        extra["effort"] = parse_effort(effort)
+    return task_type, Task(task_type, description, due_date, completed, priority, extra)
+
+
+class ImportReport:
+    """Counters collected while importing a batch of tasks"""
+
+    def __init__(self):
+        self.rows = 0
+        self.imported = 0
+        self.shards = 0
+        self.rejected = []
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def import_tasks(repository, stream, fmt):
+    """Stream rows into memory grouped by due date, then store them in one batch"""
+    report = ImportReport()
+    by_date = defaultdict(list)
+    for line_number, row in read_rows(stream, fmt):
+        report.rows += 1
+        try:
+            if isinstance(row, Exception):
+                raise ValueError(f"invalid JSON: {row}")
+            task_type, task = parse_row(row)
+        except ValueError as e:
+            report.rejected.append((line_number, str(e)))
+            continue
+        by_date[task.due].append((task_type, task))
+
+    if by_date:
+        repository.add_many(pair for due_date in sorted(by_date) for pair in by_date[due_date])
+    report.imported = sum(len(pairs) for pairs in by_date.values())
+    report.shards = len(by_date)
+    report.elapsed = time.perf_counter() - report.started
+    return report
@@ -0,0 +1,87 @@
+from bisect import bisect_right
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def parse_time(text):
+    """Convert 'HH:MM' or 'HH' to minutes since midnight"""
+    hours, _, minutes = text.strip().partition(':')
+    value = int(hours) * 60 + int(minutes or 0)
+    if not 0 <= value <= MINUTES_PER_DAY or not 0 <= int(minutes or 0) < 60:
+        raise ValueError(f"Invalid time: {text!r}")
+    return value
+
+
+def parse_range(text):
+    """Convert 'HH:MM-HH:MM' (or the legacy 'HH-HH') to a (start, end) pair"""
+    start, sep, end = text.partition('-')
+    if not sep:
+        raise ValueError(f"Invalid time range: {text!r}")
+    start, end = parse_time(start), parse_time(end)
+    if start >= end:
+        raise ValueError(f"Time range must end after it starts: {text!r}")
+    return start, end
+
+
+def format_time(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_range(interval):
+    """Convert a (start, end) pair back to 'HH:MM-HH:MM'"""
+    return f"{format_time(interval[0])}-{format_time(interval[1])}"
+
+
+def merge_intervals(intervals):
+    """Sort intervals and merge the ones that overlap or touch"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_intervals(busy, window_start, window_end):
+    """Return the gaps inside a window not covered by merged busy intervals"""
+    free = []
+    cursor = window_start
+    for start, end in busy:
+        if end <= cursor:
+            continue
+        if start >= window_end:
+            break
+        if start > cursor:
+            free.append((cursor, start))
+        cursor = max(cursor, end)
+    if cursor < window_end:
+        free.append((cursor, window_end))
+    return free
+
+
+class DayAvailability:
+    """Busy and free time of one weekday
+
+    Sessions are merged once in O(n log n). Conflict and free-range checks
+    are then a bisect over the sorted interval ends or starts.
+    """
+
+    def __init__(self, sessions, window, breaks=()):
+        self.window = window
+        self.busy = merge_intervals(sessions)
+        self.blocked = merge_intervals(list(self.busy) + list(breaks))
+        self.free = free_intervals(self.blocked, *window)
+        self._busy_ends = [end for _, end in self.busy]
+        self._free_starts = [start for start, _ in self.free]
+
+    def conflicts(self, start, end):
+        """Return True when [start, end) overlaps a scheduled session"""
+        idx = bisect_right(self._busy_ends, start)
+        return idx < len(self.busy) and self.busy[idx][0] < end
+
+    def is_free(self, start, end):
+        """Return True when [start, end) lies entirely inside one free slot"""
+        idx = bisect_right(self._free_starts, start) - 1
+        return idx >= 0 and self.free[idx][1] >= end
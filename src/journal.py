@@ -0,0 +1,55 @@
+import json
+import os
+
+
+class TaskJournal:
+    """Append-only log of task mutations stored next to the shards
+
+    Each line is one compact JSON record carrying a monotonically increasing
+    ``seq``. A line cut short by an interrupted write is ignored on replay.
+    """
+
+    FILENAME = 'journal.ndjson'
+
+    def __init__(self, tasks_dir):
+        self.path = os.path.join(tasks_dir, self.FILENAME)
+
+    def append(self, records):
+        """Append records with a single write and flush them to disk"""
+        if not records:
+            return
+        payload = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def records(self):
+        """Yield the records in the log, skipping malformed lines"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            return
+
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def truncate(self):
+        """Drop every record once they have been folded into the shards"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,66 @@
+try:
+  import fcntl
+except ImportError:
+  fcntl = None
+from contextlib import contextmanager
+import os
+import threading
+
+
+class FileLock:
+    """Advisory fcntl lock shared by every process using the same data directory
+
+    ``shared()`` lets readers overlap, ``exclusive()`` serialises writers.
+    Holds nest within a process (a shared request inside an exclusive hold
+    keeps the exclusive lock), and threads of one process take turns on an
+    RLock before touching the file lock. Without fcntl (Windows) only the
+    in-process lock is taken.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+        self._depth = 0
+        self._mode = None
+        self._thread_lock = threading.RLock()
+
+    @contextmanager
+    def shared(self):
+        self._acquire(fcntl.LOCK_SH if fcntl else 'shared')
+        try:
+            yield
+        finally:
+            self._release()
+
+    @contextmanager
+    def exclusive(self):
+        self._acquire(fcntl.LOCK_EX if fcntl else 'exclusive')
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _acquire(self, mode):
+        self._thread_lock.acquire()
+        try:
+            if fcntl and (self._depth == 0 or (mode == fcntl.LOCK_EX and self._mode == fcntl.LOCK_SH)):
+                if self._fd is None:
+                    os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                    self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, mode)
+                self._mode = mode
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._depth += 1
+
+    def _release(self):
+        self._depth -= 1
+        try:
+            if self._depth == 0 and self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+                os.close(self._fd)
+                self._fd = None
+                self._mode = None
+        finally:
+            self._thread_lock.release()
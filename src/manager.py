@@ -1,61 +1,89 @@
 try:
+  from archive import TaskArchive
   from color import Colors
+  from config import load_config
+  from exporter import export_schedule, export_tasks, write_plan_report, write_schedule_report, write_task_report
+  from importer import detect_format, import_tasks, parse_row
+  from intervals import MINUTES_PER_DAY, DayAvailability, format_range, parse_range, parse_time
+  from locking import FileLock
+  from planner import WEEKDAYS, Planner, plan_slots
+  from profiling import profiled
+  from repository import TaskRepository
+  from recurrence import RULE_FIELDS, RecurringTasks
+  from schedule_cache import ScheduleCache
+  from sqlite_store import SQLiteTaskRepository
+  from task import Task, parse_changes
+  from task_index import ordinal_to_str, today_ordinal
 except ImportError:
+  from src.archive import TaskArchive
   from src.color import Colors
+  from src.config import load_config
+  from src.exporter import export_schedule, export_tasks, write_plan_report, write_schedule_report, write_task_report
+  from src.importer import detect_format, import_tasks, parse_row
+  from src.intervals import MINUTES_PER_DAY, DayAvailability, format_range, parse_range, parse_time
+  from src.locking import FileLock
+  from src.planner import WEEKDAYS, Planner, plan_slots
+  from src.profiling import profiled
+  from src.repository import TaskRepository
+  from src.recurrence import RULE_FIELDS, RecurringTasks
+  from src.schedule_cache import ScheduleCache
+  from src.sqlite_store import SQLiteTaskRepository
+  from src.task import Task, parse_changes
+  from src.task_index import ordinal_to_str, today_ordinal
 from datetime import datetime
+import heapq
 import json
 import os
 import sys
 
 
 class Manager:
-    def __init__(self):
+    ARCHIVE_INTERVAL = 24 * 60 * 60
+
+    def __init__(self, config=None):
         self.style = Colors()
         self.current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.schedule_dir = os.path.join(self.current_dir, 'schedule')
-        self.tasks_dir = os.path.join(self.current_dir, 'tasks')
+        self.config = config or load_config(self.current_dir)
+        self.data_dir = self.config["data_dir"]
+        self.schedule_dir = os.path.join(self.data_dir, 'schedule')
+        self.tasks_dir = os.path.join(self.data_dir, 'tasks')
         self.schedule_path = os.path.join(self.schedule_dir, 'schedule.json')
-        self.tasks = {"daily": [], "monthly": []}
-
-    def load_class_schedule(self):
-        """Load the class schedule from JSON file"""
+        self.days = [day.lower() for day in self.config["days"]]
+        self.day_window = (parse_time(self.config["day_start"]), parse_time(self.config["day_end"]))
+        self.breaks = [parse_range(item) for item in self.config["breaks"]]
+        self.schedule_cache = ScheduleCache(self.schedule_path)
+        self.class_schedule = None
+        self.free_slots = {}
+        self.availability = {}
+        self.repository = self.create_repository()
+        self.archive = TaskArchive(os.path.join(self.data_dir, 'archive'), self.config["archive_compression"])
+        self._archive_checked = False
+        self.lock = getattr(self.repository, "lock", None) or FileLock(os.path.join(self.tasks_dir, '.lock'))
+        self.recurring = RecurringTasks(self.tasks_dir, self.lock)
+        self.planner = Planner(self.config["plan_effort"])
+        self._plan_state = None
+
+    @property
+    def tasks(self):
+        """All tasks grouped by type, built on first access after a change"""
+        return self.repository.tasks
+
+    @profiled("load_class_schedule")
+    def load_class_schedule(self, interactive=True):
+        """Load the class schedule, re-reading schedule.json only when it changed"""
         try:
-            with open(self.schedule_path, 'r', encoding='utf-8') as file:
-                self.class_schedule = json.load(file)
+            schedule, changed = self.schedule_cache.load()
+            if changed or self.class_schedule is None:
+                self.class_schedule = schedule
                 self.analyze_schedule()
         except FileNotFoundError:
-            print(self.style.warning_msg("No class schedule found!"))
+            if self.class_schedule is not None:
+                return
             self.class_schedule = {"schedule": {}}
-            self.handle_missing_schedule()
-
-    def save_tasks(self):
-        """Save tasks to separate JSON files based on due dates"""
-        self.load_tasks()
-        try:
-            tasks_by_date = {}
-
-            for task_type in ["daily", "monthly"]:
-                for task in self.tasks[task_type]:
-                    due_date = task["due_date"]
-                    if due_date not in tasks_by_date:
-                        tasks_by_date[due_date] = {"daily": [], "monthly": []}
-                    tasks_by_date[due_date][task_type].append(task)
-
-            for file in os.listdir(self.tasks_dir):
-                if file.endswith('.json'):
-                    os.remove(os.path.join(self.tasks_dir, file))
-
-            for due_date, tasks in tasks_by_date.items():
-                filename = os.path.join(self.tasks_dir, f'tasks_{due_date}.json')
-                try:
-                    with open(filename, 'w') as f:
-                        json.dump(tasks, f, indent=4)
-                    print(self.style.success_msg(f"Saved tasks for {due_date}"))
-                except Exception as e:
-                    print(self.style.error_msg(f"Error writing to file {filename}: {e}"))
-
-        except Exception as e:
-            print(self.style.error_msg(f"Error saving tasks: {e}"))
+            self.analyze_schedule()
+            if interactive:
+                print(self.style.warning_msg("No class schedule found!"))
+                self.handle_missing_schedule()
 
     def handle_missing_schedule(self):
         """Handle the scenario where schedule.json is missing"""
@@ -71,8 +99,8 @@ class Manager:
 
                 if choice == "1":
                     try:
-                        self.load_class_schedule()
                         self.class_schedule = {"schedule": {}}
+                        self.analyze_schedule()
                         self.modify_schedule()
                         if self.class_schedule["schedule"]:
                             break
@@ -85,7 +113,6 @@ class Manager:
                 elif choice == "2":
                     while True:
                         try:
-                            self.load_class_schedule()
                             print(self.style.info_msg("\nTip: Press 'Ctrl+C' to cancel import and return to menu"))
                             filepath = input("Enter the path to the existing schedule.json file: ").strip()
 
@@ -148,33 +175,45 @@ class Manager:
         if not hasattr(self, 'class_schedule') or not self.class_schedule.get("schedule"):
             self.class_schedule = {"schedule": {}}
 
+    @profiled("analyze_schedule")
     def analyze_schedule(self):
         """Analyze class schedule to find free time slots"""
-        self.load_class_schedule()
-        self.free_slots = {
-            "monday": [], "tuesday": [], "wednesday": [],
-            "thursday": [], "friday": [], "saturday": []
-        }
-
-        time_slots = ["09-11", "11-13", "15-17", "17-19"]
-
-        for day in self.free_slots.keys():
-            day_schedule = self.class_schedule.get('schedule', {}).get(day, [])
-            busy_times = [class_info['time'] for class_info in day_schedule]
-
-            for slot in time_slots:
-                if slot not in busy_times:
-                    self.free_slots[day].append(slot)
+        self.free_slots = {}
+        self.availability = {}
+        for day in self.days:
+            self.analyze_day(day)
+
+    def analyze_day(self, day):
+        """Merge one day's sessions and recompute its free intervals"""
+        sessions = []
+        for class_info in self.class_schedule.get('schedule', {}).get(day, []):
+            interval = self.session_range(class_info)
+            if interval[0] < MINUTES_PER_DAY:
+                sessions.append(interval)
+            else:
+                print(self.style.warning_msg(f"Skipping session with invalid time on {day}: {class_info.get('time')}"),
+                      file=sys.stderr)
+        self.availability[day] = DayAvailability(sessions, self.day_window, self.breaks)
+        self.free_slots[day] = self.availability[day].free
+
+    @staticmethod
+    def session_range(class_info):
+        """Return a session's (start, end) minutes, sorting unparsable times last"""
+        try:
+            return parse_range(class_info['time'])
+        except (KeyError, ValueError):
+            return (MINUTES_PER_DAY, MINUTES_PER_DAY)
 
+    @profiled("display_schedule")
     def display_schedule(self):
         """Display weekly schedule with classes and free slots"""
         self.load_class_schedule()
         print(self.style.header_msg("\n=== Weekly Schedule ==="))
-        for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday"]:
+        for day in self.days:
             print(f"\n{self.style.bold_msg(day.upper())}:")
             print(self.style.info_msg("Classes:"))
-            if day in self.class_schedule.get('schedule', {}):
-                for class_info in self.class_schedule['schedule'][day]:
+            if self.class_schedule.get('schedule', {}).get(day):
+                for class_info in sorted(self.class_schedule['schedule'][day], key=self.session_range):
                     print(f"  {self.style.info_msg(class_info['time'])}: "
                             f"{self.style.bold_msg(class_info['subject'])} - "
                             f"Room: {self.style.info_msg(class_info.get('room', 'N/A'))}")
@@ -184,7 +223,7 @@ class Manager:
             print(self.style.info_msg("Free Slots:"))
             if self.free_slots.get(day):
                 for slot in self.free_slots[day]:
-                    print(f"  {self.style.info_msg(slot)}: "
+                    print(f"  {self.style.info_msg(format_range(slot))}: "
                             f"{self.style.success_msg('Available for study/tasks')}")
             else:
                 print(self.style.warning_msg("  No free slots."))
@@ -215,59 +254,24 @@ class Manager:
             else:
                 print(self.style.error_msg("Invalid choice!"))
 
-    def save_tasks(self):
-        """Save tasks to separate JSON files based on due dates"""
-        self.load_tasks()
-        try:
-            tasks_by_date = {}
-
-            for task_type in ["daily", "monthly"]:
-                for task in self.tasks[task_type]:
-                    due_date = task["due_date"]
-                    if due_date not in tasks_by_date:
-                        tasks_by_date[due_date] = {"daily": [], "monthly": []}
-                    tasks_by_date[due_date][task_type].append(task)
-
-            tasks_dir = os.path.join(self.tasks_dir)
-            if not os.path.exists(tasks_dir):
-                os.makedirs(tasks_dir)
-                print(self.style.success_msg(f"Created directory: {tasks_dir}"))
-
-            for due_date, tasks in tasks_by_date.items():
-                filename = os.path.join(tasks_dir, f'tasks_{due_date}.json')
-                try:
-                    with open(filename, 'w') as f:
-                        json.dump(tasks, f, indent=4)
-                    print(self.style.success_msg(f"Saved tasks for {due_date} to {filename}"))
-                except Exception as e:
-                    print(self.style.error_msg(f"Error writing to file {filename}: {e}"))
+    def create_repository(self):
+        """Build the task storage backend selected by the 'storage' setting"""
+        if self.config["storage"] == "sqlite":
+            db_path = os.path.join(self.data_dir, self.config["database"])
+            return SQLiteTaskRepository(db_path, self.tasks_dir, self.style)
+        return TaskRepository(self.tasks_dir, self.style, self.config["journal_max_bytes"],
+                              self.config["load_workers"])
 
-        except Exception as e:
-            print(self.style.error_msg(f"Error saving tasks: {e}"))
+    @profiled("save_tasks")
+    def save_tasks(self):
+        """Persist the due-date shards changed since the last load"""
+        self.repository.save()
 
+    @profiled("load_tasks")
     def load_tasks(self):
-        """Load tasks from all JSON files in the tasks directory"""
-        try:
-            self.tasks = {"daily": [], "monthly": []}
-
-            if not os.path.exists(self.tasks_dir):
-                os.makedirs(self.tasks_dir)
-                return
-
-            for filename in os.listdir(self.tasks_dir):
-                if filename.endswith('.json'):
-                    filepath = os.path.join(self.tasks_dir, filename)
-                    try:
-                        with open(filepath, 'r') as f:
-                            date_tasks = json.load(f)
-                            self.tasks["daily"].extend(date_tasks.get("daily", []))
-                            self.tasks["monthly"].extend(date_tasks.get("monthly", []))
-                    except Exception as e:
-                        print(self.style.error_msg(f"Error loading {filename}: {e}"))
-
-        except Exception as e:
-            print(self.style.error_msg(f"Error loading tasks: {e}"))
-            self.tasks = {"daily": [], "monthly": []}
+        """Refresh tasks from disk, re-reading only shards that changed"""
+        self.auto_archive()
+        self.repository.refresh()
 
     def get_priority(self, current_priority=None):
         """Helper method to get priority from user input"""
@@ -294,7 +298,6 @@ class Manager:
             return "medium"
 
     def mark_task_complete(self):
-        self.load_tasks()
         self.view_tasks()
         if not self.task_list:
             print(self.style.warning_msg("No tasks to mark as complete."))
@@ -305,10 +308,8 @@ class Manager:
                 print(self.style.error_msg("Invalid task number!"))
                 return
 
-            task_type, idx, task = self.task_list[task_number]
-            task['completed'] = True
-
-            self.tasks[task_type][idx] = task
+            task_type, task = self.task_list[task_number]
+            self.repository.complete(task_type, task)
 
             self.save_tasks()
             print(self.style.success_msg("Task marked as complete!"))
@@ -322,14 +323,21 @@ class Manager:
         print(self.style.header_msg("\nAdd a Session"))
 
         day = input(self.style.info_msg("Enter day (e.g., monday): ")).lower()
-        valid_days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday"]
-        if day not in valid_days:
+        if day not in self.days:
             print(self.style.error_msg("Invalid day!"))
             return
 
-        time_slot = input(self.style.info_msg("Enter time slot (e.g., 09-11): "))
-        if time_slot not in ["09-11", "11-13", "15-17", "17-19"]:
-            print(self.style.error_msg("Invalid time slot!"))
+        time_slot = input(self.style.info_msg("Enter time range (e.g., 08:30-10:15): "))
+        try:
+            start, end = parse_range(time_slot)
+        except ValueError:
+            print(self.style.error_msg("Invalid time range! Please use HH:MM-HH:MM"))
+            return
+        time_slot = format_range((start, end))
+        if day not in self.availability:
+            self.analyze_day(day)
+        if self.availability[day].conflicts(start, end):
+            print(self.style.warning_msg("A session already exists at that time."))
             return
 
         subject = input(self.style.info_msg("Enter subject: "))
@@ -349,13 +357,9 @@ class Manager:
         if day not in self.class_schedule['schedule']:
             self.class_schedule['schedule'][day] = []
 
-        existing_times = [s['time'] for s in self.class_schedule['schedule'][day]]
-        if time_slot in existing_times:
-            print(self.style.warning_msg("A session already exists at that time."))
-            return
-
         self.class_schedule['schedule'][day].append(session)
-        self.analyze_schedule()
+        self.schedule_cache.mark_modified(self.class_schedule)
+        self.analyze_day(day)
         print(self.style.success_msg("Session added successfully."))
 
     def remove_session(self):
@@ -382,7 +386,8 @@ class Manager:
             session_num = int(input(self.style.info_msg("Enter the session number to remove: "))) - 1
             if 0 <= session_num < len(day_schedule):
                 removed_session = day_schedule.pop(session_num)
-                self.analyze_schedule()
+                self.schedule_cache.mark_modified(self.class_schedule)
+                self.analyze_day(day)
                 print(self.style.success_msg(
                     f"Removed session: {removed_session['subject']} at {removed_session['time']}")
                 )
@@ -391,28 +396,30 @@ class Manager:
         except ValueError:
             print(self.style.error_msg("Invalid input! Please enter a number."))
 
+    @profiled("save_class_schedule")
     def save_class_schedule(self):
         """Save the class schedule to 'schedule.json'"""
-        self.load_class_schedule()
         try:
-            schedule_dir = os.path.dirname(self.schedule_path)
-            if not os.path.exists(schedule_dir):
-                os.makedirs(schedule_dir)
-
-            with open(self.schedule_path, 'w', encoding='utf-8') as f:
-                json.dump(self.class_schedule, f, indent=4)
+            self.schedule_cache.save(self.class_schedule)
             print(self.style.success_msg("Schedule saved successfully."))
         except Exception as e:
             print(self.style.error_msg(f"Error saving schedule: {e}"))
 
-    def view_tasks(self):
-        """Display tasks in a formatted way with clear organization"""
+    @profiled("view_tasks")
+    def view_tasks(self, limit=None, offset=0, pending_only=False, days=None):
+        """Display tasks in a formatted way with clear organization
+
+        Only the requested window (``offset``/``limit``, optionally limited to
+        pending tasks or to the next ``days`` days) is formatted; the summary
+        comes from the repository counters.
+        """
         self.load_tasks()
-        def format_date(date_str):
+        today = today_ordinal()
+
+        def format_date(task):
             """Format and add status to date based on proximity"""
-            task_date = datetime.strptime(date_str, "%Y-%m-%d")
-            today = datetime.now()
-            days_until = (task_date.date() - today.date()).days
+            date_str = task.due_date
+            days_until = task.due - today
 
             if days_until < 0:
                 return f"{date_str} {self.style.error_msg('(OVERDUE)')}"
@@ -423,62 +430,176 @@ class Manager:
             else:
                 return date_str
 
-        self.task_list = []
-        all_tasks = []
-        for idx, task in enumerate(self.tasks["daily"]):
-            all_tasks.append(('daily', idx, task))
-        for idx, task in enumerate(self.tasks["monthly"]):
-            all_tasks.append(('monthly', idx, task))
-
-        # Sort tasks
-        all_tasks = sorted(all_tasks, key=lambda x: (
-            x[2]['due_date'],
-            x[2].get('completed', False)
-        ))
+        start, end = (today, today + days - 1) if days else (None, None)
+        self.task_list, matching = self.task_window(start, end, pending_only, offset, limit)
 
         current_date_str = datetime.now().strftime("%Y-%m-%d")
-        print(self.style.header_msg("\n" + "=" * 60))
-        print(self.style.header_msg(f"Task List (Current Date: {current_date_str})"))
-        print(self.style.header_msg("=" * 60))
+        lines = [
+            self.style.header_msg("\n" + "=" * 60),
+            self.style.header_msg(f"Task List (Current Date: {current_date_str})"),
+            self.style.header_msg("=" * 60)
+        ]
 
-        if not all_tasks:
-            print(self.style.warning_msg("\nNo tasks."))
+        if not self.task_list:
+            lines.append(self.style.warning_msg("\nNo tasks."))
         else:
             current_date = None
-            task_number = 1
-            for task_type, idx, task in all_tasks:
-                if task['due_date'] != current_date:
-                    current_date = task['due_date']
-                    formatted_date = format_date(current_date)
-                    print(f"\n  {self.style.bold_msg('Due Date:')} {formatted_date}")
-
-                status = self.style.success_msg("✓") if task.get("completed", False) else self.style.error_msg("×")
-                description = task['description']
-                priority = self.style.priority_msg(task.get('priority', 'normal'))
-
-                print(f"    {self.style.info_msg(str(task_number))}. [{status}] [{priority}] "
-                        f"({self.style.bold_msg(task_type)}) {description}")
-
-                if 'notes' in task and task['notes']:
-                    print(f"      {self.style.info_msg('Notes:')} {task['notes']}")
-                if 'category' in task and task['category']:
-                    print(f"      {self.style.info_msg('Category:')} {task['category']}")
-
-                self.task_list.append((task_type, idx, task))
-                task_number += 1
-
-            total_tasks = len(all_tasks)
-            completed_tasks = sum(1 for _, _, task in all_tasks if task.get("completed", False))
-            pending_tasks = total_tasks - completed_tasks
-            completion_percentage = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
+            for task_number, (task_type, task) in enumerate(self.task_list, offset + 1):
+                if task.due != current_date:
+                    current_date = task.due
+                    lines.append(f"\n  {self.style.bold_msg('Due Date:')} {format_date(task)}")
+
+                status = self.style.success_msg("✓") if task.completed else self.style.error_msg("×")
+                priority = self.style.priority_msg(task.priority or 'normal')
+                lines.append(f"    {self.style.info_msg(str(task_number))}. [{status}] [{priority}] "
+                             f"({self.style.bold_msg(task_type)}) {task.description} "
+                             f"{self.style.info_msg('#' + str(task.id))}")
+
+                if task.get('notes'):
+                    lines.append(f"      {self.style.info_msg('Notes:')} {task.get('notes')}")
+                if task.get('category'):
+                    lines.append(f"      {self.style.info_msg('Category:')} {task.get('category')}")
+                if task.get('effort'):
+                    lines.append(f"      {self.style.info_msg('Effort:')} {task.get('effort')} min")
+
+            if len(self.task_list) < matching:
+                lines.append(self.style.info_msg(
+                    f"\n  Showing {offset + 1}-{offset + len(self.task_list)} of {matching} matching tasks"
+                ))
 
-            print(self.style.header_msg("\n" + "-" * 60))
-            print(self.style.bold_msg("Summary:"))
-            print(f"  {self.style.info_msg('Total Tasks:')} {total_tasks}")
-            print(f"  {self.style.success_msg('Completed:')} {completed_tasks}")
-            print(f"  {self.style.warning_msg('Pending:')} {pending_tasks}")
-            print(f"  {self.style.info_msg('Progress:')} {completion_percentage:.1f}%")
-            print(self.style.header_msg("-" * 60 + "\n"))
+        total_tasks, completed_tasks = self.repository.stats()
+        if total_tasks:
+            pending_tasks = total_tasks - completed_tasks
+            completion_percentage = (completed_tasks / total_tasks) * 100
+
+            lines.append(self.style.header_msg("\n" + "-" * 60))
+            lines.append(self.style.bold_msg("Summary:"))
+            lines.append(f"  {self.style.info_msg('Total Tasks:')} {total_tasks}")
+            lines.append(f"  {self.style.success_msg('Completed:')} {completed_tasks}")
+            lines.append(f"  {self.style.warning_msg('Pending:')} {pending_tasks}")
+            lines.append(f"  {self.style.info_msg('Progress:')} {completion_percentage:.1f}%")
+            lines.append(self.style.header_msg("-" * 60 + "\n"))
+
+        print("\n".join(lines))
+        return matching
+
+    def task_window(self, start=None, end=None, pending_only=False, offset=0, limit=None):
+        """Return (entries, matching) for one page of stored tasks plus recurring occurrences
+
+        Occurrences are generated only for a bounded range; an open-ended
+        listing shows stored tasks alone.
+        """
+        if start is None or end is None or not self.recurring.rules():
+            return self.repository.window(start, end, pending_only, offset, limit)
+        occurrences = self.recurring.occurrences(start, end, pending_only)
+        stop = None if limit is None else offset + limit
+        stored, matching = self.repository.window(start, end, pending_only, 0, stop)
+        merged = heapq.merge(stored, occurrences, key=lambda entry: (entry[1].due, entry[1].completed))
+        entries = list(merged)[offset:stop]
+        return entries, matching + len(occurrences)
+
+    @profiled("write_tasks")
+    def write_tasks(self, fmt, limit=None, offset=0, pending_only=False, days=None, out=None):
+        """Write a task window as JSON or TSV, bypassing the styling layer"""
+        self.load_tasks()
+        today = today_ordinal()
+        start, end = (today, today + days - 1) if days else (None, None)
+        entries, matching = self.task_window(start, end, pending_only, offset, limit)
+        total, completed = self.repository.stats()
+        summary = {"total": total, "completed": completed, "pending": total - completed, "matching": matching}
+        write_task_report(entries, summary, out or sys.stdout, fmt, offset)
+
+    def plan_window(self, weeks):
+        """Return (today, end, free slots) of the next ``weeks`` weeks; the part of today already past is not free"""
+        self.load_class_schedule(interactive=False)
+        now = datetime.now()
+        today = now.toordinal()
+        end = today + 7 * weeks - 1
+        return today, end, plan_slots(self.free_slots, today, end, now.hour * 60 + now.minute)
+
+    def update_plan(self, weeks):
+        """Re-plan the next ``weeks`` weeks, re-reading tasks only when the repository changed"""
+        today, end, slots = self.plan_window(weeks)
+        state = (self.repository.version(), self.recurring.version(), today, end)
+        entries = None
+        if state != self._plan_state:
+            entries = self.repository.window(None, None, True)[0]
+            if self.recurring.rules():
+                entries = entries + self.recurring.occurrences(today, end, True)
+            self._plan_state = state
+        self.planner.update(slots, entries)
+        return today, end
+
+    @profiled("plan_tasks")
+    def plan_tasks(self, weeks=None, fmt="text", out=None):
+        """Fill the free slots of the coming weeks with pending tasks and print the plan
+
+        Tasks go by priority, then due date; each takes ``effort`` minutes (or
+        the 'plan_effort' default) from the earliest free time left, split
+        across slots when needed. Nothing is written back to the tasks.
+        """
+        weeks = self.config["plan_weeks"] if weeks is None else weeks
+        if weeks < 1:
+            print(self.style.error_msg("--weeks must be at least 1"), file=sys.stderr)
+            return None
+        self.load_tasks()
+        start, end = self.update_plan(weeks)
+        blocks, summary = self.planner.plan()
+        out = out or sys.stdout
+        if fmt in ("json", "tsv"):
+            write_plan_report(blocks, dict(summary, start=ordinal_to_str(start), end=ordinal_to_str(end)), out, fmt)
+            return summary
+
+        print(self.style.header_msg(f"\n=== Plan {ordinal_to_str(start)} to {ordinal_to_str(end)} ==="), file=out)
+        if not blocks:
+            print(self.style.warning_msg("\nNothing to plan." if not summary["pending"] else "\nNo free slots."),
+                  file=out)
+        current = None
+        for ordinal, begin, finish, task_type, task, part, parts in blocks:
+            if ordinal != current:
+                current = ordinal
+                print(f"\n{self.style.bold_msg(WEEKDAYS[(ordinal - 1) % 7].upper())} {ordinal_to_str(ordinal)}", file=out)
+            due = f"due {task.due_date}"
+            if task.due and ordinal > task.due:
+                due = self.style.error_msg(f"{due} (LATE)")
+            split = f" part {part}/{parts}" if parts > 1 else ""
+            print(f"  {self.style.info_msg(format_range((begin, finish)))} "
+                  f"[{self.style.priority_msg(task.priority or 'normal')}] {task.description}{split} "
+                  f"{due} {self.style.info_msg('#' + str(task.id))}", file=out)
+
+        print(self.style.header_msg("\n" + "-" * 60), file=out)
+        print(f"  {self.style.success_msg('Planned:')} {summary['planned']} task(s), "
+              f"{summary['planned_minutes']} of {summary['free_minutes']} free minutes", file=out)
+        if summary["partial"]:
+            print(f"  {self.style.warning_msg('Partly planned:')} {summary['partial']} task(s)", file=out)
+        print(f"  {self.style.warning_msg('Not planned:')} {summary['unplanned']} pending task(s)", file=out)
+        return summary
+
+    @profiled("write_schedule")
+    def write_schedule(self, fmt, out=None):
+        """Write sessions and free slots as JSON or TSV, bypassing the styling layer"""
+        self.load_class_schedule(interactive=False)
+        write_schedule_report(self.class_schedule, self.free_slots, self.days, out or sys.stdout, fmt)
+
+    def page_tasks(self, page_size=20, pending_only=False, days=None):
+        """Browse tasks one page at a time"""
+        offset = 0
+        while True:
+            matching = self.view_tasks(page_size, offset, pending_only, days)
+            if matching <= page_size:
+                return
+            choice = input(self.style.info_msg("[n]ext, [p]revious, [f]irst, [q]uit: ")).strip().lower()
+            if choice in ('n', ''):
+                if offset + page_size < matching:
+                    offset += page_size
+            elif choice == 'p':
+                offset = max(offset - page_size, 0)
+            elif choice == 'f':
+                offset = 0
+            elif choice == 'q':
+                return
+            else:
+                print(self.style.error_msg("Invalid choice!"))
 
     def add_task(self):
         """Add a new task with color formatting and back option"""
@@ -552,20 +673,14 @@ class Manager:
             print(self.style.warning_msg("Task creation cancelled."))
             return
 
-        task = {
-            "description": description,
-            "due_date": due_date,
-            "completed": False,
-            "priority": priority
-        }
+        task = Task(task_type, description, due_date, False, priority)
 
-        self.tasks[task_type].append(task)
+        self.repository.add(task_type, task)
         self.save_tasks()
         print(self.style.success_msg("Task added successfully!"))
 
     def edit_task(self):
         """Edit an existing task with color formatting and back option"""
-        self.load_tasks()
         self.view_tasks()
         if not self.task_list:
             print(self.style.warning_msg("No tasks to edit."))
@@ -588,8 +703,8 @@ class Manager:
             except ValueError:
                 print(self.style.error_msg("Please enter a valid number"))
 
-        task_type, idx, task = self.task_list[task_number]
-        print(f"\n{self.style.header_msg('Editing task:')} {self.style.bold_msg(task['description'])}")
+        task_type, task = self.task_list[task_number]
+        print(f"\n{self.style.header_msg('Editing task:')} {self.style.bold_msg(task.description)}")
 
         while True:
             new_description = input(self.style.info_msg("New description (press Enter to keep current): "))
@@ -616,7 +731,7 @@ class Manager:
             except ValueError:
                 print(self.style.error_msg("Invalid date format! Please use YYYY-MM-DD"))
 
-        current_priority = task.get('priority', 'medium')
+        current_priority = task.priority or 'medium'
         while True:
             print(self.style.header_msg("\nPriority Levels:"))
             print(f"{self.style.info_msg('1.')} {self.style.bold_msg('High')}")
@@ -642,9 +757,9 @@ class Manager:
 
         print("\nProposed Changes:")
         if new_description:
-            print(f"Description: {self.style.bold_msg(task['description'])} → {self.style.bold_msg(new_description)}")
+            print(f"Description: {self.style.bold_msg(task.description)} → {self.style.bold_msg(new_description)}")
         if new_due_date:
-            print(f"Due Date: {self.style.bold_msg(task['due_date'])} → {self.style.bold_msg(new_due_date)}")
+            print(f"Due Date: {self.style.bold_msg(task.due_date)} → {self.style.bold_msg(new_due_date)}")
         if priority != current_priority:
             print(f"Priority: {self.style.bold_msg(current_priority)} → {self.style.bold_msg(priority)}")
 
@@ -653,19 +768,19 @@ class Manager:
             print(self.style.warning_msg("Task editing cancelled."))
             return
 
+        was = task.to_dict()
         if new_description:
-            task['description'] = new_description
+            task.description = new_description
         if new_due_date:
-            task['due_date'] = new_due_date
-        task['priority'] = priority
+            task.due_date = new_due_date
+        task.priority = priority
 
-        self.tasks[task_type][idx] = task
+        self.repository.update(task_type, task, was["due_date"], was)
         self.save_tasks()
         print(self.style.success_msg("Task updated successfully!"))
 
     def remove_task(self):
         """Remove a task with color formatting and confirmation"""
-        self.load_tasks()
         self.view_tasks()
         if not self.task_list:
             print(self.style.warning_msg("No tasks to remove."))
@@ -677,12 +792,12 @@ class Manager:
                 print(self.style.error_msg("Invalid task number!"))
                 return
 
-            task_type, idx, task = self.task_list[task_number]
+            task_type, task = self.task_list[task_number]
 
             print("\nTask to remove:")
-            print(f"Description: {self.style.bold_msg(task['description'])}")
-            print(f"Due Date: {self.style.bold_msg(task['due_date'])}")
-            print(f"Priority: {self.style.bold_msg(task.get('priority', 'medium'))}")
+            print(f"Description: {self.style.bold_msg(task.description)}")
+            print(f"Due Date: {self.style.bold_msg(task.due_date)}")
+            print(f"Priority: {self.style.bold_msg(task.priority or 'medium')}")
             print(f"Type: {self.style.bold_msg(task_type)}")
 
             confirm = input(self.style.warning_msg("\nAre you sure you want to remove this task? (y/n): ")).lower()
@@ -690,20 +805,278 @@ class Manager:
                 print(self.style.info_msg("Task removal cancelled."))
                 return
 
-            self.tasks[task_type].pop(idx)
-            
-            if os.path.exists(self.tasks_dir):
-                for file in os.listdir(self.tasks_dir):
-                    if file.endswith('.json'):
-                        os.remove(os.path.join(self.tasks_dir, file))
-            
+            self.repository.remove(task_type, task)
             self.save_tasks()
 
-            self.load_tasks()
-            
-            print(self.style.success_msg(f"Successfully removed task: {task['description']}"))
+            print(self.style.success_msg(f"Successfully removed task: {task.description}"))
 
         except ValueError:
             print(self.style.error_msg("Invalid input! Please enter a valid task number."))
         except Exception as e:
-            print(self.style.error_msg(f"Error removing task: {str(e)}"))
\ No newline at end of file
+            print(self.style.error_msg(f"Error removing task: {str(e)}"))
+
+    @profiled("summary")
+    def summary(self, fmt="text", out=None):
+        """Print task counters without loading every task when the manifest allows it"""
+        summary = self.repository.summary()
+        out = out or sys.stdout
+        if fmt == "json":
+            json.dump(summary, out)
+            out.write('\n')
+            return summary
+        if fmt == "tsv":
+            for key in ("total", "completed", "pending", "overdue", "due_today"):
+                out.write(f"{key}\t{summary[key]}\n")
+            for priority, count in sorted(summary["priorities"].items()):
+                out.write(f"priority_{priority}\t{count}\n")
+            return summary
+
+        progress = (summary["completed"] / summary["total"] * 100) if summary["total"] else 0.0
+        print(self.style.header_msg("\n=== Task Summary ==="), file=out)
+        print(f"  {self.style.info_msg('Total Tasks:')} {summary['total']}", file=out)
+        print(f"  {self.style.success_msg('Completed:')} {summary['completed']}", file=out)
+        print(f"  {self.style.warning_msg('Pending:')} {summary['pending']}", file=out)
+        print(f"  {self.style.error_msg('Overdue:')} {summary['overdue']}", file=out)
+        print(f"  {self.style.warning_msg('Due today:')} {summary['due_today']}", file=out)
+        print(f"  {self.style.info_msg('Progress:')} {progress:.1f}%", file=out)
+        histogram = ", ".join(f"{self.style.priority_msg(priority)} {count}"
+                              for priority, count in sorted(summary["priorities"].items()))
+        if histogram:
+            print(f"  {self.style.info_msg('By priority:')} {histogram}", file=out)
+        return summary
+
+    @profiled("archive_tasks")
+    def archive_tasks(self, older_than=None, quiet=False):
+        """Move completed tasks due more than ``older_than`` days ago into the compressed archive"""
+        older_than = self.config["archive_after_days"] if older_than is None else older_than
+        cutoff = today_ordinal() - older_than
+        try:
+            # One writer at a time: the tasks archived are exactly the ones removed from the store
+            with self.lock.exclusive():
+                pairs = [(task_type, task) for task_type, task in self.repository.tasks_between(1, cutoff - 1)
+                         if task.completed]
+                if pairs:
+                    # Archive first: a crash before the removal only leaves duplicates the archive skips
+                    months = self.archive.append(pairs)
+                    self.repository.remove_many(pairs)
+        except (OSError, ValueError) as e:
+            print(self.style.error_msg(f"Error archiving tasks: {e}"), file=sys.stderr)
+            return None
+        if not quiet:
+            if pairs:
+                print(self.style.success_msg(
+                    f"Archived {len(pairs)} completed task(s) into {len(months)} monthly file(s) in {self.archive.archive_dir}"
+                ))
+            else:
+                print(self.style.info_msg(f"No completed tasks older than {older_than} days to archive"))
+        return len(pairs)
+
+    def auto_archive(self):
+        """Run archive_tasks() once a day when 'archive_auto' is enabled"""
+        if self._archive_checked or not self.config["archive_auto"]:
+            return
+        self._archive_checked = True
+        if not self.archive.due(self.ARCHIVE_INTERVAL):
+            return
+        count = self.archive_tasks(quiet=True)
+        if count is not None:
+            self.archive.mark_run()
+        if count:
+            print(self.style.success_msg(f"Archived {count} old completed task(s)"), file=sys.stderr)
+
+    @profiled("search_archive")
+    def search_archive(self, query, fmt="text", out=None):
+        """List archived tasks whose description, notes or category contain ``query``"""
+        try:
+            entries = list(self.archive.search(query))
+        except (OSError, EOFError, ValueError) as e:
+            print(self.style.error_msg(f"Error reading archive: {e}"), file=sys.stderr)
+            return None
+        out = out or sys.stdout
+        if fmt in ("json", "tsv"):
+            write_task_report(entries, {"matching": len(entries)}, out, fmt)
+            return len(entries)
+
+        print(self.style.header_msg(f"\n=== Archived tasks matching '{query}' ==="), file=out)
+        if not entries:
+            print(self.style.warning_msg("\nNo archived tasks match."), file=out)
+        for task_type, task in entries:
+            status = self.style.success_msg("✓") if task.completed else self.style.error_msg("×")
+            priority = self.style.priority_msg(task.priority or 'normal')
+            print(f"  {task.due_date} [{status}] [{priority}] ({self.style.bold_msg(task_type)}) "
+                  f"{task.description} {self.style.info_msg('#' + str(task.id))}", file=out)
+        print(self.style.info_msg(f"\n  {len(entries)} archived task(s)"), file=out)
+        return len(entries)
+
+    def create_task(self, row):
+        """Add one task from a dict with the import columns; return (task_type, task) or None"""
+        try:
+            task_type, task = parse_row(row)
+        except ValueError as e:
+            print(self.style.error_msg(f"Invalid task: {e}"), file=sys.stderr)
+            return None
+        self.repository.add(task_type, task)
+        self.save_tasks()
+        print(self.style.success_msg(f"Task added: {task.description}"))
+        return task_type, task
+
+    @profiled("add_recurring")
+    def add_recurring(self, assignments):
+        """Store a recurring task from ``field=value`` strings; return the rule id or None"""
+        try:
+            rule_id = self.recurring.add(self.parse_rule_fields(assignments))
+        except (OSError, ValueError) as e:
+            print(self.style.error_msg(f"Invalid recurring task: {e}"), file=sys.stderr)
+            return None
+        data = self.recurring.rules()[rule_id]
+        print(self.style.success_msg(f"Recurring task added: {data['description']} ({data['rule']}) "
+                                     f"#{rule_id}"))
+        return rule_id
+
+    @staticmethod
+    def parse_rule_fields(assignments):
+        fields = {}
+        for assignment in assignments:
+            field, sep, value = assignment.partition('=')
+            field = field.strip().lower()
+            if not sep or field not in RULE_FIELDS:
+                raise ValueError(f"expected one of {', '.join(RULE_FIELDS)} as field=value, got {assignment!r}")
+            fields[field] = value.strip()
+        return fields
+
+    def view_recurring(self, out=None):
+        """List the recurring task rules with their next pending occurrence"""
+        out = out or sys.stdout
+        rules = self.recurring.rules()
+        print(self.style.header_msg("\n=== Recurring Tasks ==="), file=out)
+        if not rules:
+            print(self.style.warning_msg("\nNo recurring tasks."), file=out)
+        today = today_ordinal()
+        for rule_id, data in sorted(rules.items(), key=lambda item: item[1]["description"].lower()):
+            next_due = self.recurring.next_due(rule_id, today) or "-"
+            until = f" until {data['until']}" if data.get("until") else ""
+            print(f"  [{self.style.priority_msg(data['priority'])}] ({self.style.bold_msg(data['type'])}) "
+                  f"{data['description']} {self.style.info_msg(data['rule'])} from {data['start']}{until}, "
+                  f"next {next_due} {self.style.info_msg('#' + rule_id)}", file=out)
+        return len(rules)
+
+    def find_task(self, task_id):
+        """Return (task_type, task) for an id, printing an error when unknown"""
+        entry = self.repository.get(task_id.lstrip('#'))
+        if entry is None:
+            print(self.style.error_msg(f"No task with id {task_id}"), file=sys.stderr)
+        return entry
+
+    @profiled("complete_task")
+    def complete_task_by_id(self, task_id):
+        """Mark the task with the given id, or a ``<rule id>@<date>`` occurrence, as complete"""
+        if '@' in task_id:
+            try:
+                task = self.recurring.complete(task_id.lstrip('#'))
+            except (OSError, ValueError) as e:
+                print(self.style.error_msg(f"Error completing {task_id}: {e}"), file=sys.stderr)
+                return False
+            if task is None:
+                print(self.style.error_msg(f"No occurrence {task_id}"), file=sys.stderr)
+                return False
+            print(self.style.success_msg(f"Occurrence marked as complete: {task.description} on {task.due_date}"))
+            return True
+        entry = self.find_task(task_id)
+        if entry is None:
+            return False
+        self.repository.complete(*entry)
+        self.save_tasks()
+        print(self.style.success_msg(f"Task marked as complete: {entry[1].description}"))
+        return True
+
+    @profiled("remove_task")
+    def remove_task_by_id(self, task_id):
+        """Remove the task, or the recurring rule, with the given id"""
+        data = self.recurring.remove(task_id.lstrip('#')) if task_id.lstrip('#') in self.recurring.rules() else None
+        if data is not None:
+            print(self.style.success_msg(f"Successfully removed recurring task: {data['description']}"))
+            return True
+        entry = self.find_task(task_id)
+        if entry is None:
+            return False
+        self.repository.remove(*entry)
+        self.save_tasks()
+        print(self.style.success_msg(f"Successfully removed task: {entry[1].description}"))
+        return True
+
+    @profiled("edit_task")
+    def edit_task_by_id(self, task_id, assignments):
+        """Apply ``field=value`` changes to the task, or the recurring rule, with the given id"""
+        if task_id.lstrip('#') in self.recurring.rules():
+            try:
+                data = self.recurring.edit(task_id.lstrip('#'), self.parse_rule_fields(assignments))
+            except (OSError, ValueError) as e:
+                print(self.style.error_msg(f"Invalid change: {e}"), file=sys.stderr)
+                return False
+            print(self.style.success_msg(f"Recurring task updated: {data['description']} ({data['rule']})"))
+            return True
+        try:
+            changes = parse_changes(assignments)
+        except ValueError as e:
+            print(self.style.error_msg(f"Invalid change: {e}"), file=sys.stderr)
+            return False
+        entry = self.find_task(task_id)
+        if entry is None:
+            return False
+        task_type, task = entry
+        was = task.to_dict()
+        task.apply(changes)
+        self.repository.update(task_type, task, was["due_date"], was)
+        self.save_tasks()
+        print(self.style.success_msg("Task updated successfully!"))
+        return True
+
+    @profiled("import_tasks")
+    def import_tasks(self, path, fmt=None):
+        """Bulk import tasks from a CSV or NDJSON file ('-' reads stdin)"""
+        try:
+            fmt = detect_format(path, fmt) if path != '-' else (fmt or "ndjson")
+            if path == '-':
+                report = import_tasks(self.repository, sys.stdin, fmt)
+            else:
+                with open(path, 'r', encoding='utf-8', newline='') as stream:
+                    report = import_tasks(self.repository, stream, fmt)
+        except (OSError, ValueError) as e:
+            print(self.style.error_msg(f"Error importing tasks: {e}"))
+            return None
+
+        print(self.style.header_msg("\nImport Summary:"))
+        print(f"  {self.style.info_msg('Rows read:')} {report.rows}")
+        print(f"  {self.style.success_msg('Imported:')} {report.imported} into {report.shards} shard(s)")
+        print(f"  {self.style.warning_msg('Rejected:')} {len(report.rejected)}")
+        print(f"  {self.style.info_msg('Throughput:')} {report.rows_per_second:.0f} rows/s")
+        for line_number, reason in report.rejected[:20]:
+            print(self.style.error_msg(f"    line {line_number}: {reason}"))
+        if len(report.rejected) > 20:
+            print(self.style.warning_msg(f"    ... {len(report.rejected) - 20} more"))
+        return report
+
+    @profiled("export_data")
+    def export_data(self, what, fmt, output=None):
+        """Stream tasks or the schedule as NDJSON/CSV to a file or stdout"""
+        out = sys.stdout if output in (None, '-') else None
+        try:
+            if out is None:
+                out = open(output, 'w', encoding='utf-8', newline='')
+            if what == "schedule":
+                schedule, _ = self.schedule_cache.load()
+                count = export_schedule(schedule, self.days, out, fmt)
+            elif what == "archive":
+                count = export_tasks(self.archive, out, fmt)
+            else:
+                count = export_tasks(self.repository, out, fmt)
+        except (OSError, EOFError, ValueError) as e:
+            print(self.style.error_msg(f"Error exporting {what}: {e}"), file=sys.stderr)
+            return None
+        finally:
+            if out is not None and out is not sys.stdout:
+                out.close()
+
+        if out is not sys.stdout:
+            print(self.style.success_msg(f"Exported {count} {what} rows to {output}"))
+        return count
@@ -0,0 +1,148 @@
+try:
+  from task_index import date_ordinal
+except ImportError:
+  from src.task_index import date_ordinal
+import hashlib
+import json
+import os
+
+
+class ShardManifest:
+    """Per-shard statistics kept in ``tasks/manifest.json``
+
+    For every shard file the manifest records its task count, completed
+    count, priority histogram, content hash and the journal ``seq`` it was
+    written at. Summaries combine these entries with the journal records
+    not yet folded into the shards, so they never open the shard files.
+    """
+
+    FILENAME = 'manifest.json'
+    VERSION = 1
+
+    def __init__(self, tasks_dir):
+        self.path = os.path.join(tasks_dir, self.FILENAME)
+        self.entries = {}
+        self.loaded = False
+        self.dirty = False
+        self.generation = 0
+
+    def load(self):
+        """Read the manifest; return False when it is missing or unreadable"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return False
+            self.entries = data["shards"]
+            self.generation += 1
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.entries = {}
+            return False
+        self.loaded = True
+        self.dirty = False
+        return True
+
+    def save(self):
+        """Write the manifest atomically if any entry changed"""
+        if not self.dirty:
+            return
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": self.VERSION, "shards": dict(sorted(self.entries.items()))}, f,
+                      separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.loaded = True
+        self.dirty = False
+
+    @staticmethod
+    def digest(raw):
+        return hashlib.sha1(raw).hexdigest()
+
+    def observe(self, due_date, raw, shard, seq):
+        """Record the stats of a shard just read or written, unless its hash is unchanged"""
+        digest = self.digest(raw)
+        entry = self.entries.get(due_date)
+        if entry and entry.get("hash") == digest:
+            return
+        self.entries[due_date] = self.shard_stats(shard, digest, seq)
+        self.dirty = True
+        self.generation += 1
+
+    def discard(self, due_date):
+        if self.entries.pop(due_date, None) is not None:
+            self.dirty = True
+            self.generation += 1
+
+    def retain(self, due_dates):
+        """Drop entries of shards that no longer exist"""
+        for due_date in set(self.entries) - set(due_dates):
+            self.discard(due_date)
+
+    @staticmethod
+    def shard_stats(shard, digest, seq):
+        count = completed = 0
+        priorities = {}
+        for task_type in ("daily", "monthly"):
+            for task in shard.get(task_type, []):
+                count += 1
+                completed += bool(task.completed)
+                priority = task.priority or "medium"
+                priorities[priority] = priorities.get(priority, 0) + 1
+        return {"count": count, "completed": completed, "priorities": priorities, "hash": digest, "seq": seq}
+
+    def summary(self, records, today):
+        """Return totals from the entries plus the unfolded journal ``records``
+
+        Returns None when a record lacks the previous state needed to
+        compute its delta (journals written by older versions).
+        """
+        counts = {due_date: dict(entry, priorities=dict(entry["priorities"]))
+                  for due_date, entry in self.entries.items()}
+
+        def adjust(due_date, seq, sign, completed, priority):
+            entry = counts.get(due_date)
+            if entry is None:
+                entry = counts[due_date] = {"count": 0, "completed": 0, "priorities": {}, "seq": 0}
+            if seq <= entry.get("seq", 0):
+                return
+            entry["count"] += sign
+            entry["completed"] += sign * bool(completed)
+            priority = priority or "medium"
+            entry["priorities"][priority] = entry["priorities"].get(priority, 0) + sign
+
+        for record in records:
+            seq, op = record.get("seq", 0), record.get("op")
+            try:
+                if op == "add":
+                    task = record["task"]
+                    adjust(task["due_date"], seq, 1, task.get("completed"), task.get("priority"))
+                    continue
+                was = record["was"]
+                if op in ("remove", "update"):
+                    adjust(record["date"], seq, -1, was["completed"], was["priority"])
+                if op == "update":
+                    task = record["task"]
+                    adjust(task["due_date"], seq, 1, task.get("completed"), task.get("priority"))
+                elif op == "complete" and not was["completed"]:
+                    entry = counts.get(record["date"])
+                    if entry and seq > entry.get("seq", 0):
+                        entry["completed"] += 1
+            except (KeyError, TypeError):
+                return None
+
+        summary = {"total": 0, "completed": 0, "pending": 0, "overdue": 0, "due_today": 0, "priorities": {},
+                   "shards": sum(1 for entry in counts.values() if entry["count"] > 0)}
+        for due_date, entry in counts.items():
+            pending = entry["count"] - entry["completed"]
+            summary["total"] += entry["count"]
+            summary["completed"] += entry["completed"]
+            ordinal = date_ordinal(due_date)
+            if ordinal and ordinal < today:
+                summary["overdue"] += pending
+            elif ordinal == today:
+                summary["due_today"] += pending
+            for priority, number in entry["priorities"].items():
+                summary["priorities"][priority] = summary["priorities"].get(priority, 0) + number
+        summary["pending"] = summary["total"] - summary["completed"]
+        summary["priorities"] = {priority: number for priority, number in summary["priorities"].items() if number}
+        return summary
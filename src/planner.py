@@ -0,0 +1,185 @@
+try:
+  from task import PRIORITY_RANK
+except ImportError:
+  from src.task import PRIORITY_RANK
+from bisect import bisect_left
+from datetime import date
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+NO_DUE = date.max.toordinal() + 1
+
+
+def plan_slots(free_slots, start, end, now=None):
+    """Return the free (ordinal, start, end) intervals of every date from ``start`` to ``end`` in time order
+
+    ``now`` (minutes since midnight) clips the slots of ``start``: the part of
+    today already past is not free any more.
+    """
+    slots = []
+    for ordinal in range(start, end + 1):
+        # Ordinal 1 (0001-01-01) is a Monday
+        slots.extend((ordinal, begin, finish) for begin, finish in free_slots.get(WEEKDAYS[(ordinal - 1) % 7], ()))
+    if now is not None:
+        past = 0
+        while past < len(slots) and slots[past][0] == start and slots[past][2] <= now:
+            past += 1
+        del slots[:past]
+        if slots and slots[0][0] == start and slots[0][1] < now:
+            slots[0] = (start, now, slots[0][2])
+    return slots
+
+
+class Planner:
+    """Greedy assignment of pending tasks to the free slots of the coming weeks
+
+    Tasks are taken by priority, then due date (then id, so the order is
+    total), and each one fills the earliest free minutes left from its
+    release on, split across slots when its effort does not fit in one.
+    Tasks are released at the first slot, except occurrences of recurring
+    tasks (ids ``<rule id>@<YYYY-MM-DD>``), which wait for their own date.
+    Every slot is filled from its start, so the free time is one count of
+    used minutes per slot, and the blocks of a task depend only on the tasks
+    ordered before it and on the slots it scanned.
+
+    update() uses that to re-plan incrementally. It diffs the tasks and slots
+    against the previous call and re-fills only from the first task whose
+    key, effort or release changed, or whose scan reached the first changed
+    slot; the free time left by the tasks before it is rebuilt from their
+    blocks. Changes to tasks ordered after the point where the free time ran
+    out cost a bisect.
+    """
+
+    def __init__(self, default_effort=60):
+        self.default_effort = default_effort
+        self.slots = []
+        self.keys = []
+        self.signatures = {}
+        self.entries = {}
+        # Per position: the (slot index, start, end) blocks of the task, and
+        # the highest slot index scanned by it or any task before it
+        self.blocks = []
+        self.reach = []
+        self.replanned = 0
+
+    def key(self, task):
+        return PRIORITY_RANK.get(task.priority, PRIORITY_RANK["medium"]), task.due or NO_DUE, task.id or ""
+
+    def effort(self, task):
+        try:
+            return max(int(task.get("effort") or self.default_effort), 1)
+        except (TypeError, ValueError):
+            return self.default_effort
+
+    @staticmethod
+    def release(task):
+        """Return the first date ordinal a task may be planned on, 0 when it is available at once"""
+        return task.due if task.id and '@' in task.id else 0
+
+    def signatures_of(self, entries):
+        """Return {task id: (key, effort, release)}; the hot loop of every re-plan, so key() and effort() are inlined"""
+        rank, medium, default, release = PRIORITY_RANK.get, PRIORITY_RANK["medium"], self.default_effort, self.release
+        try:
+            return {task_id: ((rank(task.priority, medium), task.due or NO_DUE, task_id or ""),
+                              max(int(task.extra and task.extra.get("effort") or default), 1), release(task))
+                    for task_id, (_, task) in entries.items()}
+        except (TypeError, ValueError):
+            return {task_id: (self.key(task), self.effort(task), release(task))
+                    for task_id, (_, task) in entries.items()}
+
+    def update(self, slots, entries=None):
+        """Bring the plan up to date; ``entries`` are the pending (task_type, task) pairs, None if unchanged
+
+        Returns the number of tasks whose blocks were recomputed.
+        """
+        restart = len(self.keys)
+        if slots != self.slots:
+            changed = next((i for i, (old, new) in enumerate(zip(self.slots, slots)) if old != new),
+                           min(len(self.slots), len(slots)))
+            restart = bisect_left(self.reach, changed)
+            self.slots = slots
+
+        if entries is not None:
+            self.entries = {task.id: (task_type, task) for task_type, task in entries}
+            signatures = self.signatures_of(self.entries)
+            old = self.signatures
+            removed = [signature[0] for task_id, signature in old.items() if signatures.get(task_id) != signature]
+            added = [signature[0] for task_id, signature in signatures.items() if old.get(task_id) != signature]
+            self.signatures = signatures
+            if removed or added:
+                if len(removed) + len(added) > len(self.keys) // 8:
+                    self.keys = sorted(signature[0] for signature in signatures.values())
+                else:
+                    for key in removed:
+                        del self.keys[bisect_left(self.keys, key)]
+                    for key in added:
+                        self.keys.insert(bisect_left(self.keys, key), key)
+                # Keys before the smallest changed one keep their positions and blocks
+                restart = min(restart, bisect_left(self.keys, min(removed + added)))
+
+        self.replanned = self._fill(restart) if restart <= len(self.blocks) else 0
+        return self.replanned
+
+    def _fill(self, start):
+        """Recompute the blocks of the tasks from position ``start`` until no free minute is left"""
+        del self.blocks[start:]
+        del self.reach[start:]
+        slots, keys, signatures = self.slots, self.keys, self.signatures
+        count = len(slots)
+        used = [0] * count
+        for blocks in self.blocks:
+            for index, _, end in blocks:
+                used[index] = end - slots[index][1]
+        # following[i] leads to the first slot at or after i with free minutes (count when none)
+        following = [i if slots[i][1] + used[i] < slots[i][2] else i + 1 for i in range(count)] + [count]
+
+        def first_free(index):
+            while following[index] != index:
+                following[index] = following[following[index]]
+                index = following[index]
+            return index
+
+        reach = self.reach[-1] if self.reach else -1
+        for position in range(start, len(keys)):
+            if first_free(0) >= count:
+                break
+            _, remaining, release = signatures[keys[position][2]]
+            index = first_free(bisect_left(slots, (release,)) if release else 0)
+            blocks = []
+            while remaining and index < count:
+                _, begin, end = slots[index]
+                begin += used[index]
+                taken = min(remaining, end - begin)
+                blocks.append((index, begin, begin + taken))
+                remaining -= taken
+                used[index] += taken
+                if begin + taken >= end:
+                    following[index] = index + 1
+                    index = first_free(index + 1)
+            reach = max(reach, count if remaining else blocks[-1][0])
+            self.blocks.append(blocks)
+            self.reach.append(reach)
+        return len(self.blocks) - start
+
+    def plan(self):
+        """Return (blocks, summary); blocks are (ordinal, start, end, task_type, task, part, parts) in time order"""
+        blocks = []
+        planned_minutes = 0
+        complete = partial = 0
+        for position, task_blocks in enumerate(self.blocks):
+            task_id = self.keys[position][2]
+            task_type, task = self.entries[task_id]
+            for part, (index, begin, end) in enumerate(task_blocks, 1):
+                blocks.append((self.slots[index][0], begin, end, task_type, task, part, len(task_blocks)))
+                planned_minutes += end - begin
+            minutes = sum(end - begin for _, begin, end in task_blocks)
+            if minutes >= self.signatures[task_id][1]:
+                complete += 1
+            elif minutes:
+                partial += 1
+        # Tasks released later leave earlier slots to the tasks ordered after them
+        blocks.sort(key=lambda block: block[:2])
+        free_minutes = sum(end - begin for _, begin, end in self.slots)
+        summary = {"pending": len(self.keys), "planned": complete, "partial": partial,
+                   "unplanned": len(self.keys) - complete - partial, "free_minutes": free_minutes,
+                   "planned_minutes": planned_minutes}
+        return blocks, summary
@@ -0,0 +1,208 @@
+from contextlib import contextmanager
+from functools import wraps
+import builtins
+import json
+import os
+import sys
+import time
+
+
+class _CountingFile:
+    """Proxy for a file object that adds every read and write to the profiler"""
+
+    def __init__(self, profiler, file):
+        self._profiler = profiler
+        self._file = file
+
+    def read(self, *args):
+        data = self._file.read(*args)
+        self._profiler.bytes_read += len(data)
+        return data
+
+    def readline(self, *args):
+        line = self._file.readline(*args)
+        self._profiler.bytes_read += len(line)
+        return line
+
+    def __iter__(self):
+        for line in self._file:
+            self._profiler.bytes_read += len(line)
+            yield line
+
+    def write(self, data):
+        self._profiler.bytes_written += len(data)
+        return self._file.write(data)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def __enter__(self):
+        self._file.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._file.__exit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+class _CountingStream(_CountingFile):
+    """Proxy for stdout that counts characters printed to the terminal"""
+
+    def write(self, data):
+        self._profiler.printed += len(data)
+        return self._file.write(data)
+
+
+class Profiler:
+    """Per-operation wall time, file and terminal I/O counters
+
+    While enabled, ``open``, ``os.listdir``/``os.scandir`` and ``sys.stdout``
+    are wrapped so every file opened, directory listed, byte read or written
+    and character printed is counted. Each measure() block records the
+    difference of those counters, so nested operations are also included in
+    the totals of the enclosing one. Text files count characters, which
+    equals bytes for the ASCII JSON shards.
+    """
+
+    FIELDS = ("calls", "wall_ms", "files", "listings", "bytes_read", "bytes_written", "printed")
+
+    def __init__(self):
+        self.enabled = False
+        self.operations = {}
+        self.files = 0
+        self.listings = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.printed = 0
+        self.started = None
+        self._open = None
+        self._listdir = None
+        self._scandir = None
+        self._stdout = None
+        self._cprofile = None
+        self._cprofile_path = None
+
+    def enable(self, cprofile_path=None):
+        """Start counting and optionally run cProfile until disable()"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.started = time.perf_counter()
+        self._open = builtins.open
+        builtins.open = self._counting_open
+        self._listdir = os.listdir
+        os.listdir = self._counting_listdir
+        self._scandir = os.scandir
+        os.scandir = self._counting_scandir
+        self._stdout = sys.stdout
+        sys.stdout = _CountingStream(self, sys.stdout)
+        if cprofile_path:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile_path = cprofile_path
+            self._cprofile.enable()
+
+    def disable(self):
+        """Stop counting, restore open/stdout and write the cProfile dump"""
+        if not self.enabled:
+            return
+        if self._cprofile:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self._cprofile_path)
+            self._cprofile = None
+        builtins.open = self._open
+        os.listdir = self._listdir
+        os.scandir = self._scandir
+        if isinstance(sys.stdout, _CountingStream):
+            sys.stdout = self._stdout
+        self.enabled = False
+
+    def _counting_open(self, *args, **kwargs):
+        file = self._open(*args, **kwargs)
+        self.files += 1
+        return _CountingFile(self, file)
+
+    def _counting_listdir(self, *args):
+        self.listings += 1
+        return self._listdir(*args)
+
+    def _counting_scandir(self, *args):
+        self.listings += 1
+        return self._scandir(*args)
+
+    def counters(self):
+        return self.files, self.listings, self.bytes_read, self.bytes_written, self.printed
+
+    @contextmanager
+    def measure(self, name):
+        """Add the time and I/O spent inside the block to operation ``name``"""
+        if not self.enabled:
+            yield
+            return
+        before = self.counters()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - started) * 1000
+            stats = self.operations.setdefault(name, dict.fromkeys(self.FIELDS, 0))
+            stats["calls"] += 1
+            stats["wall_ms"] += wall_ms
+            for field, delta in zip(self.FIELDS[2:], map(int.__sub__, self.counters(), before)):
+                stats[field] += delta
+
+    def report(self):
+        """Return the collected metrics as a JSON-serialisable dict"""
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 3) if self.started else 0.0,
+            "operations": {
+                name: dict(stats, wall_ms=round(stats["wall_ms"], 3))
+                for name, stats in sorted(self.operations.items())
+            }
+        }
+
+    def write_report(self, path):
+        """Write the metrics to ``path`` as JSON (call after disable())"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def print_summary(self, out=None):
+        """Print one line per operation to stderr"""
+        out = out or sys.stderr
+        report = self.report()
+        out.write(f"\n{'operation':<22}{'calls':>6}{'wall ms':>11}{'files':>7}{'dirs':>6}"
+                  f"{'read':>11}{'written':>11}{'printed':>10}\n")
+        for name, stats in report["operations"].items():
+            out.write(f"{name:<22}{stats['calls']:>6}{stats['wall_ms']:>11.2f}{stats['files']:>7}{stats['listings']:>6}"
+                      f"{format_bytes(stats['bytes_read']):>11}{format_bytes(stats['bytes_written']):>11}"
+                      f"{stats['printed']:>10}\n")
+        out.write(f"{'total':<22}{'':>6}{report['total_ms']:>11.2f}\n")
+        out.flush()
+
+
+def format_bytes(count):
+    for unit in ('B', 'KiB', 'MiB'):
+        if count < 1024 or unit == 'MiB':
+            return f"{count:.0f} {unit}" if unit == 'B' else f"{count:.1f} {unit}"
+        count /= 1024
+
+
+PROFILER = Profiler()
+
+
+def profiled(name):
+    """Decorator recording a Manager method under ``name`` when profiling is on"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return method(*args, **kwargs)
+            with PROFILER.measure(name):
+                return method(*args, **kwargs)
+        return wrapper
+    return decorator
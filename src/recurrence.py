@@ -0,0 +1,278 @@
+try:
+  from task import PRIORITIES, TASK_TYPES, Task, new_task_id, parse_effort
+  from task_index import date_ordinal, ordinal_to_str
+except ImportError:
+  from src.task import PRIORITIES, TASK_TYPES, Task, new_task_id, parse_effort
+  from src.task_index import date_ordinal, ordinal_to_str
+from calendar import monthrange
+from datetime import date
+import json
+import os
+
+RULE_FIELDS = ("description", "rule", "start", "until", "type", "priority", "notes", "category", "effort")
+
+
+class RecurrenceRule:
+    """When a recurring task falls due: ``daily``, ``weekdays``, ``weekly[:N]`` or ``monthly[:D]``
+
+    ``weekly:N`` repeats every N weeks on the weekday of the start date;
+    ``monthly:D`` falls on day D of every month, or on the last day of
+    shorter months (``monthly`` alone uses the day of the start date).
+    """
+
+    __slots__ = ("kind", "step")
+
+    KINDS = ("daily", "weekdays", "weekly", "monthly")
+
+    def __init__(self, kind, step=None):
+        self.kind = kind
+        self.step = step
+
+    @classmethod
+    def parse(cls, text):
+        """Parse a rule string, also accepting 'every N weeks'; raise ValueError when invalid"""
+        text = " ".join(str(text).lower().split())
+        words = text.split(" ")
+        if len(words) == 3 and words[0] == "every" and words[2] in ("week", "weeks") and words[1].isdigit():
+            text = f"weekly:{words[1]}"
+        kind, _, step = text.partition(':')
+        if kind not in cls.KINDS or (step and kind in ("daily", "weekdays")):
+            raise ValueError(f"invalid rule {text!r}, use daily, weekdays, weekly[:N] or monthly[:DAY]")
+        if not step:
+            return cls(kind, 1 if kind == "weekly" else None)
+        if not step.isdigit() or int(step) < 1 or (kind == "monthly" and int(step) > 31):
+            raise ValueError(f"invalid rule {text!r}")
+        return cls(kind, int(step))
+
+    def __str__(self):
+        return self.kind if self.step is None or self.step == 1 and self.kind == "weekly" else f"{self.kind}:{self.step}"
+
+    def occurrences(self, anchor, start, end):
+        """Yield the ordinals of occurrences between ``start`` and ``end``, never before ``anchor``"""
+        low = max(start, anchor)
+        if low > end:
+            return
+        if self.kind == "daily":
+            yield from range(low, end + 1)
+        elif self.kind == "weekdays":
+            # Ordinal 1 (0001-01-01) is a Monday
+            yield from (ordinal for ordinal in range(low, end + 1) if (ordinal - 1) % 7 < 5)
+        elif self.kind == "weekly":
+            step = 7 * self.step
+            yield from range(anchor + -(-(low - anchor) // step) * step, end + 1, step)
+        else:
+            day = self.step or date.fromordinal(anchor).day
+            current, last = date.fromordinal(low), date.fromordinal(end)
+            year, month = current.year, current.month
+            while (year, month) <= (last.year, last.month):
+                ordinal = date(year, month, min(day, monthrange(year, month)[1])).toordinal()
+                if low <= ordinal <= end:
+                    yield ordinal
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+class RecurringTasks:
+    """Recurring task rules stored once in ``tasks/recurring.json``
+
+    A rule holds the task fields, its RecurrenceRule, a start date and an
+    optional end date. Occurrences are never stored: occurrences() builds
+    Task records for the requested window only, with ids of the form
+    ``<rule id>@<YYYY-MM-DD>``. Completed occurrences are kept as one integer
+    bitmask per rule (bit N is the day N days after the start), written as a
+    hex string, so a rule completed daily for a year adds about 90 bytes.
+    Changes re-read the file and write it atomically under the repository's
+    exclusive lock.
+    """
+
+    FILENAME = 'recurring.json'
+
+    def __init__(self, tasks_dir, lock):
+        self.path = os.path.join(tasks_dir, self.FILENAME)
+        self.lock = lock
+        self._rules = {}
+        self._parsed = {}
+        self._signature = None
+
+    def version(self):
+        """Return a token that changes whenever the rules file changes"""
+        self.rules()
+        return self._signature
+
+    def rules(self):
+        """Return {rule_id: rule dict}, re-reading the file only when it changed"""
+        try:
+            stat = os.stat(self.path)
+            signature = stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            signature = None
+        if signature != self._signature:
+            self._rules = {}
+            if signature is not None:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._rules = json.load(f).get("rules", {})
+            self._parsed = {}
+            self._signature = signature
+        return self._rules
+
+    def occurrences(self, start, end, pending_only=False):
+        """Return (task_type, task) occurrences due between two ordinals, ordered like the task index"""
+        entries = []
+        for rule_id, data in self.rules().items():
+            rule, anchor, until = self._parse(rule_id, data)
+            done = int(data.get("done") or "0", 16)
+            for ordinal in rule.occurrences(anchor, start, min(end, until) if until else end):
+                completed = bool(done >> (ordinal - anchor) & 1)
+                if pending_only and completed:
+                    continue
+                entries.append((data["type"], self.occurrence(rule_id, data, ordinal, completed)))
+        entries.sort(key=lambda entry: (entry[1].due, entry[1].completed))
+        return entries
+
+    @staticmethod
+    def occurrence(rule_id, data, ordinal, completed):
+        due_date = ordinal_to_str(ordinal)
+        extra = {key: data[key] for key in ("notes", "category", "effort") if data.get(key)}
+        extra["rule"] = data["rule"]
+        return Task(data["type"], data["description"], due_date, completed, data.get("priority", "medium"),
+                    extra, f"{rule_id}@{due_date}")
+
+    def next_due(self, rule_id, today):
+        """Return the first pending occurrence on or after ``today``, or None"""
+        data = self.rules()[rule_id]
+        rule, anchor, until = self._parse(rule_id, data)
+        done = int(data.get("done") or "0", 16)
+        end = until or today + 400
+        for ordinal in rule.occurrences(anchor, today, end):
+            if not done >> (ordinal - anchor) & 1:
+                return ordinal_to_str(ordinal)
+        return None
+
+    def add(self, fields):
+        """Validate ``field=value`` data for a new rule and store it; return its id"""
+        data = self.validate(dict(fields))
+        with self.lock.exclusive():
+            rules = dict(self.rules())
+            rule_id = new_task_id()
+            while rule_id in rules:
+                rule_id = new_task_id()
+            rules[rule_id] = data
+            self._write(rules)
+        return rule_id
+
+    def get(self, task_id):
+        """Return the Task of the occurrence ``<rule id>@<date>``, or None if the rule has none that day"""
+        rule_id, _, due_date = task_id.partition('@')
+        data = self.rules().get(rule_id)
+        ordinal = data and self._ordinal(rule_id, data, due_date)
+        if not ordinal:
+            return None
+        anchor = self._parse(rule_id, data)[1]
+        completed = bool(int(data.get("done") or "0", 16) >> (ordinal - anchor) & 1)
+        return self.occurrence(rule_id, data, ordinal, completed)
+
+    def complete(self, task_id):
+        """Mark the occurrence ``<rule id>@<date>`` as complete; return its Task or None"""
+        rule_id, _, due_date = task_id.partition('@')
+        with self.lock.exclusive():
+            rules = dict(self.rules())
+            if rule_id not in rules:
+                return None
+            data = dict(rules[rule_id])
+            anchor = self._parse(rule_id, data)[1]
+            ordinal = self._ordinal(rule_id, data, due_date)
+            if not ordinal:
+                return None
+            data["done"] = f"{int(data.get('done') or '0', 16) | 1 << (ordinal - anchor):x}"
+            rules[rule_id] = data
+            self._write(rules)
+        return self.occurrence(rule_id, data, ordinal, True)
+
+    def edit(self, rule_id, changes):
+        """Apply validated changes to a rule; return the updated rule or None if it does not exist"""
+        with self.lock.exclusive():
+            rules = dict(self.rules())
+            if rule_id not in rules:
+                return None
+            data = dict(rules[rule_id])
+            data.update(changes)
+            data = self.validate(data, rules[rule_id])
+            rules[rule_id] = data
+            self._write(rules)
+        return data
+
+    def remove(self, rule_id):
+        """Delete a rule and its completion history; return the removed rule or None"""
+        with self.lock.exclusive():
+            rules = dict(self.rules())
+            data = rules.pop(rule_id, None)
+            if data is not None:
+                self._write(rules)
+        return data
+
+    @staticmethod
+    def validate(data, previous=None):
+        """Return a normalised rule dict; raise ValueError on invalid fields"""
+        unknown = set(data) - set(RULE_FIELDS) - {"done"}
+        if unknown:
+            raise ValueError(f"unknown field(s) {', '.join(sorted(unknown))}, use {', '.join(RULE_FIELDS)}")
+        description = str(data.get("description") or "").strip()
+        if not description:
+            raise ValueError("missing description")
+        rule = RecurrenceRule.parse(data.get("rule") or "")
+        start = str(data.get("start") or ordinal_to_str(date.today().toordinal()))
+        anchor = date_ordinal(start)
+        if not anchor or ordinal_to_str(anchor) != start:
+            raise ValueError(f"invalid start {start!r}, use YYYY-MM-DD")
+        until = data.get("until") or None
+        if until and (not date_ordinal(until) or date_ordinal(until) < anchor):
+            raise ValueError(f"invalid until {until!r}, use a YYYY-MM-DD date after start")
+        task_type = str(data.get("type") or ("monthly" if rule.kind == "monthly" else "daily")).lower()
+        if task_type not in TASK_TYPES:
+            raise ValueError(f"invalid type {task_type!r}")
+        priority = str(data.get("priority") or "medium").lower()
+        if priority not in PRIORITIES:
+            raise ValueError(f"invalid priority {priority!r}")
+
+        done = data.get("done") or "0"
+        if previous and previous.get("start") != start:
+            # Completion bits are day offsets from the start date
+            shift = anchor - date_ordinal(previous["start"])
+            bits = int(done, 16)
+            done = f"{bits >> shift if shift > 0 else bits << -shift:x}"
+        normalised = {"description": description, "rule": str(rule), "start": start, "type": task_type,
+                      "priority": priority}
+        if until:
+            normalised["until"] = until
+        normalised.update({key: data[key] for key in ("notes", "category") if data.get(key)})
+        if data.get("effort"):
+            normalised["effort"] = parse_effort(data["effort"])
+        if done != "0":
+            normalised["done"] = done
+        return normalised
+
+    def _ordinal(self, rule_id, data, due_date):
+        """Return the ordinal of ``due_date`` if the rule has an occurrence that day, else None"""
+        rule, anchor, until = self._parse(rule_id, data)
+        ordinal = date_ordinal(due_date)
+        if not ordinal or (until and ordinal > until) or ordinal not in set(rule.occurrences(anchor, ordinal, ordinal)):
+            return None
+        return ordinal
+
+    def _parse(self, rule_id, data):
+        parsed = self._parsed.get(rule_id)
+        if parsed is None or parsed[0] is not data:
+            until = date_ordinal(data["until"]) if data.get("until") else None
+            parsed = (data, RecurrenceRule.parse(data["rule"]), date_ordinal(data["start"]), until)
+            self._parsed[rule_id] = parsed
+        return parsed[1:]
+
+    def _write(self, rules):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": 1, "rules": rules}, f, indent=4)
+        os.replace(tmp_path, self.path)
+        self._rules = rules
+        self._parsed = {}
+        stat = os.stat(self.path)
+        self._signature = stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,793 @@
+try:
+  from color import Colors
+  from journal import TaskJournal
+  from locking import FileLock
+  from manifest import ShardManifest
+  from shard_layout import list_shards, migrate_flat_layout, partition, remove_shard, shard_date, shard_path
+  from task import TASK_TYPES, Task, new_task_id
+  from task_index import DueDateIndex, DueDateQueries, date_ordinal, ordinal_to_str, today_ordinal
+except ImportError:
+  from src.color import Colors
+  from src.journal import TaskJournal
+  from src.locking import FileLock
+  from src.manifest import ShardManifest
+  from src.shard_layout import list_shards, migrate_flat_layout, partition, remove_shard, shard_date, shard_path
+  from src.task import TASK_TYPES, Task, new_task_id
+  from src.task_index import DueDateIndex, DueDateQueries, date_ordinal, ordinal_to_str, today_ordinal
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import sys
+import time
+
+
+class TaskRepository(DueDateQueries):
+    """In-memory view of the per-due-date task shards
+
+    Shards live in ``tasks/YYYY/MM/tasks_<date>.json`` (see shard_layout);
+    files from the older flat layout are moved there on load.
+
+    Shards are parsed once and kept in memory. Later calls to refresh() only
+    re-read shards whose file signature (mtime, size) changed on disk, so a
+    menu action costs a stat() call instead of a full directory parse.
+
+    Mutations are appended to a TaskJournal by save(). Once the journal
+    outgrows ``journal_max_bytes`` it is folded back into the dirty shards.
+    Each shard stores the ``seq`` of the last record folded into it, so
+    replaying the journal after an interrupted compaction never applies a
+    record twice.
+
+    Every task carries a stable ``id``; ``by_id`` maps it to the Task, whose
+    due date and type locate its shard. Journal records name tasks by id, and
+    tasks from older files get an id once, written back to their shard.
+
+    A ShardManifest next to the shards keeps per-shard counters, refreshed
+    whenever a shard is read with a new hash or written, so summary() can
+    answer without loading any shard.
+
+    Shards are read on a pool of up to ``load_workers`` threads, so cold
+    loads of thousands of files overlap their open() latency.
+
+    Several processes may share the directory. Loads hold a shared lock on
+    ``tasks/.lock``; save() and compact() hold the exclusive lock only to
+    check versions and write. The version of the data a process holds is
+    the journal signature plus the signature of every shard it is about to
+    rewrite; if either changed on disk, the process reloads outside the
+    lock, re-applies its unsaved records by task id and tries again.
+    """
+
+    TASK_TYPES = TASK_TYPES
+    STAT_INTERVAL = 2.0
+    JOURNAL_MAX_BYTES = 256 * 1024
+    LOAD_WORKERS = 8
+    PARALLEL_MIN_SHARDS = 16
+    SAVE_RETRIES = 3
+
+    def __init__(self, tasks_dir, style=None, journal_max_bytes=None, load_workers=None):
+        self.style = style or Colors()
+        self.tasks_dir = tasks_dir
+        self.journal = TaskJournal(tasks_dir)
+        self.manifest = ShardManifest(tasks_dir)
+        self.lock = FileLock(os.path.join(tasks_dir, '.lock'))
+        self.journal_max_bytes = journal_max_bytes or self.JOURNAL_MAX_BYTES
+        self.load_workers = self.LOAD_WORKERS if load_workers is None else load_workers
+        self.shards = {}
+        self.index = DueDateIndex()
+        self.by_id = {}
+        self._shard_seq = {}
+        self._signatures = {}
+        self._journal_signature = None
+        self._dir_mtime = None
+        self._last_stat = 0.0
+        self._loaded = False
+        self._dirty_dates = set()
+        self._pending = []
+        self._seq = 0
+        self._flat = None
+        self._version_state = None
+        self._versions = {}
+        self._load_error = None
+
+    @staticmethod
+    def empty_shard():
+        return {"daily": [], "monthly": []}
+
+    def shard_path(self, due_date):
+        """Return the JSON shard holding tasks due on the given date"""
+        return shard_path(self.tasks_dir, due_date)
+
+    shard_date = staticmethod(shard_date)
+
+    @property
+    def tasks(self):
+        """Return all tasks grouped by type, ordered by due date"""
+        if self._flat is None:
+            flat = {"daily": [], "monthly": []}
+            for due_date in sorted(self.shards):
+                for task_type in self.TASK_TYPES:
+                    flat[task_type].extend(self.shards[due_date].get(task_type, []))
+            self._flat = flat
+        return self._flat
+
+    def sorted_tasks(self):
+        """Return (task_type, task) pairs ordered by due date then status"""
+        self.refresh()
+        return list(self.index)
+
+    def tasks_between(self, start=None, end=None):
+        """Return (task_type, task) pairs due between two date ordinals"""
+        self.refresh()
+        return self.index.between(start, end)
+
+    def iter_shards(self, start=None, end=None, strict=False):
+        """Yield (due_date, shard) from disk in due-date order, one file at a time
+
+        Journal records are grouped by the shard they touch and applied as
+        each shard is read, so memory stays bounded by one shard plus the
+        journal, whatever the number of shards. With ``start``/``end``
+        ordinals, year and month directories outside the range are skipped.
+        A shard that cannot be read is reported and skipped, or raises
+        ValueError when ``strict``.
+        """
+        pending = defaultdict(list)
+        for record in self.journal.records():
+            try:
+                for due_date in self.touched_dates(record):
+                    pending[due_date].append(record)
+            except (KeyError, TypeError):
+                continue
+
+        paths = list_shards(self.tasks_dir, start, end)
+        dates = set(paths)
+        for due_date in pending:
+            ordinal = date_ordinal(due_date)
+            if not ordinal or ((start is None or ordinal >= start) and (end is None or ordinal <= end)):
+                dates.add(due_date)
+
+        for due_date in sorted(dates):
+            filepath = paths.get(due_date)
+            shard, seq = self.empty_shard(), 0
+            if filepath:
+                try:
+                    shard, seq = self.read_shard_file(filepath)
+                except Exception as e:
+                    if strict:
+                        raise ValueError(f"cannot read {os.path.basename(filepath)}: {e}") from e
+                    print(self.style.error_msg(f"Error loading {os.path.basename(filepath)}: {e}"), file=sys.stderr)
+                    continue
+            for record in pending.get(due_date, ()):
+                if record.get("seq", 0) > seq:
+                    try:
+                        self.apply_record(shard, due_date, record)
+                    except (KeyError, IndexError, TypeError):
+                        continue
+            if shard["daily"] or shard["monthly"]:
+                yield due_date, shard
+
+    def get(self, task_id):
+        """Return (task_type, task) for a task id, or None"""
+        self.refresh()
+        task = self.by_id.get(task_id)
+        return (task.task_type, task) if task else None
+
+    def summary(self, today=None):
+        """Return total/completed/pending/overdue/due_today counters and a priority histogram
+
+        Before the shards are loaded this reads only the manifest and the
+        journal; otherwise, or when the manifest cannot be used, it counts
+        from the in-memory index.
+        """
+        today = today_ordinal() if today is None else today
+        if not self._loaded:
+            with self.lock.shared():
+                if self.manifest.loaded or self.manifest.load():
+                    summary = self.manifest.summary(self.journal.records(), today)
+                    if summary is not None:
+                        return summary
+
+        self.refresh()
+        priorities = {}
+        for _, task in self.index:
+            priority = task.priority or "medium"
+            priorities[priority] = priorities.get(priority, 0) + 1
+        total, completed = len(self.index), self.index.completed
+        return {
+            "total": total,
+            "completed": completed,
+            "pending": total - completed,
+            "overdue": self.index.pending.window(1, today - 1, 0, 0)[1],
+            "due_today": self.index.pending.window(today, today, 0, 0)[1],
+            "priorities": priorities,
+            "shards": sum(1 for shard in self.shards.values() if shard["daily"] or shard["monthly"])
+        }
+
+    def version(self, start=None, end=None):
+        """Return a token that changes whenever a task due between two ordinals may have changed
+
+        Built from the manifest hashes of the shards in the range plus the
+        journal signature, so it costs no shard reads; tokens are cached
+        until the manifest or the journal changes.
+        """
+        self.refresh()
+        state = (self.manifest.generation, self.journal.signature())
+        if state != self._version_state:
+            self._version_state, self._versions = state, {}
+        if (start, end) in self._versions:
+            return self._versions[start, end]
+        low = ordinal_to_str(max(start, 1)) if start is not None else None
+        high = ordinal_to_str(max(end, 1)) if end is not None else None
+        digest = hashlib.sha1(repr(self.journal.signature()).encode('utf-8'))
+        for due_date, entry in sorted(self.manifest.entries.items()):
+            if partition(due_date) and ((low and due_date < low) or (high and due_date > high)):
+                continue
+            digest.update(f"{due_date}:{entry.get('hash')};".encode('utf-8'))
+        self._versions[start, end] = digest.hexdigest()
+        return self._versions[start, end]
+
+    def window(self, start=None, end=None, pending_only=False, offset=0, limit=None):
+        """Return (entries, matching) for one page of tasks due in a range"""
+        self.refresh()
+        index = self.index.pending if pending_only else self.index
+        return index.window(start, end, offset, limit)
+
+    def stats(self):
+        """Return (total, completed) from the index counters"""
+        self.refresh()
+        return len(self.index), self.index.completed
+
+    def load(self):
+        """Parse every shard in the tasks directory, then replay the journal"""
+        with self.lock.shared():
+            self._load()
+
+    def _load(self):
+        self.shards = {}
+        self._shard_seq = {}
+        self._signatures = {}
+        self._dirty_dates = set()
+        self._pending = []
+        self._flat = None
+        self._loaded = True
+        self._load_error = None
+        try:
+            if not os.path.exists(self.tasks_dir):
+                os.makedirs(self.tasks_dir)
+            self._dir_mtime = os.stat(self.tasks_dir).st_mtime_ns
+            moved = migrate_flat_layout(self.tasks_dir)
+            if moved:
+                print(self.style.success_msg(f"Moved {moved} task file(s) into {self.tasks_dir}/YYYY/MM"),
+                      file=sys.stderr)
+            self._dir_mtime = os.stat(self.tasks_dir).st_mtime_ns
+            self._last_stat = time.monotonic()
+            self.manifest.load()
+            paths = list_shards(self.tasks_dir)
+            self._read_shards(paths)
+            self.manifest.retain(paths)
+            self._seq = max(self._shard_seq.values(), default=0)
+            self._replay_journal()
+        except Exception as e:
+            print(self.style.error_msg(f"Error loading tasks: {e}"), file=sys.stderr)
+            self.shards = {}
+            self._load_error = e
+        self.index.rebuild(task for _, task in self._pairs(self.shards.values()))
+        self.by_id = {}
+        if self._load_error is None and not self._assign_ids(self.shards):
+            self._save_manifest()
+
+    def refresh(self):
+        """Load on first use, then pick up only shards changed on disk"""
+        if not self._loaded:
+            self.load()
+            return
+        with self.lock.shared():
+            self._refresh()
+
+    def _refresh(self):
+        try:
+            dir_mtime = os.stat(self.tasks_dir).st_mtime_ns
+        except FileNotFoundError:
+            self.load()
+            return
+
+        if (self._load_error is not None or self.journal.signature() != self._journal_signature) and not self._pending:
+            self.load()
+            return
+
+        now = time.monotonic()
+        if dir_mtime == self._dir_mtime and now - self._last_stat < self.STAT_INTERVAL:
+            return
+        self._dir_mtime = dir_mtime
+        self._last_stat = now
+
+        on_disk = list_shards(self.tasks_dir)
+        changed = {}
+        for due_date, path in on_disk.items():
+            try:
+                signature = self._signature(path)
+            except FileNotFoundError:
+                continue
+            if self._signatures.get(due_date) != signature:
+                changed[due_date] = self.shards.get(due_date)
+
+        self._read_shards({due_date: on_disk[due_date] for due_date in changed})
+        for due_date, old_shard in changed.items():
+            self._reindex(old_shard, self.shards.get(due_date))
+        if self._assign_ids(changed):
+            return
+
+        for due_date in set(self._signatures) - on_disk.keys():
+            del self._signatures[due_date]
+            self.manifest.discard(due_date)
+            if due_date not in self._dirty_dates:
+                self._reindex(self.shards.pop(due_date, None), None)
+                self._flat = None
+        self._save_manifest()
+
+    def add(self, task_type, task):
+        """Add a task to the shard of its due date"""
+        self._ensure_id(task)
+        self._record({"op": "add", "type": task_type, "task": task.to_dict()})
+        self._attach(task_type, task)
+
+    def add_many(self, pairs):
+        """Add a batch of tasks, writing each affected shard exactly once
+
+        The tasks are not journaled, so the exclusive lock is held from the
+        freshness check to the shard writes.
+        """
+        pairs = list(pairs)
+        with self.lock.exclusive():
+            self.refresh()
+            if self._stale({task.due_date for _, task in pairs}) or self._load_error is not None:
+                self._rebase()
+            if self._load_error is not None:
+                raise OSError(f"tasks could not be loaded: {self._load_error}")
+            for task_type, task in pairs:
+                self._attach(task_type, task)
+            self.compact()
+
+    def remove_many(self, pairs):
+        """Remove a batch of tasks, writing each affected shard exactly once"""
+        for task_type, task in pairs:
+            self.remove(task_type, task)
+        self.compact()
+
+    def update(self, task_type, task, old_due_date=None, was=None):
+        """Record an in-place edit, moving the task if its due date changed
+
+        ``was`` is the task as a dict before the edit. Its completed flag and
+        priority let manifest summaries account for the change, and the list
+        of changed fields lets a rebase merge the edit into a newer version.
+        """
+        old_due_date = old_due_date or task.due_date
+        pos = self._position(task_type, task, old_due_date)
+        record = {"op": "update", "type": task_type, "date": old_due_date, "id": task.id, "task": task.to_dict()}
+        if was is not None:
+            record["was"] = {"completed": bool(was.get("completed")), "priority": was.get("priority")}
+            record["fields"] = sorted(key for key in set(was) | set(record["task"])
+                                      if was.get(key) != record["task"].get(key))
+        self._record(record)
+        if old_due_date != task.due_date:
+            del self.shards[old_due_date][task_type][pos]
+            self._shard(task.due_date)[task_type].append(task)
+            self._touch(old_due_date)
+        self.index.update(task)
+        self._touch(task.due_date)
+
+    def complete(self, task_type, task):
+        """Mark a task as completed"""
+        self._record({"op": "complete", "type": task_type, "date": task.due_date, "id": task.id,
+                      "was": self._state(task)})
+        task.completed = True
+        self.index.update(task)
+        self._touch(task.due_date)
+
+    def remove(self, task_type, task):
+        """Remove a task from its shard"""
+        pos = self._position(task_type, task, task.due_date)
+        self._record({"op": "remove", "type": task_type, "date": task.due_date, "id": task.id,
+                      "was": self._state(task)})
+        del self.shards[task.due_date][task_type][pos]
+        self.index.remove(task)
+        self.by_id.pop(task.id, None)
+        self._touch(task.due_date)
+
+    def save(self):
+        """Append pending mutations to the journal, compacting when it grows
+
+        When another process changed the journal or a shard these mutations
+        touch, the data is reloaded outside the lock and the mutations are
+        re-applied on top; the last attempt does that under the lock.
+        """
+        for attempt in range(self.SAVE_RETRIES):
+            if not self._pending:
+                return
+            last = attempt == self.SAVE_RETRIES - 1
+            with self.lock.exclusive():
+                if self._load_error is not None and not self._recover():
+                    return
+                stale = self._stale()
+                if stale and last:
+                    self._rebase()
+                if not stale or last:
+                    if self._append_pending() and self.journal.size() > self.journal_max_bytes:
+                        self.compact()
+                    return
+            self._rebase()
+
+    def _append_pending(self):
+        if not self._pending:
+            return False
+        try:
+            if not os.path.exists(self.tasks_dir):
+                os.makedirs(self.tasks_dir)
+                print(self.style.success_msg(f"Created directory: {self.tasks_dir}"), file=sys.stderr)
+            self.journal.append(self._pending)
+            self._pending = []
+            self._journal_signature = self.journal.signature()
+        except Exception as e:
+            print(self.style.error_msg(f"Error saving tasks: {e}"), file=sys.stderr)
+            return False
+        return True
+
+    def compact(self):
+        """Fold the journal into the dirty shards and truncate it"""
+        with self.lock.exclusive():
+            if self._load_error is not None and not self._recover():
+                return
+            if self._stale():
+                self._rebase()
+            self._compact()
+
+    def _compact(self):
+        if self._pending and not self._append_pending():
+            return
+        try:
+            empty_dates = []
+            for due_date in sorted(self._dirty_dates):
+                shard = self.shards.get(due_date) or self.empty_shard()
+                self._write_shard(due_date, shard)
+                if not (shard["daily"] or shard["monthly"]):
+                    empty_dates.append(due_date)
+
+            # The manifest must not lag behind the shards once the journal is gone
+            self.manifest.save()
+            self.journal.truncate()
+            self._journal_signature = None
+
+            for due_date in empty_dates:
+                remove_shard(self.tasks_dir, self.shard_path(due_date))
+                self.shards.pop(due_date, None)
+                self._shard_seq.pop(due_date, None)
+                self._signatures.pop(due_date, None)
+                self.manifest.discard(due_date)
+            self.manifest.save()
+            self._dirty_dates = set()
+            self._dir_mtime = os.stat(self.tasks_dir).st_mtime_ns
+            print(self.style.success_msg(f"Compacted task journal into {self.tasks_dir}"), file=sys.stderr)
+        except Exception as e:
+            print(self.style.error_msg(f"Error compacting tasks: {e}"), file=sys.stderr)
+
+    def _write_shard(self, due_date, shard):
+        filename = self.shard_path(due_date)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        tmp_path = f'{filename}.{os.getpid()}.tmp'
+        raw = json.dumps({
+            "daily": [task.to_dict() for task in shard["daily"]],
+            "monthly": [task.to_dict() for task in shard["monthly"]],
+            "seq": self._seq
+        }, indent=4).encode('utf-8')
+        with open(tmp_path, 'wb') as f:
+            f.write(raw)
+        os.replace(tmp_path, filename)
+        self._shard_seq[due_date] = self._seq
+        self._signatures[due_date] = self._signature(filename)
+        self.manifest.observe(due_date, raw, shard, self._seq)
+
+    def _save_manifest(self):
+        """Write the manifest under the exclusive lock while it still matches the shards on disk
+
+        Loads and refreshes run under the shared lock, so another process may
+        have written shards (and its own manifest) since these entries were
+        observed; the manifest then stays dirty for the next load to fix.
+        """
+        if not self.manifest.dirty:
+            return
+        try:
+            with self.lock.exclusive():
+                if (self._shards_changed(self._signatures)
+                        or list_shards(self.tasks_dir).keys() - self._signatures.keys()):
+                    return
+                self.manifest.save()
+        except OSError as e:
+            print(self.style.error_msg(f"Error saving {self.manifest.path}: {e}"), file=sys.stderr)
+
+    @classmethod
+    def read_shard_file(cls, filepath):
+        """Parse one shard file and return (shard, seq)"""
+        with open(filepath, 'rb') as f:
+            return cls.parse_shard(f.read())
+
+    @staticmethod
+    def parse_shard(raw):
+        """Decode the bytes of one shard file into (shard, seq) of Task records"""
+        date_tasks = json.loads(raw)
+        shard = {
+            task_type: [Task.from_dict(task_type, data) for data in date_tasks.get(task_type, [])]
+            for task_type in TASK_TYPES
+        }
+        return shard, date_tasks.get("seq", 0)
+
+    @classmethod
+    def _read_shard_bytes(cls, filepath):
+        """Return (signature, raw bytes) or the exception raised reading them"""
+        try:
+            signature = cls._signature(filepath)
+            with open(filepath, 'rb') as f:
+                return signature, f.read()
+        except Exception as e:
+            return e
+
+    def _read_shards(self, paths):
+        """Read {due_date: path} shards concurrently, then decode and merge them in date order
+
+        Only stat(), open() and read() run on the thread pool, where they
+        release the GIL; decoding happens here as results arrive in due-date
+        order, so errors are reported in the same order as a sequential load.
+        """
+        due_dates = sorted(paths)
+        paths = [paths[due_date] for due_date in due_dates]
+        pool, futures = None, []
+        if self.load_workers > 1 and len(paths) >= self.PARALLEL_MIN_SHARDS:
+            pool = ThreadPoolExecutor(max_workers=min(self.load_workers, len(paths)))
+            futures = [pool.submit(self._read_shard_bytes, path) for path in paths]
+            results = (future.result() for future in futures)
+        else:
+            results = map(self._read_shard_bytes, paths)
+
+        try:
+            for due_date, path, result in zip(due_dates, paths, results):
+                try:
+                    if isinstance(result, Exception):
+                        raise result
+                    signature, raw = result
+                    shard, seq = self.parse_shard(raw)
+                except Exception as e:
+                    print(self.style.error_msg(f"Error loading {os.path.basename(path)}: {e}"), file=sys.stderr)
+                    continue
+                self.shards[due_date], self._shard_seq[due_date] = shard, seq
+                self._signatures[due_date] = signature
+                self.manifest.observe(due_date, raw, shard, seq)
+        finally:
+            if pool:
+                # shutdown(cancel_futures=True) needs Python 3.9
+                for future in futures:
+                    future.cancel()
+                pool.shutdown(wait=True)
+        self._flat = None
+
+    def _stale(self, due_dates=None):
+        """Return True when the journal, or a shard about to be rewritten, changed on disk"""
+        if self.journal.signature() != self._journal_signature:
+            return True
+        return self._shards_changed(self._dirty_dates if due_dates is None else due_dates)
+
+    def _shards_changed(self, due_dates):
+        """Return True when a shard file of ``due_dates`` no longer matches the copy read or written"""
+        for due_date in due_dates:
+            try:
+                signature = self._signature(self.shard_path(due_date))
+            except FileNotFoundError:
+                signature = None
+            if signature != self._signatures.get(due_date):
+                return True
+        return False
+
+    def _recover(self):
+        """Retry a failed load before writing; report and keep the changes in memory while it still fails
+
+        Writing on top of the empty state a failed load leaves behind would
+        overwrite the shards on disk with only this session's changes.
+        """
+        self._rebase()
+        if self._load_error is None:
+            return True
+        print(self.style.error_msg(f"Not saving {len(self._pending)} change(s): tasks could not be loaded"),
+              file=sys.stderr)
+        return False
+
+    def _rebase(self):
+        """Reload from disk and re-apply the unsaved records on top, by task id"""
+        pending, self._pending = self._pending, []
+        self.load()
+        if self._load_error is not None:
+            self._pending = pending
+            return
+        dropped = 0
+        for record in pending:
+            try:
+                if record["op"] != "add":
+                    tasks = self.shards[record["date"]][record["type"]]
+                    current = tasks[self.locate(tasks, record)]
+                    record["was"] = self._state(current)
+                    if "fields" in record:
+                        record["task"] = self._merge(current.to_dict(), record["task"], record["fields"])
+                for due_date in self.touched_dates(record):
+                    self.apply_record(self._shard(due_date), due_date, record)
+                    self._touch(due_date)
+            except (KeyError, IndexError, TypeError):
+                dropped += 1
+                continue
+            self._record(record)
+        self.index.rebuild(task for _, task in self._pairs(self.shards.values()))
+        self.by_id = {task.id: task for _, task in self._pairs(self.shards.values())}
+        if dropped:
+            print(self.style.warning_msg(f"Dropped {dropped} change(s) to tasks another process removed"),
+                  file=sys.stderr)
+
+    def _replay_journal(self):
+        """Apply journal records newer than the shards they touch"""
+        for record in self.journal.records():
+            seq = record.get("seq", 0)
+            self._seq = max(self._seq, seq)
+            try:
+                for due_date in self.touched_dates(record):
+                    if seq > self._shard_seq.get(due_date, 0):
+                        self.apply_record(self._shard(due_date), due_date, record)
+                        self._dirty_dates.add(due_date)
+            except (KeyError, IndexError, TypeError) as e:
+                print(self.style.error_msg(f"Skipping journal record {seq}: {e}"), file=sys.stderr)
+        self._journal_signature = self.journal.signature()
+
+    @staticmethod
+    def touched_dates(record):
+        """Return the due dates whose shards a journal record changes"""
+        if record["op"] == "add":
+            return [record["task"]["due_date"]]
+        if record["op"] == "update" and record["task"]["due_date"] != record["date"]:
+            return [record["date"], record["task"]["due_date"]]
+        return [record["date"]]
+
+    @staticmethod
+    def apply_record(shard, due_date, record):
+        """Apply the part of a journal record that concerns one shard"""
+        op, tasks = record["op"], shard[record["type"]]
+        if op == "add":
+            tasks.append(Task.from_dict(record["type"], record["task"]))
+        elif op == "complete":
+            tasks[TaskRepository.locate(tasks, record)].completed = True
+        elif op == "remove":
+            del tasks[TaskRepository.locate(tasks, record)]
+        elif op == "update":
+            task = Task.from_dict(record["type"], record["task"])
+            if record["date"] == task.due_date:
+                tasks[TaskRepository.locate(tasks, record)] = task
+            elif due_date == record["date"]:
+                del tasks[TaskRepository.locate(tasks, record)]
+            else:
+                tasks.append(task)
+
+    @staticmethod
+    def locate(tasks, record):
+        """Return the list position of the task a journal record refers to
+
+        Records name tasks by ``id``; journals written before ids existed
+        carry the list position in ``pos`` instead.
+        """
+        if "id" not in record:
+            return record["pos"]
+        for pos, task in enumerate(tasks):
+            if task.id == record["id"]:
+                return pos
+        raise KeyError(f"task {record['id']}")
+
+    @staticmethod
+    def _merge(current, edited, fields):
+        """Apply only the edited fields of a task dict on top of its current version"""
+        for key in fields:
+            if key in edited:
+                current[key] = edited[key]
+            else:
+                current.pop(key, None)
+        return current
+
+    @staticmethod
+    def _state(task):
+        return {"completed": task.completed, "priority": task.priority}
+
+    def _record(self, record):
+        self._seq += 1
+        record["seq"] = self._seq
+        self._pending.append(record)
+
+    def _pairs(self, shards):
+        for shard in shards:
+            for task_type in self.TASK_TYPES:
+                for task in shard.get(task_type, []):
+                    yield task_type, task
+
+    def _reindex(self, old_shard, new_shard):
+        if old_shard is new_shard:
+            return
+        for _, task in self._pairs([old_shard] if old_shard else []):
+            self.index.remove(task)
+            if self.by_id.get(task.id) is task:
+                del self.by_id[task.id]
+        for _, task in self._pairs([new_shard] if new_shard else []):
+            self.index.insert(task)
+
+    @staticmethod
+    def _signature(filepath):
+        stat = os.stat(filepath)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _shard(self, due_date):
+        if due_date not in self.shards:
+            self.shards[due_date] = self.empty_shard()
+        return self.shards[due_date]
+
+    def _ensure_id(self, task):
+        """Give a task a fresh id if it has none or its id is taken"""
+        if task.id is None or self.by_id.get(task.id, task) is not task:
+            task.id = new_task_id()
+            while task.id in self.by_id:
+                task.id = new_task_id()
+            return True
+        return False
+
+    def _assign_ids(self, due_dates):
+        """Index shard tasks by id, writing back shards whose tasks lacked one
+
+        The shards are written under the exclusive lock. If one changed on
+        disk since it was read (another process gave it ids first), the data
+        is reloaded under that lock instead so every process keeps the ids on
+        disk; returns True in that case.
+        """
+        assigned, written = 0, []
+        for due_date in due_dates:
+            shard = self.shards.get(due_date)
+            if not shard:
+                continue
+            changed = False
+            for _, task in self._pairs([shard]):
+                if self._ensure_id(task):
+                    changed = True
+                    assigned += 1
+                self.by_id[task.id] = task
+            if changed:
+                written.append(due_date)
+        if not written:
+            return False
+        with self.lock.exclusive():
+            if self._stale(written):
+                self._rebase()
+                return True
+            try:
+                for due_date in written:
+                    self._write_shard(due_date, self.shards[due_date])
+                    self._dirty_dates.discard(due_date)
+            except OSError as e:
+                print(self.style.error_msg(f"Error saving task ids: {e}"), file=sys.stderr)
+                return False
+        self._dir_mtime = os.stat(self.tasks_dir).st_mtime_ns
+        print(self.style.success_msg(f"Assigned ids to {assigned} existing task(s)"), file=sys.stderr)
+        return False
+
+    def _attach(self, task_type, task):
+        self._ensure_id(task)
+        self.by_id[task.id] = task
+        self._shard(task.due_date)[task_type].append(task)
+        self.index.insert(task)
+        self._touch(task.due_date)
+
+    def _position(self, task_type, task, due_date):
+        for idx, candidate in enumerate(self.shards.get(due_date, self.empty_shard())[task_type]):
+            if candidate is task:
+                return idx
+        raise ValueError(f"Task not found in shard {due_date}")
+
+    def _touch(self, due_date):
+        self._dirty_dates.add(due_date)
+        self._flat = None
@@ -0,0 +1,48 @@
+import json
+import os
+
+
+class ScheduleCache:
+    """schedule.json parsed once and re-read only when its mtime or size changes
+
+    Unsaved edits are protected: after mark_modified() the cached document is
+    served as-is until save() writes it back.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = None
+        self.signature = None
+        self.modified = False
+
+    def load(self):
+        """Return (schedule, changed); raise FileNotFoundError when missing"""
+        if self.modified and self.data is not None:
+            return self.data, False
+        signature = self._signature()
+        if signature == self.signature and self.data is not None:
+            return self.data, False
+        with open(self.path, 'r', encoding='utf-8') as file:
+            self.data = json.load(file)
+        self.signature = signature
+        return self.data, True
+
+    def mark_modified(self, data):
+        """Record in-memory edits that must survive until the next save"""
+        self.data = data
+        self.modified = True
+
+    def save(self, data):
+        """Write the schedule and remember the signature of the new file"""
+        schedule_dir = os.path.dirname(self.path)
+        if not os.path.exists(schedule_dir):
+            os.makedirs(schedule_dir)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4)
+        self.data = data
+        self.signature = self._signature()
+        self.modified = False
+
+    def _signature(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
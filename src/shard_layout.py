@@ -0,0 +1,135 @@
+try:
+  from task_index import date_ordinal, ordinal_to_str
+except ImportError:
+  from src.task_index import date_ordinal, ordinal_to_str
+from datetime import date
+import os
+
+PREFIX = 'tasks_'
+SUFFIX = '.json'
+
+
+def shard_filename(due_date):
+    return f'{PREFIX}{due_date}{SUFFIX}'
+
+
+def shard_date(filename):
+    """Return the due date encoded in a shard filename, or None"""
+    if filename.startswith(PREFIX) and filename.endswith(SUFFIX):
+        return filename[len(PREFIX):-len(SUFFIX)]
+    return None
+
+
+def partition(due_date):
+    """Return the (YYYY, MM) directories of a due date, or None if it is not a valid date"""
+    ordinal = date_ordinal(due_date)
+    if not ordinal or ordinal_to_str(ordinal) != due_date:
+        return None
+    return due_date[:4], due_date[5:7]
+
+
+def shard_path(tasks_dir, due_date):
+    """Return the file holding tasks due on ``due_date``: tasks/YYYY/MM/tasks_<date>.json
+
+    Due dates that are not valid YYYY-MM-DD strings stay at the top level.
+    """
+    parts = partition(due_date)
+    if parts is None:
+        return os.path.join(tasks_dir, shard_filename(due_date))
+    return os.path.join(tasks_dir, *parts, shard_filename(due_date))
+
+
+def _month_range(start, end):
+    low = (0, 0) if start is None else _year_month(start)
+    high = (9999, 12) if end is None else _year_month(end)
+    return low, high
+
+
+def _year_month(ordinal):
+    day = date.fromordinal(min(max(ordinal, 1), date.max.toordinal()))
+    return day.year, day.month
+
+
+def list_shards(tasks_dir, start=None, end=None):
+    """Return {due_date: path} of the shard files due between two ordinals
+
+    Year and month directories outside the range are skipped without being
+    listed. Files still at the top level (the flat layout, or dates that are
+    not valid) are always included; a partitioned file wins over a flat one.
+    """
+    shards = {}
+    low, high = _month_range(start, end)
+    try:
+        top = list(os.scandir(tasks_dir))
+    except FileNotFoundError:
+        return shards
+
+    for entry in top:
+        due_date = shard_date(entry.name)
+        if due_date and entry.is_file():
+            shards[due_date] = entry.path
+
+    for year_entry in top:
+        if not (year_entry.is_dir() and year_entry.name.isdigit() and len(year_entry.name) == 4):
+            continue
+        year = int(year_entry.name)
+        if not low[0] <= year <= high[0]:
+            continue
+        for month_entry in os.scandir(year_entry.path):
+            if not (month_entry.is_dir() and month_entry.name.isdigit()):
+                continue
+            if not low <= (year, int(month_entry.name)) <= high:
+                continue
+            for entry in os.scandir(month_entry.path):
+                due_date = shard_date(entry.name)
+                if due_date:
+                    shards[due_date] = entry.path
+
+    if start is not None or end is not None:
+        start = start if start is not None else 0
+        end = end if end is not None else date.max.toordinal()
+        shards = {due_date: path for due_date, path in shards.items()
+                  if not partition(due_date) or start <= date_ordinal(due_date) <= end}
+    return shards
+
+
+def migrate_flat_layout(tasks_dir):
+    """Move top-level tasks_<date>.json files into YYYY/MM directories
+
+    Each move is a single os.replace(), so an interrupted migration leaves
+    every shard in exactly one place and simply resumes on the next load.
+    Returns the number of files moved.
+    """
+    moved = 0
+    try:
+        names = os.listdir(tasks_dir)
+    except FileNotFoundError:
+        return moved
+    for name in names:
+        due_date = shard_date(name)
+        if not due_date or partition(due_date) is None:
+            continue
+        source = os.path.join(tasks_dir, name)
+        target = shard_path(tasks_dir, due_date)
+        if os.path.exists(target):
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.replace(source, target)
+        except FileNotFoundError:
+            # Another process migrating at the same time moved it first
+            continue
+        moved += 1
+    return moved
+
+
+def remove_shard(tasks_dir, path):
+    """Delete a shard file and the month/year directories it leaves empty"""
+    os.remove(path)
+    directory = os.path.dirname(path)
+    while os.path.abspath(directory) != os.path.abspath(tasks_dir):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            break
+        directory = os.path.dirname(directory)
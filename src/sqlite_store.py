@@ -0,0 +1,339 @@
+try:
+  from color import Colors
+  from journal import TaskJournal
+  from repository import TaskRepository
+  from shard_layout import list_shards
+  from task import TASK_TYPES, Task, new_task_id
+  from task_index import DueDateQueries, ordinal_to_str, today_ordinal
+except ImportError:
+  from src.color import Colors
+  from src.journal import TaskJournal
+  from src.repository import TaskRepository
+  from src.shard_layout import list_shards
+  from src.task import TASK_TYPES, Task, new_task_id
+  from src.task_index import DueDateQueries, ordinal_to_str, today_ordinal
+from itertools import groupby
+from operator import itemgetter
+import json
+import os
+import sqlite3
+import sys
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    task_type TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    priority TEXT NOT NULL DEFAULT 'medium',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date, completed);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks (completed);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_type ON tasks (task_type);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+MIGRATED_KEY = 'json_migrated'
+
+
+class SQLiteTaskRepository(DueDateQueries):
+    """Task storage in a single SQLite database
+
+    Offers the same operations as TaskRepository. Indexed columns mirror the
+    fields used for filtering and sorting, while the ``data`` column keeps the
+    full task document so notes, categories and unknown keys survive a round
+    trip. Every mutation is a single-row statement committed by save().
+    Stable task ids live in the ``data`` document and are mapped to rowids
+    in memory; rows from before ids existed get one on first load.
+    """
+
+    TASK_TYPES = TASK_TYPES
+
+    def __init__(self, db_path, tasks_dir=None, style=None):
+        self.style = style or Colors()
+        self.db_path = db_path
+        self.tasks_dir = tasks_dir
+        self.conn = None
+        self._rows = {}
+        self._rowids = {}
+        self.by_id = {}
+        self._data_version = None
+        self._flat = None
+
+    @property
+    def tasks(self):
+        """Return all tasks grouped by type, ordered by due date"""
+        if self._flat is None:
+            flat = {"daily": [], "monthly": []}
+            for task_type, task in self.sorted_tasks():
+                flat[task_type].append(task)
+            self._flat = flat
+        return self._flat
+
+    def connect(self):
+        """Open the database, creating the schema and migrating JSON shards once
+
+        The migration commits its rows together with a marker in the
+        ``meta`` table, so it is retried until every shard has been copied.
+        If a shard cannot be read, a database created here is removed again
+        and the error is raised instead of losing that shard's tasks.
+        """
+        if self.conn is not None:
+            return self.conn
+        directory = os.path.dirname(self.db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        is_new = not os.path.exists(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            legacy = not is_new and conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meta'").fetchone() is None
+            conn.executescript(SCHEMA)
+            if legacy:
+                # Databases from before the marker were migrated when they were created
+                with conn:
+                    conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES (?, '1')", (MIGRATED_KEY,))
+            if self.tasks_dir:
+                migrated = migrate_json_shards(self.tasks_dir, conn, self.style)
+                if migrated:
+                    print(self.style.success_msg(f"Migrated {migrated} tasks from {self.tasks_dir} to {self.db_path}"),
+                          file=sys.stderr)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            conn.close()
+            if is_new and os.path.exists(self.db_path):
+                os.remove(self.db_path)
+            raise ValueError(f"migrating {self.tasks_dir} to {self.db_path} failed, nothing was written: {e}") from e
+        self.conn = conn
+        return self.conn
+
+    def load(self):
+        """Read every task row into the identity cache"""
+        try:
+            conn = self.connect()
+            self._rows = {}
+            self._rowids = {}
+            self.by_id = {}
+            self._flat = None
+            missing = []
+            for rowid, task_type, data in conn.execute("SELECT id, task_type, data FROM tasks"):
+                task = Task.from_dict(task_type, json.loads(data))
+                self._rows[rowid] = (task_type, task)
+                self._rowids[id(task)] = rowid
+                if task.id is None or task.id in self.by_id:
+                    missing.append((task_type, task))
+                else:
+                    self.by_id[task.id] = task
+            if missing:
+                for task_type, task in missing:
+                    self._assign_id(task)
+                    self.update(task_type, task)
+                self.save()
+                print(self.style.success_msg(f"Assigned ids to {len(missing)} existing task(s)"), file=sys.stderr)
+            self._data_version = self._current_version()
+        except Exception as e:
+            print(self.style.error_msg(f"Error loading tasks: {e}"), file=sys.stderr)
+            self._rows = {}
+            self._rowids = {}
+            self.by_id = {}
+
+    def refresh(self):
+        """Reload only when another connection has modified the database"""
+        if self.conn is None or self._current_version() != self._data_version:
+            self.load()
+
+    def sorted_tasks(self):
+        """Return (task_type, task) pairs ordered by due date then status"""
+        return self.tasks_between()
+
+    def tasks_between(self, start=None, end=None):
+        """Return (task_type, task) pairs due between two date ordinals"""
+        self.refresh()
+        clauses, params = self._range_clause(start, end)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        rows = self.conn.execute(f"SELECT id FROM tasks {where}ORDER BY due_date, completed, id", params)
+        return [self._rows[rowid] for rowid, in rows if rowid in self._rows]
+
+    def get(self, task_id):
+        """Return (task_type, task) for a task id, or None"""
+        self.refresh()
+        task = self.by_id.get(task_id)
+        return (task.task_type, task) if task else None
+
+    def summary(self, today=None):
+        """Return total/completed/pending/overdue/due_today counters and a priority histogram"""
+        today = ordinal_to_str(today_ordinal() if today is None else today)
+        self.refresh()
+        total, completed, overdue, due_today, shards = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(completed), 0), "
+            "COALESCE(SUM(completed = 0 AND due_date < ?), 0), COALESCE(SUM(completed = 0 AND due_date = ?), 0), "
+            "COUNT(DISTINCT due_date) FROM tasks", (today, today)
+        ).fetchone()
+        priorities = dict(self.conn.execute("SELECT priority, COUNT(*) FROM tasks GROUP BY priority"))
+        return {"total": total, "completed": completed, "pending": total - completed, "overdue": overdue,
+                "due_today": due_today, "priorities": priorities, "shards": shards}
+
+    def version(self, start=None, end=None):
+        """Return a token that changes whenever the database file is committed to"""
+        self.connect()
+        stat = os.stat(self.db_path)
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    def window(self, start=None, end=None, pending_only=False, offset=0, limit=None):
+        """Return (entries, matching) for one page of tasks due in a range"""
+        self.refresh()
+        where, params = self._range_clause(start, end)
+        if pending_only:
+            where.append("completed = 0")
+        where = f"WHERE {' AND '.join(where)} " if where else ""
+        matching = self.conn.execute(f"SELECT COUNT(*) FROM tasks {where}", params).fetchone()[0]
+        rows = self.conn.execute(
+            f"SELECT id FROM tasks {where}ORDER BY due_date, completed, id LIMIT ? OFFSET ?",
+            params + [-1 if limit is None else limit, max(offset, 0)]
+        )
+        return [self._rows[rowid] for rowid, in rows if rowid in self._rows], matching
+
+    def stats(self):
+        """Return (total, completed) with one aggregate query"""
+        self.refresh()
+        total, completed = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(completed), 0) FROM tasks").fetchone()
+        return total, completed
+
+    def iter_shards(self, start=None, end=None):
+        """Yield (due_date, shard) groups streamed from an ordered cursor"""
+        clauses, params = self._range_clause(start, end)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        cursor = self.connect().execute(f"SELECT due_date, task_type, data FROM tasks {where}ORDER BY due_date, id", params)
+        for due_date, rows in groupby(cursor, key=itemgetter(0)):
+            shard = {"daily": [], "monthly": []}
+            for _, task_type, data in rows:
+                shard[task_type].append(Task.from_dict(task_type, json.loads(data)))
+            yield due_date, shard
+
+    def add(self, task_type, task):
+        """Insert a task row"""
+        if task.id is None or self.by_id.get(task.id, task) is not task:
+            self._assign_id(task)
+        cursor = self.connect().execute(
+            "INSERT INTO tasks (task_type, due_date, completed, priority, data) VALUES (?, ?, ?, ?, ?)",
+            self._columns(task_type, task)
+        )
+        self._rows[cursor.lastrowid] = (task_type, task)
+        self._rowids[id(task)] = cursor.lastrowid
+        self.by_id[task.id] = task
+        self._flat = None
+
+    def add_many(self, pairs):
+        """Insert a batch of tasks in one transaction"""
+        self.refresh()
+        for task_type, task in pairs:
+            self.add(task_type, task)
+        self.save()
+
+    def remove_many(self, pairs):
+        """Delete a batch of tasks in one transaction"""
+        self.refresh()
+        for task_type, task in pairs:
+            self.remove(task_type, task)
+        self.save()
+
+    def update(self, task_type, task, old_due_date=None, was=None):
+        """Rewrite the row of an edited task"""
+        rowid = self._rowid(task)
+        self.connect().execute(
+            "UPDATE tasks SET task_type = ?, due_date = ?, completed = ?, priority = ?, data = ? WHERE id = ?",
+            self._columns(task_type, task) + (rowid,)
+        )
+        self._rows[rowid] = (task_type, task)
+        self._flat = None
+
+    def complete(self, task_type, task):
+        """Mark a task as completed"""
+        task.completed = True
+        self.update(task_type, task)
+
+    def remove(self, task_type, task):
+        """Delete the row of a task"""
+        rowid = self._rowid(task)
+        self.connect().execute("DELETE FROM tasks WHERE id = ?", (rowid,))
+        del self._rows[rowid]
+        del self._rowids[id(task)]
+        self.by_id.pop(task.id, None)
+        self._flat = None
+
+    def save(self):
+        """Commit pending row changes"""
+        try:
+            self.connect().commit()
+            self._data_version = self._current_version()
+        except Exception as e:
+            print(self.style.error_msg(f"Error saving tasks: {e}"), file=sys.stderr)
+
+    @staticmethod
+    def _range_clause(start, end):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("due_date >= ?")
+            params.append(ordinal_to_str(max(start, 1)))
+        if end is not None:
+            clauses.append("due_date <= ?")
+            params.append(ordinal_to_str(max(end, 1)))
+        return clauses, params
+
+    def _assign_id(self, task):
+        task.id = new_task_id()
+        while task.id in self.by_id:
+            task.id = new_task_id()
+        self.by_id[task.id] = task
+
+    def _current_version(self):
+        return self.connect().execute("PRAGMA data_version").fetchone()[0]
+
+    def _rowid(self, task):
+        try:
+            return self._rowids[id(task)]
+        except KeyError:
+            raise ValueError(f"Task not found in {self.db_path}") from None
+
+    @staticmethod
+    def _columns(task_type, task):
+        return (
+            task_type,
+            task.due_date,
+            int(task.completed),
+            task.priority or "medium",
+            json.dumps(task.to_dict())
+        )
+
+
+def migrate_json_shards(tasks_dir, conn, style=None):
+    """Copy every task from the JSON shards, with the journal replayed on top, into an open database
+
+    Does nothing once the database records a completed migration. Raises
+    ValueError, with nothing written, when a shard cannot be read.
+    """
+    if conn.execute("SELECT 1 FROM meta WHERE key = ?", (MIGRATED_KEY,)).fetchone():
+        return 0
+    rows = []
+    if list_shards(tasks_dir) or os.path.exists(os.path.join(tasks_dir, TaskJournal.FILENAME)):
+        repository = TaskRepository(tasks_dir, style)
+        with repository.lock.shared():
+            for _, shard in repository.iter_shards(strict=True):
+                for task_type in SQLiteTaskRepository.TASK_TYPES:
+                    for task in shard[task_type]:
+                        rows.append(SQLiteTaskRepository._columns(task_type, task))
+
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO tasks (task_type, due_date, completed, priority, data) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute("INSERT INTO meta (key, value) VALUES (?, '1')", (MIGRATED_KEY,))
+    except sqlite3.IntegrityError:
+        # Another process finished the migration first; its rows stand and these are rolled back
+        return 0
+    return len(rows)
@@ -0,0 +1,144 @@
+try:
+  from task_index import date_ordinal, ordinal_to_str
+except ImportError:
+  from src.task_index import date_ordinal, ordinal_to_str
+import secrets
+
+TASK_TYPES = ("daily", "monthly")
+PRIORITIES = ("high", "medium", "low")
+PRIORITY_RANK = {priority: rank for rank, priority in enumerate(PRIORITIES)}
+
+EDITABLE_FIELDS = ("description", "due_date", "priority", "completed", "notes", "category", "effort")
+TRUE_VALUES = ("1", "true", "yes", "y", "x")
+
+_CANONICAL = {value: value for value in TASK_TYPES + PRIORITIES}
+_FIELDS = ("id", "description", "due_date", "completed", "priority")
+
+
+def new_task_id():
+    """Return a short random hex ID for a new task"""
+    return secrets.token_hex(4)
+
+
+def parse_effort(value):
+    """Convert an effort such as '90', '90m', '1.5h' or '1h30' to whole minutes"""
+    text = str(value).strip().lower().replace(' ', '')
+    try:
+        if 'h' in text:
+            hours, _, minutes = text.partition('h')
+            minutes = float(hours or 0) * 60 + int(minutes.rstrip('m') or 0)
+        else:
+            minutes = float(text.rstrip('m'))
+    except ValueError:
+        raise ValueError(f"invalid effort {value!r}, use minutes or hours like 90, 45m, 1.5h or 1h30") from None
+    if not 0 < minutes <= 7 * 24 * 60:
+        raise ValueError(f"invalid effort {value!r}, must be more than 0 and at most a week")
+    return max(int(round(minutes)), 1)
+
+
+def parse_changes(assignments):
+    """Turn ``field=value`` strings into a validated {field: value} dict"""
+    changes = {}
+    for assignment in assignments:
+        field, sep, value = assignment.partition('=')
+        field = field.strip().lower()
+        if not sep or field not in EDITABLE_FIELDS:
+            raise ValueError(f"expected one of {', '.join(EDITABLE_FIELDS)} as field=value, got {assignment!r}")
+        value = value.strip()
+        if field == "description" and not value:
+            raise ValueError("description cannot be empty")
+        if field == "due_date":
+            ordinal = date_ordinal(value)
+            if not ordinal or ordinal_to_str(ordinal) != value:
+                raise ValueError(f"invalid due_date {value!r}, use YYYY-MM-DD")
+        if field == "priority":
+            value = value.lower()
+            if value not in PRIORITIES:
+                raise ValueError(f"invalid priority {value!r}")
+        if field == "completed":
+            value = value.lower() in TRUE_VALUES
+        if field == "effort" and value:
+            value = parse_effort(value)
+        changes[field] = value
+    return changes
+
+
+class Task:
+    """One task, stored in slots instead of a per-task dict
+
+    The due date is kept as a date ordinal, so sorting and range checks
+    compare ints. Type and priority always point at the shared strings of
+    TASK_TYPES/PRIORITIES. Keys outside the core schema (notes, category,
+    anything unknown) live in ``extra``, which stays None for most tasks.
+    ``id`` is a stable identifier assigned by the repository on first save.
+    to_dict() returns the JSON shard schema and round-trips every key; a due
+    date that is not a valid YYYY-MM-DD is kept verbatim, and a missing
+    "completed" flag is written back as false.
+    """
+
+    __slots__ = ("id", "task_type", "description", "due", "completed", "priority", "extra")
+
+    def __init__(self, task_type, description, due_date, completed=False, priority="medium", extra=None,
+                 task_id=None):
+        self.id = task_id
+        self.task_type = _CANONICAL.get(task_type, task_type)
+        self.description = description
+        self.extra = extra or None
+        self.completed = bool(completed)
+        self.priority = _CANONICAL.get(priority, priority)
+        self.due_date = due_date
+
+    @classmethod
+    def from_dict(cls, task_type, data):
+        """Build a Task from one entry of a shard's daily/monthly list"""
+        extra = {key: value for key, value in data.items() if key not in _FIELDS}
+        return cls(task_type, data.get("description", ""), data.get("due_date", ""),
+                   data.get("completed", False), data.get("priority"), extra, data.get("id"))
+
+    def to_dict(self):
+        """Return the task in the JSON shard schema"""
+        data = {"id": self.id} if self.id is not None else {}
+        data.update(description=self.description, due_date=self.due_date, completed=self.completed)
+        if self.priority is not None:
+            data["priority"] = self.priority
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @property
+    def due_date(self):
+        """The due date as a YYYY-MM-DD string"""
+        if self.due:
+            return ordinal_to_str(self.due)
+        return self.extra.get("due_date", "") if self.extra else ""
+
+    @due_date.setter
+    def due_date(self, value):
+        ordinal = date_ordinal(value)
+        if ordinal and ordinal_to_str(ordinal) == value:
+            self.due = ordinal
+            if self.extra:
+                self.extra.pop("due_date", None)
+        else:
+            self.due = 0
+            self.extra = dict(self.extra or {}, due_date=value)
+
+    def apply(self, changes):
+        """Apply a parse_changes() dict; an empty notes/category value removes it"""
+        for field, value in changes.items():
+            if field in _FIELDS:
+                setattr(self, field, value)
+            elif value:
+                self.extra = dict(self.extra or {}, **{field: value})
+            elif self.extra:
+                self.extra.pop(field, None)
+
+    def get(self, key, default=None):
+        """Return a core field or an extra key, like dict.get on the JSON form"""
+        if key in _FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default) if self.extra else default
+
+    def __repr__(self):
+        return f"Task({self.id!r}, {self.task_type!r}, {self.description!r}, {self.due_date!r}, completed={self.completed})"
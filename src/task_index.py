@@ -0,0 +1,143 @@
+from bisect import bisect_left
+from datetime import date
+from functools import lru_cache
+from itertools import count
+from operator import itemgetter
+
+
+@lru_cache(maxsize=4096)
+def date_ordinal(date_str):
+    """Return the proleptic ordinal of a YYYY-MM-DD string, 0 when invalid"""
+    try:
+        return date.fromisoformat(date_str).toordinal()
+    except (TypeError, ValueError):
+        return 0
+
+
+@lru_cache(maxsize=4096)
+def ordinal_to_str(ordinal):
+    return date.fromordinal(ordinal).isoformat()
+
+
+def today_ordinal():
+    return date.today().toordinal()
+
+
+class DueDateIndex:
+    """Tasks kept sorted by (due date ordinal, completed)
+
+    Keys live in one list and tasks in a parallel one, so range queries are
+    two bisects plus a slice and inserts never re-sort the whole collection.
+    Each key packs due ordinal, completed flag and an insertion counter into
+    one int, which is smaller and faster to compare than a tuple.
+    A nested index of pending tasks and a completed counter are kept in step,
+    so "pending only" windows and summary counts never scan every task.
+    Queries return (task_type, task) pairs like the repositories do.
+    """
+
+    DUE_SHIFT = 41
+    COMPLETED_SHIFT = 40
+
+    def __init__(self, tasks=(), track_pending=True):
+        self._keys = []
+        self._tasks = []
+        self._key_of = {}
+        self._seq = count()
+        self.completed = 0
+        self.pending = DueDateIndex(track_pending=False) if track_pending else None
+        self.rebuild(tasks)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __iter__(self):
+        return ((task.task_type, task) for task in self._tasks)
+
+    def rebuild(self, tasks):
+        """Replace the index content with the given tasks"""
+        items = sorted(((self._key(task), task) for task in tasks), key=itemgetter(0))
+        self._keys = [key for key, _ in items]
+        self._tasks = [task for _, task in items]
+        self._key_of = {id(task): key for key, task in items}
+        self.completed = sum(self._completed(key) for key in self._keys)
+        if self.pending is not None:
+            self.pending.rebuild(task for key, task in items if not self._completed(key))
+
+    def insert(self, task):
+        """Insert a task at its sorted position"""
+        key = self._key(task)
+        pos = bisect_left(self._keys, key)
+        self._keys.insert(pos, key)
+        self._tasks.insert(pos, task)
+        self._key_of[id(task)] = key
+        if self._completed(key):
+            self.completed += 1
+        elif self.pending is not None:
+            self.pending.insert(task)
+
+    def remove(self, task):
+        """Remove a task using the key it was indexed under"""
+        key = self._key_of.pop(id(task), None)
+        if key is None:
+            return
+        pos = bisect_left(self._keys, key)
+        del self._keys[pos]
+        del self._tasks[pos]
+        if self._completed(key):
+            self.completed -= 1
+        elif self.pending is not None:
+            self.pending.remove(task)
+
+    def update(self, task):
+        """Move a task whose due date or status changed"""
+        self.remove(task)
+        self.insert(task)
+
+    def between(self, start=None, end=None):
+        """Return entries due between two ordinals, both inclusive"""
+        lo, hi = self._bounds(start, end)
+        return [(task.task_type, task) for task in self._tasks[lo:hi]]
+
+    def window(self, start=None, end=None, offset=0, limit=None):
+        """Return (entries, matching) for one page of a date range"""
+        lo, hi = self._bounds(start, end)
+        first = min(lo + max(offset, 0), hi)
+        last = hi if limit is None else min(first + limit, hi)
+        return [(task.task_type, task) for task in self._tasks[first:last]], hi - lo
+
+    def _bounds(self, start, end):
+        lo = 0 if start is None else bisect_left(self._keys, start << self.DUE_SHIFT)
+        hi = len(self._keys) if end is None else bisect_left(self._keys, (end + 1) << self.DUE_SHIFT)
+        return lo, hi
+
+    def _key(self, task):
+        return (task.due << self.DUE_SHIFT) | (task.completed << self.COMPLETED_SHIFT) | next(self._seq)
+
+    @classmethod
+    def _completed(cls, key):
+        return key >> cls.COMPLETED_SHIFT & 1
+
+
+class DueDateQueries:
+    """Date-window queries built on a repository's tasks_between()"""
+
+    def overdue(self, today=None):
+        """Return tasks due before today"""
+        today = today_ordinal() if today is None else today
+        return self.tasks_between(None, today - 1)
+
+    def due_today(self, today=None):
+        """Return tasks due today"""
+        today = today_ordinal() if today is None else today
+        return self.tasks_between(today, today)
+
+    def due_this_week(self, today=None):
+        """Return tasks due from today through Sunday"""
+        today = today_ordinal() if today is None else today
+        sunday = today + 6 - date.fromordinal(today).weekday()
+        return self.tasks_between(today, sunday)
+
+    def due_within(self, days, today=None):
+        """Return tasks due in the next ``days`` days, today included"""
+        today = today_ordinal() if today is None else today
+        return self.tasks_between(today, today + max(days, 1) - 1)
@@ -1,24 +1,51 @@
 try:
-  from manager import Manager
   from color import Colors
+  from config import load_config
+  from daemon_client import forwardable, send_request, socket_path
+  from profiling import PROFILER
 except ImportError:
-  from src.manager import Manager
   from src.color import Colors
+  from src.config import load_config
+  from src.daemon_client import forwardable, send_request, socket_path
+  from src.profiling import PROFILER
+import os
 import sys
 import argparse
 import time
 
 
 class TimeMaster:
+    # Options that change how the program runs, not what it does
+    SESSION_OPTIONS = ('fast', 'no_daemon', 'profile', 'profile_output', 'cprofile')
+    # Options that only refine a command, e.g. --limit for -t or --weeks for --plan
+    MODIFIERS = ('format', 'limit', 'offset', 'pending', 'days', 'pager', 'older_than', 'weeks', 'port',
+                 'import_format', 'archived', 'output')
+
     def __init__(self):
+        self.started = time.perf_counter()
         self.style = Colors()
-        self.manager = Manager()
+        self.config = load_config()
+        self._manager = None
+        self.profile_output = None
+
+    @property
+    def manager(self):
+        """Build the Manager on first use so --help and menus start instantly"""
+        if self._manager is None:
+            try:
+              from manager import Manager
+            except ImportError:
+              from src.manager import Manager
+            self._manager = Manager(self.config)
+        return self._manager
 
     def run(self):
         args = self.parse_arguments()
 
-        if not any(vars(args).values()):
-            self.header()
+        if not self.has_command(args) or args.fast:
+            animate = not (args.fast or self.config["fast_startup"])
+            self.header(animate)
+            check_budget = not animate
             while True:
                 print(self.style.header_msg("\n=== Time Master System ===\n"))
                 print(f"{self.style.info_msg('1.')} {self.style.bold_msg('Display Weekly Schedule')}")
@@ -26,6 +53,9 @@ class TimeMaster:
                 print(f"{self.style.info_msg('3.')} {self.style.bold_msg('Task Manager')}")
                 print(f"{self.style.info_msg('4.')} {self.style.bold_msg('Exit')}")
 
+                if check_budget:
+                    self.check_startup_budget()
+                    check_budget = False
                 choice = input(self.style.info_msg("\nChoose option (1-4): "))
 
                 if choice == "1":
@@ -53,7 +83,7 @@ class TimeMaster:
             choice = input(self.style.info_msg("\nChoose option (1-6): "))
 
             if choice == "1":
-                self.manager.view_tasks()
+                self.manager.page_tasks()
             elif choice == "2":
                 self.manager.add_task()
             elif choice == "3":
@@ -74,9 +104,52 @@ class TimeMaster:
             sys.stdout.flush()
             time.sleep(0.1 / 100)
 
-    def header(self):
+    @classmethod
+    def has_command(cls, args):
+        """Return True when a one-shot command was given on the command line"""
+        skip = cls.SESSION_OPTIONS + cls.MODIFIERS
+        return any(value for name, value in vars(args).items() if name not in skip)
+
+    def check_modifiers(self, parser, args):
+        """Exit with a usage error when command options are given without a command"""
+        if self.has_command(args):
+            return
+        given = [action.option_strings[-1] for action in parser._actions
+                 if action.dest in self.MODIFIERS and getattr(args, action.dest) != action.default]
+        if given:
+            parser.error(f"{', '.join(given)} only apply to a command such as -t, --plan, --serve or --export")
+
+    def start_profiling(self, args):
+        """Enable instrumentation from --profile/--cprofile or the config"""
+        profile_output = args.profile_output or self.config["profile_output"]
+        cprofile_output = args.cprofile or self.config["cprofile_output"]
+        if args.profile or profile_output or cprofile_output or self.config["profile"]:
+            self.profile_output = profile_output
+            PROFILER.enable(cprofile_output)
+
+    def stop_profiling(self):
+        """Write the metrics file or print the stderr summary"""
+        if not PROFILER.enabled:
+            return
+        PROFILER.disable()
+        if self.profile_output:
+            PROFILER.write_report(self.profile_output)
+        else:
+            PROFILER.print_summary()
+
+    def check_startup_budget(self):
+        """Warn on stderr when the first prompt took longer than the configured budget"""
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        budget_ms = self.config["startup_budget_ms"]
+        if budget_ms and elapsed_ms > budget_ms:
+            print(self.style.warning_msg(
+                f"Startup took {elapsed_ms:.0f} ms (budget {budget_ms} ms)"
+            ), file=sys.stderr)
+        return elapsed_ms
+
+    def header(self, animate=True):
         c = self.style
-        self.slowprint(f"""
+        banner = f"""
         {c.BOLD}{c.WHITE}============================={c.B_C} =========================================================================={c.RESET}                   
 
                 {c.B_C}▄▄▄█████▓ ██▓ ███▄ ▄███▓▓█████{c.RESET}     ███▄ ▄███▓ ▄▄▄        ██████ ▄▄▄█████▓▓█████  ██▀███
@@ -94,15 +167,20 @@ class TimeMaster:
         {c.BOLD}{c.WHITE}======================================{c.RESET}
             {c.header_msg(f"{c.B_C}Task Management Application{self.style.RESET}")}
         {c.BOLD}{c.WHITE}======================================{c.RESET}
-            {c.bold_msg("Developer:")} {c.info_msg(f"{c.bold_msg("Walid-El-Hioul")}")}
+            {c.bold_msg("Developer:")} {c.info_msg(c.bold_msg("Walid-El-Hioul"))}
             📎 {c.bold_msg("github.com")}/Walid-El-Hioul/Time_Master
             💼 {c.bold_msg("linkedin.com")}/in/walid-el-hioul
         {c.BOLD}{c.WHITE}======================================{c.RESET}
-        """)
+        """
+        if animate and sys.stdout.isatty():
+            self.slowprint(banner)
+        else:
+            sys.stdout.write(banner + '\n')
+            sys.stdout.flush()
 
 
-    def parse_arguments(self):
-        """Parse command line arguments"""
+    def build_parser(self):
+        """Return the command line parser, shared with the daemon"""
         parser = argparse.ArgumentParser(
             description=self.style.header_msg('=== Time Master System ==='),
             formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -113,25 +191,139 @@ class TimeMaster:
             action='help',
             default=argparse.SUPPRESS,
             help=self.style.info_msg('show this help message and exit'))
+        parser.add_argument('--fast', action='store_true',
+            help=self.style.info_msg('Start the interactive menu without the animated banner'))
+        parser.add_argument('--daemon', action='store_true',
+            help=self.style.info_msg('Keep tasks and schedule loaded and answer other invocations over a Unix socket'))
+        parser.add_argument('--stop-daemon', action='store_true',
+            help=self.style.info_msg('Stop the running daemon'))
+        parser.add_argument('--no-daemon', action='store_true',
+            help=self.style.info_msg('Read the data files directly even when a daemon is running'))
+        parser.add_argument('--serve', action='store_true',
+            help=self.style.info_msg('Serve tasks and the schedule as a local HTTP JSON API'))
+        parser.add_argument('--port', type=int, metavar='N',
+            help=self.style.info_msg('Port for --serve (default: api_port)'))
+        parser.add_argument('--profile', action='store_true',
+            help=self.style.info_msg('Print wall time and file I/O per operation on stderr at exit'))
+        parser.add_argument('--profile-output', metavar='FILE',
+            help=self.style.info_msg('Write the --profile metrics to FILE as JSON instead'))
+        parser.add_argument('--cprofile', metavar='FILE',
+            help=self.style.info_msg('Dump cProfile stats for the whole invocation to FILE'))
         parser.add_argument('-s', '--schedule', action='store_true', 
             help=self.style.info_msg('Display weekly schedule'))
+        parser.add_argument('--format', choices=['text', 'json', 'tsv'],
+            help=self.style.info_msg('Output format for -s, -t and --plan (json/tsv skip all styling)'))
         parser.add_argument('--modify-schedule', action='store_true', 
             help=self.style.info_msg('Modify the class schedule'))
         parser.add_argument('-t', '--tasks', action='store_true', 
             help=self.style.info_msg('View all tasks'))
+        parser.add_argument('--limit', type=int, metavar='N',
+            help=self.style.info_msg('Show at most N tasks with -t'))
+        parser.add_argument('--offset', type=int, default=0, metavar='N',
+            help=self.style.info_msg('Skip the first N tasks with -t'))
+        parser.add_argument('--pending', action='store_true',
+            help=self.style.info_msg('Show only pending tasks with -t'))
+        parser.add_argument('--days', type=int, metavar='N',
+            help=self.style.info_msg('Show only tasks due in the next N days with -t, including recurring ones'))
+        parser.add_argument('--pager', action='store_true',
+            help=self.style.info_msg('Browse tasks page by page with -t'))
         parser.add_argument('--add-task', action='store_true', 
             help=self.style.info_msg('Add a new task'))
+        parser.add_argument('--summary', action='store_true',
+            help=self.style.info_msg('Show task counters (total, pending, overdue, due today)'))
+        parser.add_argument('--complete', metavar='ID',
+            help=self.style.info_msg('Mark the task with this id as complete'))
+        parser.add_argument('--remove', metavar='ID',
+            help=self.style.info_msg('Remove the task with this id'))
+        parser.add_argument('--edit', nargs='+', metavar=('ID', 'FIELD=VALUE'),
+            help=self.style.info_msg('Edit a task, e.g. --edit ID priority=high due_date=2026-11-02'))
+        parser.add_argument('--archive', action='store_true',
+            help=self.style.info_msg('Move old completed tasks into the compressed monthly archive'))
+        parser.add_argument('--older-than', type=int, metavar='DAYS',
+            help=self.style.info_msg('Archive completed tasks due more than DAYS days ago (default: archive_after_days)'))
+        parser.add_argument('--search-archive', metavar='TEXT',
+            help=self.style.info_msg('Search archived tasks by description, notes or category'))
+        parser.add_argument('--add-recurring', nargs='+', metavar='FIELD=VALUE',
+            help=self.style.info_msg('Add a recurring task, e.g. --add-recurring description=Gym rule=weekdays'))
+        parser.add_argument('--recurring', action='store_true',
+            help=self.style.info_msg('List recurring tasks and their next occurrence'))
+        parser.add_argument('--plan', action='store_true',
+            help=self.style.info_msg('Fill the free slots of the coming weeks with pending tasks (--format json/tsv supported)'))
+        parser.add_argument('--weeks', type=int, metavar='N',
+            help=self.style.info_msg('Weeks to plan with --plan (default: plan_weeks)'))
+        parser.add_argument('--import', dest='import_path', metavar='FILE',
+            help=self.style.info_msg("Bulk import tasks from a CSV or NDJSON file ('-' for stdin)"))
+        parser.add_argument('--import-format', choices=['csv', 'ndjson'],
+            help=self.style.info_msg('Input format for --import (default: from file extension)'))
+        parser.add_argument('--export', choices=['ndjson', 'csv'],
+            help=self.style.info_msg('Stream all tasks in due-date order'))
+        parser.add_argument('--export-schedule', choices=['ndjson', 'csv'],
+            help=self.style.info_msg('Stream the weekly schedule sessions'))
+        parser.add_argument('--archived', action='store_true',
+            help=self.style.info_msg('Export the archived tasks instead of the current ones with --export'))
+        parser.add_argument('-o', '--output', metavar='FILE',
+            help=self.style.info_msg('Write exports to FILE instead of stdout'))
 
         parser.usage = f"{self.style.info_msg(parser.format_usage().strip())}"
+        return parser
 
+    def parse_arguments(self):
+        """Parse command line arguments"""
+        parser = self.build_parser()
         args = parser.parse_args()
+        self.check_modifiers(parser, args)
+        self.start_profiling(args)
+        if not (args.no_daemon or PROFILER.enabled) and forwardable(args):
+            self.forward_to_daemon()
         self.handle_arguments(args)
         return args
+
+    def forward_to_daemon(self):
+        """Let a running daemon answer this invocation; return when none is listening"""
+        color = sys.stdout.isatty() and 'NO_COLOR' not in os.environ
+        response = send_request(socket_path(self.config), {"argv": sys.argv[1:], "color": color},
+                                read_timeout=self.config["daemon_timeout"])
+        if response is None:
+            return
+        sys.stdout.write(response.get("stdout", ""))
+        sys.stdout.flush()
+        sys.stderr.write(response.get("stderr", ""))
+        sys.exit(response.get("status", 1))
     
     def handle_arguments(self, args):
         """Handle the parsed command line arguments"""
+        if args.daemon:
+            try:
+              from daemon import TaskDaemon
+            except ImportError:
+              from src.daemon import TaskDaemon
+            sys.exit(TaskDaemon(self, socket_path(self.config)).run())
+
+        if args.serve:
+            try:
+              from http_api import TaskAPI
+            except ImportError:
+              from src.http_api import TaskAPI
+            try:
+                api = TaskAPI(self.manager, self.config["api_host"], args.port or self.config["api_port"])
+            except OSError as e:
+                print(self.style.error_msg(f"Cannot start the HTTP API: {e}"), file=sys.stderr)
+                sys.exit(1)
+            print(self.style.success_msg(f"Serving the task API on {api.address}"), file=sys.stderr)
+            api.serve_forever()
+            sys.exit(0)
+
+        if args.stop_daemon:
+            stopped = send_request(socket_path(self.config), {"op": "stop"}) is not None
+            if not stopped:
+                print(self.style.warning_msg("No daemon is running"), file=sys.stderr)
+            sys.exit(0 if stopped else 1)
+
         if args.schedule:
-            self.manager.display_schedule()
+            if args.format in ('json', 'tsv'):
+                self.manager.write_schedule(args.format)
+            else:
+                self.manager.display_schedule()
             sys.exit(0)
 
         if args.modify_schedule:
@@ -139,23 +331,77 @@ class TimeMaster:
             sys.exit(0)
 
         if args.tasks:
-            self.manager.view_tasks()
+            if args.format in ('json', 'tsv'):
+                self.manager.write_tasks(args.format, args.limit, args.offset, args.pending, args.days)
+            elif args.pager:
+                self.manager.page_tasks(args.limit or 20, args.pending, args.days)
+            else:
+                self.manager.view_tasks(args.limit, args.offset, args.pending, args.days)
             sys.exit(0)
 
         if args.add_task:
             self.manager.add_task()
             sys.exit(0)
 
-    def slowprint(self, charge):
-        for second in charge + '\n':
-            sys.stdout.write(second)
-            sys.stdout.flush()
-            time.sleep(0.1 / 100)
+        if args.summary:
+            self.manager.summary(args.format or "text")
+            sys.exit(0)
+
+        if args.add_recurring:
+            sys.exit(0 if self.manager.add_recurring(args.add_recurring) else 1)
+
+        if args.recurring:
+            self.manager.view_recurring()
+            sys.exit(0)
+
+        if args.plan:
+            summary = self.manager.plan_tasks(args.weeks, args.format or "text")
+            sys.exit(0 if summary is not None else 1)
+
+        if args.complete:
+            sys.exit(0 if self.manager.complete_task_by_id(args.complete) else 1)
+
+        if args.remove:
+            sys.exit(0 if self.manager.remove_task_by_id(args.remove) else 1)
+
+        if args.edit:
+            if len(args.edit) < 2:
+                print(self.style.error_msg("--edit needs an id and at least one field=value"), file=sys.stderr)
+                sys.exit(2)
+            sys.exit(0 if self.manager.edit_task_by_id(args.edit[0], args.edit[1:]) else 1)
+
+        if args.archive or args.older_than is not None:
+            count = self.manager.archive_tasks(args.older_than)
+            sys.exit(0 if count is not None else 1)
+
+        if args.search_archive:
+            count = self.manager.search_archive(args.search_archive, args.format or "text")
+            sys.exit(0 if count is not None else 1)
+
+        if args.export:
+            what = "archive" if args.archived else "tasks"
+            count = self.manager.export_data(what, args.export, args.output)
+            sys.exit(0 if count is not None else 1)
+
+        if args.export_schedule:
+            count = self.manager.export_data("schedule", args.export_schedule, args.output)
+            sys.exit(0 if count is not None else 1)
+
+        if args.import_path:
+            report = self.manager.import_tasks(args.import_path, args.import_format)
+            sys.exit(0 if report else 1)
 
 
 def main():
     time_master = TimeMaster()
-    time_master.run()
+    try:
+        time_master.run()
+    except BrokenPipeError:
+        # The reader of a pipe (e.g. `head`) went away; exit quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        time_master.stop_profiling()
 
 
 if __name__ == "__main__":
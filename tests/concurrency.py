@@ -0,0 +1,96 @@
+"""Concurrent writer workers shared by tests/test_locking.py and benchmarks/stress_locking.py
+
+Every worker keeps one long-lived TaskRepository, like an interactive
+session, and interleaves adding its own tasks with completing, editing and
+removing seeded tasks chosen at random (other workers may pick the same
+ones). A small journal limit makes compactions happen all the time.
+check_results() then lists every update a fresh load does not reflect.
+"""
+from contextlib import redirect_stdout
+import io
+import random
+
+try:
+  from repository import TaskRepository
+  from task import Task
+except ImportError:
+  from src.repository import TaskRepository
+  from src.task import Task
+
+JOURNAL_MAX_BYTES = 4 * 1024
+
+
+def seed_tasks(tasks_dir, count, days):
+    """Write ``count`` pending tasks over ``days`` due dates and return their ids"""
+    repository = TaskRepository(tasks_dir, load_workers=1)
+    pairs = [("daily", Task("daily", f"Seed {i}", f"2030-01-{i % days + 1:02d}", task_id=f"seed{i:04d}"))
+             for i in range(count)]
+    with redirect_stdout(io.StringIO()):
+        repository.add_many(pairs)
+    return [task.id for _, task in pairs]
+
+
+def worker(args):
+    """Run ``ops`` random mutations and return what a correct store must reflect"""
+    tasks_dir, number, workers, ops, seed_ids, days = args
+    rng = random.Random(number)
+    repository = TaskRepository(tasks_dir, journal_max_bytes=JOURNAL_MAX_BYTES, load_workers=1)
+    added, completed, edited, removed = [], [], {}, []
+    mine = [seed_id for seed_id in seed_ids if int(seed_id[4:]) % workers == number]
+    with redirect_stdout(io.StringIO()):
+        for op in range(ops):
+            repository.refresh()
+            choice = rng.random()
+            if choice < 0.5:
+                task = Task("daily", f"Worker {number} task {op}", f"2030-01-{rng.randrange(days) + 1:02d}")
+                repository.add("daily", task)
+                added.append(task.description)
+            else:
+                entry = repository.get(rng.choice(seed_ids))
+                if entry is None or entry[1].completed:
+                    continue
+                repository.complete(*entry)
+                completed.append(entry[1].id)
+            if mine and choice > 0.9:
+                entry = repository.get(mine.pop())
+                if entry is not None:
+                    task_type, task = entry
+                    was = task.to_dict()
+                    if rng.random() < 0.5:
+                        task.apply({"notes": f"edited by {number}"})
+                        repository.update(task_type, task, was["due_date"], was)
+                        edited[task.id] = task.get("notes")
+                    else:
+                        repository.remove(task_type, task)
+                        removed.append(task.id)
+            repository.save()
+    return added, completed, edited, removed
+
+
+def check_results(tasks_dir, seed_count, results):
+    """Load the tasks directory afresh and return (lost updates, task count) for the worker results"""
+    repository = TaskRepository(tasks_dir)
+    with redirect_stdout(io.StringIO()):
+        repository.load()
+    descriptions = {}
+    for _, task in repository.sorted_tasks():
+        descriptions[task.description] = descriptions.get(task.description, 0) + 1
+
+    problems = []
+    for added, completed, edited, removed in results:
+        problems += [f"added task missing or duplicated: {description}"
+                     for description in added if descriptions.get(description) != 1]
+        for task_id in completed:
+            entry = repository.get(task_id)
+            if entry is not None and not entry[1].completed and task_id not in removed:
+                problems.append(f"completion lost: {task_id}")
+        problems += [f"edit lost: {task_id}" for task_id, notes in edited.items()
+                     if repository.get(task_id) is None or repository.get(task_id)[1].get("notes") != notes]
+        problems += [f"removed task still present: {task_id}" for task_id in removed
+                     if repository.get(task_id) is not None]
+
+    expected = seed_count + sum(len(added) - len(removed) for added, _, _, removed in results)
+    total = len(repository.index)
+    if total != expected:
+        problems.append(f"expected {expected} tasks, found {total}")
+    return problems, total
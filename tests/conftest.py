@@ -0,0 +1,74 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from color import Colors  # noqa: E402
+from config import load_config  # noqa: E402
+from manager import Manager  # noqa: E402
+from repository import TaskRepository  # noqa: E402
+from task import Task  # noqa: E402
+from time_master import TimeMaster  # noqa: E402
+
+
+@pytest.fixture
+def tasks_dir(tmp_path):
+    return str(tmp_path / 'tasks')
+
+
+@pytest.fixture
+def style():
+    return Colors(enabled=False)
+
+
+def make_task(description, due_date, **fields):
+    """Return a pending daily Task; extra ``fields`` such as notes go to its extra dict"""
+    priority = fields.pop("priority", "medium")
+    completed = fields.pop("completed", False)
+    return Task("daily", description, due_date, completed, priority, fields or None)
+
+
+def seed(repository, *tasks):
+    """Add daily ``tasks`` and fold them into the shards; return them"""
+    repository.add_many([("daily", task) for task in tasks])
+    repository.compact()
+    return list(tasks)
+
+
+@pytest.fixture
+def open_repository(tasks_dir, style):
+    """Return a factory of loaded TaskRepository instances sharing the test's tasks directory"""
+    def open_repository(**kwargs):
+        repository = TaskRepository(tasks_dir, style, **kwargs)
+        repository.load()
+        return repository
+    return open_repository
+
+
+@pytest.fixture
+def repository(open_repository):
+    return open_repository()
+
+
+@pytest.fixture
+def open_manager(tmp_path, style):
+    """Return a factory of Managers over the test's data directory; keyword arguments override the config"""
+    def open_manager(**overrides):
+        manager = Manager(load_config(overrides=dict({"data_dir": str(tmp_path)}, **overrides)))
+        manager.style = manager.repository.style = style
+        return manager
+    return open_manager
+
+
+@pytest.fixture
+def manager(open_manager):
+    return open_manager()
+
+
+@pytest.fixture
+def time_master(tmp_path, monkeypatch):
+    """Return a TimeMaster whose config points at the test's data directory"""
+    monkeypatch.setenv("TIME_MASTER_DATA_DIR", str(tmp_path))
+    return TimeMaster()
@@ -0,0 +1,64 @@
+import json
+
+from archive import TaskArchive
+from conftest import make_task, seed
+
+
+def seed_old_tasks(manager, count=3):
+    manager.load_tasks()
+    done = [make_task(f"Old {day}", f"2020-01-{day + 1:02d}", completed=True, notes="report") for day in range(count)]
+    seed(manager.repository, *done, make_task("Still open", "2020-01-15"))
+    return done
+
+
+def test_archive_round_trip(manager):
+    done = seed_old_tasks(manager)
+
+    assert manager.archive_tasks(quiet=True) == 3
+    assert [task.description for _, task in manager.repository.sorted_tasks()] == ["Still open"]
+    archived = {task.id: task for _, shard in manager.archive.iter_shards() for task in shard["daily"]}
+    assert sorted(archived) == sorted(task.id for task in done)
+    assert all(task.completed for task in archived.values())
+    assert len(list(manager.archive.search("REPORT"))) == 3
+    assert manager.archive_tasks(quiet=True) == 0
+
+
+def test_appends_add_streams_and_skip_repeated_ids(tmp_path):
+    for compression in ("gzip", "lzma"):
+        archive = TaskArchive(str(tmp_path / compression), compression)
+        first, second = make_task("First", "2020-02-01"), make_task("Second", "2020-02-02")
+        first.id, second.id = "a1", "a2"
+        archive.append([("daily", first)])
+        # A run interrupted before the removal archives ``first`` again
+        archive.append([("daily", first), ("daily", second)])
+
+        assert list(archive.months()) == ["2020-02"]
+        assert [task.description for _, task in archive.search("")] == ["First", "Second"]
+        assert list(tmp_path.joinpath(compression).glob("*.tmp")) == []
+
+
+def test_concurrent_managers_archive_each_task_once(manager, open_manager):
+    done = seed_old_tasks(manager)
+    second = open_manager()
+    second.load_tasks()
+
+    assert manager.archive_tasks(quiet=True) == 3
+    second.archive_tasks(quiet=True)
+
+    second.repository.load()
+    assert [task.description for _, task in second.repository.sorted_tasks()] == ["Still open"]
+    archived = [task.id for _, task in second.archive.search("")]
+    assert sorted(archived) == sorted(task.id for task in done)
+
+
+def test_auto_archive_keeps_json_output_clean(manager, open_manager, capsys):
+    seed_old_tasks(manager)
+    capsys.readouterr()
+
+    automatic = open_manager(archive_auto=True)
+    automatic.write_tasks("json")
+
+    out, err = capsys.readouterr()
+    report = json.loads(out)
+    assert report["summary"]["total"] == 1
+    assert "Archived 3 old completed task(s)" in err
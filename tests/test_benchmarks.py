@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def run_suite(*args):
+    return subprocess.run([sys.executable, "-m", "benchmarks.run", "--sizes", "30", "--iterations", "2",
+                           "--time-budget", "0.1", "--sessions-per-day", "3", *args],
+                          cwd=ROOT, capture_output=True, text=True, timeout=120)
+
+
+def test_suite_measures_every_operation_on_both_backends(tmp_path):
+    output = str(tmp_path / "results.json")
+
+    result = run_suite("--storage", "json,sqlite", "--output", output)
+
+    assert result.returncode == 0, result.stderr
+    with open(output, encoding='utf-8') as f:
+        results = json.load(f)["results"]
+    ops = {(row["op"], row["storage"]) for row in results}
+    assert {("load_tasks", "json"), ("load_tasks", "sqlite"), ("plan_tasks", "json"),
+            ("analyze_schedule", "json")} <= ops
+    loads = [row for row in results if row["op"] == "load_tasks"]
+    assert all(row["size"] == 30 and row["shards"] == 3 and row["iterations"] >= 1 for row in loads)
+
+
+def test_compare_prints_ratios_against_a_saved_run(tmp_path):
+    output = str(tmp_path / "results.json")
+    assert run_suite("--output", output).returncode == 0
+
+    result = run_suite("--compare", output)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split()[:6] == ["operation", "storage", "size", "before", "after", "ratio"]
+    assert "load_tasks" in result.stdout
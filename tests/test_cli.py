@@ -0,0 +1,64 @@
+import sys
+
+import pytest
+
+from time_master import TimeMaster
+
+
+@pytest.mark.parametrize("argv, flag", [
+    (["--limit", "5"], "--limit"),
+    (["--pending", "--days", "3"], "--days"),
+    (["--weeks", "2"], "--weeks"),
+    (["--port", "8080"], "--port"),
+    (["-o", "tasks.csv"], "--output"),
+    (["--import-format", "csv"], "--import-format"),
+])
+def test_modifiers_without_a_command_are_usage_errors(time_master, monkeypatch, capsys, argv, flag):
+    monkeypatch.setattr(sys, "argv", ["time_master.py", "--no-daemon"] + argv)
+
+    with pytest.raises(SystemExit) as exit_info:
+        time_master.parse_arguments()
+
+    assert exit_info.value.code == 2
+    assert flag in capsys.readouterr().err
+
+
+def test_every_option_is_a_command_or_a_modifier(time_master):
+    parser = time_master.build_parser()
+    dests = {action.dest for action in parser._actions if action.dest != "help"}
+    options = set(TimeMaster.SESSION_OPTIONS + TimeMaster.MODIFIERS)
+
+    assert options <= dests
+    assert {"tasks", "plan", "serve", "export", "import_path"} <= dests - options
+    args = parser.parse_args(["-t", "--limit", "5", "--format", "json"])
+    assert TimeMaster.has_command(args)
+    assert not TimeMaster.has_command(parser.parse_args(["--fast", "--weeks", "2", "-o", "x"]))
+
+
+def test_fast_menu_never_builds_the_manager(time_master, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["time_master.py", "--fast"])
+    monkeypatch.setattr(time_master, "slowprint", lambda text: pytest.fail("the banner was animated"))
+    monkeypatch.setattr("builtins.input", lambda prompt: "4")
+
+    time_master.run()
+
+    assert time_master._manager is None
+    assert "Goodbye" in capsys.readouterr().out
+
+
+def test_manager_is_built_once_on_first_use(time_master):
+    assert time_master._manager is None
+    manager = time_master.manager
+    assert time_master.manager is manager
+
+
+def test_slow_startup_warns_on_stderr(time_master, capsys):
+    time_master.config["startup_budget_ms"] = 1
+    time_master.started -= 1
+
+    assert time_master.check_startup_budget() >= 1000
+    assert "Startup took" in capsys.readouterr().err
+
+    time_master.config["startup_budget_ms"] = 0
+    time_master.check_startup_budget()
+    assert capsys.readouterr().err == ""
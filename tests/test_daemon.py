@@ -0,0 +1,122 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from conftest import make_task, seed
+from daemon import TaskDaemon
+from daemon_client import forwardable, send_request
+
+
+@pytest.fixture
+def socket_file(tmp_path):
+    return str(tmp_path / "daemon.sock")
+
+
+@pytest.fixture
+def daemon(time_master, socket_file):
+    """Serve TaskDaemon.handle on ``socket_file`` from a background event loop"""
+    daemon = TaskDaemon(time_master, socket_file)
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+
+    async def serve():
+        daemon.server = await asyncio.start_unix_server(daemon.handle, path=socket_file)
+        ready.set()
+        try:
+            await daemon.server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(serve(),), daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    yield daemon
+    loop.call_soon_threadsafe(daemon.server.close)
+    thread.join(5)
+    loop.close()
+
+
+def raw_request(path, payload):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(5)
+    try:
+        client.connect(path)
+        client.sendall(payload + b"\n")
+        return json.loads(client.makefile("rb").readline())
+    finally:
+        client.close()
+
+
+def test_answers_cli_requests_from_the_resident_manager(daemon, socket_file):
+    seed(daemon.time_master.manager.repository, make_task("Essay", "2026-11-05"))
+    daemon.refresh()
+
+    response = send_request(socket_file, {"argv": ["-t", "--format", "json"]})
+
+    assert response["status"] == 0
+    assert [task["description"] for task in json.loads(response["stdout"])["tasks"]] == ["Essay"]
+
+
+@pytest.mark.parametrize("payload", [b"[]", b'"x"', b"42", b'{"argv": "-t"}', b'{"argv": [1]}', b"{"])
+def test_malformed_requests_get_an_error_response(daemon, socket_file, payload):
+    response = raw_request(socket_file, payload)
+
+    assert response["status"] == 2
+    assert response["stderr"].startswith("Invalid request")
+    assert send_request(socket_file, {"op": "ping"})["status"] == 0
+
+
+@pytest.fixture
+def stalled_daemon(socket_file):
+    """A listener that accepts connections and never answers"""
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_file)
+    listener.listen(1)
+    yield listener
+    listener.close()
+
+
+def test_stalled_daemon_times_out(stalled_daemon, socket_file):
+    started = time.perf_counter()
+
+    assert send_request(socket_file, {"op": "ping"}, read_timeout=0.1) is None
+    assert time.perf_counter() - started < 2
+
+
+def test_cli_runs_the_command_itself_when_the_daemon_stalls(time_master, stalled_daemon, socket_file):
+    time_master.config.update(daemon_socket=socket_file, daemon_timeout=0.1)
+
+    # Returning instead of exiting means the caller handles the arguments itself
+    assert time_master.forward_to_daemon() is None
+
+
+def test_only_non_interactive_commands_are_forwarded(time_master):
+    parser = time_master.build_parser()
+
+    assert forwardable(parser.parse_args(["-t", "--format", "json"]))
+    assert forwardable(parser.parse_args(["--export", "csv", "-o", "-"]))
+    assert not forwardable(parser.parse_args(["-t", "--pager"]))
+    assert not forwardable(parser.parse_args(["--export", "csv", "-o", "tasks.csv"]))
+    assert not forwardable(parser.parse_args(["--add-task"]))
+
+
+def test_daemon_refuses_commands_that_need_a_terminal(daemon, socket_file):
+    response = send_request(socket_file, {"argv": ["--add-task"]})
+
+    assert response["status"] == 2
+    assert "needs a terminal" in response["stderr"]
+
+
+def test_daemon_sees_changes_made_by_other_processes(daemon, socket_file, open_repository):
+    daemon.refresh()
+    seed(open_repository(), make_task("Written elsewhere", "2026-11-05"))
+    daemon.time_master.manager.repository.STAT_INTERVAL = 0
+
+    daemon.refresh()
+    response = send_request(socket_file, {"argv": ["-t", "--format", "tsv"]})
+
+    assert "Written elsewhere" in response["stdout"]
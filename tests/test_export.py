@@ -0,0 +1,57 @@
+import csv
+import io
+import json
+
+from conftest import make_task, seed
+from exporter import export_schedule
+
+
+def test_tasks_stream_as_ndjson_in_due_date_order(manager, capsys):
+    manager.load_tasks()
+    later, earlier = seed(manager.repository, make_task("Later", "2026-11-09", notes="n"),
+                          make_task("Earlier", "2026-11-05", priority="high"))
+    manager.repository.add("monthly", make_task("Journal only", "2026-11-07"))
+    manager.save_tasks()
+    capsys.readouterr()
+
+    assert manager.export_data("tasks", "ndjson") == 3
+
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(row["description"], row["type"]) for row in rows] == [
+        ("Earlier", "daily"), ("Journal only", "monthly"), ("Later", "daily")]
+    assert rows[0]["id"] == earlier.id
+    assert rows[2]["notes"] == "n"
+
+
+def test_csv_export_round_trips_through_import(manager, open_manager, tmp_path):
+    manager.load_tasks()
+    seed(manager.repository, make_task("Essay, draft", "2026-11-05", category="uni"),
+         make_task("Done", "2026-11-06", completed=True))
+    output = str(tmp_path / "tasks.csv")
+
+    assert manager.export_data("tasks", "csv", output) == 2
+
+    with open(output, encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row["description"] for row in rows] == ["Essay, draft", "Done"]
+    assert rows[0]["category"] == "uni"
+    target = open_manager(data_dir=str(tmp_path / "copy"))
+    target.load_tasks()
+    target.import_tasks(output)
+    imported = [(task.description, task.completed) for _, task in target.repository.sorted_tasks()]
+    assert imported == [("Essay, draft", False), ("Done", True)]
+
+
+def test_schedule_export_orders_sessions_and_skips_bad_times():
+    schedule = {"schedule": {
+        "tuesday": [{"time": "9-10", "subject": "Late"}],
+        "monday": [{"time": "14:00-15:00", "subject": "Physics"}, {"time": "08:00-09:00", "subject": "Math"},
+                   {"time": "soon", "subject": "Broken"}],
+    }}
+    out = io.StringIO()
+
+    assert export_schedule(schedule, ["monday", "tuesday"], out, "csv") == 3
+
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [(row["day"], row["time"], row["subject"]) for row in rows] == [
+        ("monday", "08:00-09:00", "Math"), ("monday", "14:00-15:00", "Physics"), ("tuesday", "09:00-10:00", "Late")]
@@ -0,0 +1,121 @@
+from http.client import HTTPConnection
+import io
+import json
+import sys
+import threading
+
+import pytest
+
+from conftest import make_task
+from http_api import TaskAPI, ThreadOutput
+
+
+@pytest.fixture
+def api(manager):
+    api = TaskAPI(manager, port=0)
+    thread = threading.Thread(target=api.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield api
+    api.server.shutdown()
+    api.server.server_close()
+
+
+def request(api, method, path, body=None):
+    host, port = api.server.server_address[:2]
+    connection = HTTPConnection(host, port, timeout=10)
+    try:
+        payload = body if body is None or isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        connection.request(method, path, payload, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        raw = response.read()
+        return response.status, json.loads(raw) if raw else None
+    finally:
+        connection.close()
+
+
+def test_create_and_fetch_a_task(api):
+    status, task = request(api, "POST", "/tasks", {"description": "Essay", "due_date": "2026-11-05"})
+    assert status == 201
+    assert request(api, "GET", f"/tasks/{task['id']}") == (200, task)
+
+
+@pytest.mark.parametrize("body, message", [
+    ({"description": 5, "due_date": "2026-11-05"}, "description"),
+    ({"description": "Essay", "due_date": ["2026-11-05"]}, "due_date"),
+    (b'{"description": ', "invalid JSON"),
+    (b'[1, 2]', "expected a JSON object"),
+])
+def test_malformed_payloads_get_a_400(api, body, message):
+    status, error = request(api, "POST", "/tasks", body)
+    assert status == 400
+    assert message in error["error"]
+
+
+def test_unknown_route_and_task_get_a_404(api):
+    assert request(api, "GET", "/nowhere")[0] == 404
+    assert request(api, "POST", "/tasks/missing/complete")[0] == 404
+
+
+def test_bad_query_values_get_a_400(api):
+    assert request(api, "GET", "/tasks?cursor=%%%")[0] == 400
+    assert request(api, "GET", "/tasks?limit=many")[0] == 400
+    assert request(api, "GET", "/tasks?start=tomorrow")[0] == 400
+
+
+def test_unexpected_failure_gets_a_json_500(api, monkeypatch):
+    def broken(*args):
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(api.manager.repository, "summary", broken)
+    status, error = request(api, "GET", "/summary")
+    assert status == 500
+    assert "disk on fire" in error["error"]
+    assert request(api, "GET", "/tasks")[0] == 200
+
+
+@pytest.fixture
+def rule_id(manager):
+    return manager.add_recurring(["description=Gym", "rule=daily", "start=2026-10-20"])
+
+
+def test_complete_a_recurring_occurrence(api, rule_id):
+    status, task = request(api, "POST", f"/tasks/{rule_id}@2026-10-21/complete")
+    assert status == 200
+    assert (task["id"], task["description"], task["completed"]) == (f"{rule_id}@2026-10-21", "Gym", True)
+    assert request(api, "GET", f"/tasks/{rule_id}@2026-10-21") == (200, task)
+    assert request(api, "GET", f"/tasks/{rule_id}@2026-10-22")[1]["completed"] is False
+    assert request(api, "POST", f"/tasks/{rule_id}@2026-10-19/complete")[0] == 404
+
+
+def test_edit_a_recurring_rule(api, rule_id):
+    status, rule = request(api, "PATCH", f"/tasks/{rule_id}", {"description": "Swim", "rule": "weekly"})
+    assert status == 200
+    assert (rule["id"], rule["description"], rule["rule"]) == (rule_id, "Swim", "weekly")
+    assert request(api, "GET", f"/tasks/{rule_id}") == (200, rule)
+    assert request(api, "GET", f"/tasks/{rule_id}@2026-10-27")[1]["description"] == "Swim"
+
+
+def test_patch_null_clears_a_field_and_other_types_are_rejected(api, manager):
+    task = make_task("Essay", "2026-11-05", notes="draft", effort=90)
+    manager.repository.add("daily", task)
+    manager.save_tasks()
+
+    status, edited = request(api, "PATCH", f"/tasks/{task.id}", {"notes": None, "effort": None, "priority": "high"})
+    assert status == 200
+    assert "notes" not in edited and "effort" not in edited and edited["priority"] == "high"
+    assert request(api, "PATCH", f"/tasks/{task.id}", {"description": None})[0] == 400
+    assert request(api, "PATCH", f"/tasks/{task.id}", {"notes": ["a"]})[0] == 400
+    assert request(api, "GET", f"/tasks/{task.id}")[1]["description"] == "Essay"
+
+
+def test_captured_output_is_per_thread(capsys):
+    buffer = io.StringIO()
+    with ThreadOutput.capture("stderr", buffer):
+        print("from the request", file=sys.stderr)
+        other = threading.Thread(target=lambda: print("from another thread", file=sys.stderr))
+        other.start()
+        other.join()
+    print("after the request", file=sys.stderr)
+
+    assert buffer.getvalue() == "from the request\n"
+    assert capsys.readouterr().err == "from another thread\nafter the request\n"
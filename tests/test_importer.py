@@ -0,0 +1,45 @@
+import io
+import json
+
+from importer import import_tasks, parse_row
+
+
+def ndjson(*rows):
+    return io.StringIO(''.join((row if isinstance(row, str) else json.dumps(row)) + '\n' for row in rows))
+
+
+def test_invalid_rows_are_rejected_and_counted(repository):
+    stream = ndjson(
+        {"description": "Valid", "due_date": "2026-10-21", "priority": "high", "effort": "1h30"},
+        {"description": "Numeric date", "due_date": 20261021},
+        {"description": 5, "due_date": "2026-10-21"},
+        {"description": "Object notes", "due_date": "2026-10-21", "notes": {"a": 1}},
+        {"description": "Bad priority", "due_date": "2026-10-21", "priority": "urgent"},
+        {"description": "Bad completed", "due_date": "2026-10-21", "completed": [True]},
+        {"description": "Bad effort", "due_date": "2026-10-21", "effort": "soon"},
+        '{"description": "Broken',
+        '[1, 2]',
+        {"description": "Also valid", "due_date": "2026-10-22", "completed": 1, "notes": 42},
+    )
+    report = import_tasks(repository, stream, "ndjson")
+
+    assert (report.rows, report.imported, report.shards) == (10, 2, 2)
+    assert [line for line, _ in report.rejected] == [2, 3, 4, 5, 6, 7, 8, 9]
+    assert "due_date" in dict(report.rejected)[2]
+    tasks = {task.description: task for _, task in repository.sorted_tasks()}
+    assert tasks["Valid"].get("effort") == 90
+    assert tasks["Also valid"].completed and tasks["Also valid"].get("notes") == "42"
+
+
+def test_csv_rows_with_missing_columns_are_rejected(repository):
+    stream = io.StringIO("description,due_date,priority\nRead,2026-10-20,low\nShort row\n,2026-10-20,high\n")
+    report = import_tasks(repository, stream, "csv")
+
+    assert report.imported == 1
+    assert [line for line, _ in report.rejected] == [3, 4]
+
+
+def test_parse_row_defaults():
+    task_type, task = parse_row({"description": "  Plain  ", "due_date": "2026-10-20"})
+    assert (task_type, task.description, task.priority, task.completed, task.extra) == \
+        ("daily", "Plain", "medium", False, None)
@@ -0,0 +1,47 @@
+import pytest
+
+from intervals import DayAvailability, format_range, free_intervals, merge_intervals, parse_range, parse_time
+
+
+def test_parse_and_format_ranges():
+    assert parse_range("09:00-10:30") == (540, 630)
+    assert parse_range("9-11") == (540, 660)
+    assert parse_time("24:00") == 24 * 60
+    assert format_range((540, 630)) == "09:00-10:30"
+    for text in ("10:30-09:00", "09:00", "25:00-26:00", "09:75-10:00", "nine-ten"):
+        with pytest.raises(ValueError):
+            parse_range(text)
+
+
+def test_overlapping_and_touching_sessions_merge():
+    assert merge_intervals([(600, 660), (540, 620), (660, 700), (800, 900), (820, 850)]) == [
+        (540, 700), (800, 900)]
+
+
+def test_free_intervals_are_the_gaps_inside_the_window():
+    busy = [(480, 560), (600, 660), (1100, 1200)]
+
+    assert free_intervals(busy, 540, 1140) == [(560, 600), (660, 1100)]
+    assert free_intervals([], 540, 1140) == [(540, 1140)]
+    assert free_intervals([(500, 1200)], 540, 1140) == []
+
+
+def test_day_availability_handles_breaks_and_conflicts():
+    day = DayAvailability([(600, 660), (540, 600)], (540, 1140), breaks=[(780, 900)])
+
+    assert day.busy == [(540, 660)]
+    assert day.free == [(660, 780), (900, 1140)]
+    assert day.conflicts(650, 700)
+    assert not day.conflicts(660, 700)
+    assert not day.conflicts(780, 900)
+    assert day.is_free(660, 780)
+    assert not day.is_free(700, 800)
+    assert not day.is_free(500, 540)
+
+
+def test_manager_computes_free_slots_per_day(manager):
+    manager.class_schedule = {"schedule": {"monday": [{"time": "10:00-11:00"}, {"time": "10:30-12:00"}]}}
+    manager.analyze_schedule()
+
+    assert manager.free_slots["monday"] == [(540, 600), (720, 780), (900, 1140)]
+    assert manager.free_slots["tuesday"] == [(540, 780), (900, 1140)]
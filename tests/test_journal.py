@@ -0,0 +1,72 @@
+import json
+import os
+
+from conftest import make_task, seed
+
+
+def test_saved_mutations_are_replayed_from_the_journal(repository, open_repository):
+    kept, done, gone = make_task("Keep", "2026-11-05"), make_task("Done", "2026-11-05"), make_task("Gone", "2026-11-06")
+    for task in (kept, done, gone):
+        repository.add("daily", task)
+    repository.save()
+    was = kept.to_dict()
+    kept.apply({"notes": "edited", "due_date": "2026-11-07"})
+    repository.update("daily", kept, was["due_date"], was)
+    repository.complete("daily", done)
+    repository.remove("daily", gone)
+    repository.save()
+
+    assert os.path.exists(repository.journal.path)
+    reloaded = open_repository()
+    assert reloaded.get(kept.id)[1].due_date == "2026-11-07"
+    assert reloaded.get(kept.id)[1].get("notes") == "edited"
+    assert reloaded.get(done.id)[1].completed
+    assert reloaded.get(gone.id) is None
+    assert len(reloaded.index) == 2
+
+
+def test_compaction_folds_the_journal_into_shards(repository, open_repository):
+    task = make_task("Essay", "2026-11-05", priority="high")
+    repository.add("daily", task)
+    repository.save()
+    repository.complete("daily", task)
+    repository.save()
+    repository.compact()
+
+    assert not os.path.exists(repository.journal.path)
+    with open(repository.shard_path("2026-11-05"), encoding='utf-8') as f:
+        shard = json.load(f)
+    assert [(data["id"], data["completed"]) for data in shard["daily"]] == [(task.id, True)]
+    assert open_repository().get(task.id)[1].completed
+
+
+def test_journal_limit_triggers_compaction(open_repository):
+    repository = open_repository(journal_max_bytes=1)
+    repository.add("daily", make_task("Small journal", "2026-11-05"))
+    repository.save()
+    assert not os.path.exists(repository.journal.path)
+    assert os.path.exists(repository.shard_path("2026-11-05"))
+
+
+def test_records_already_folded_into_a_shard_are_not_replayed(repository, open_repository):
+    repository.add("daily", make_task("Once", "2026-11-05"))
+    repository.save()
+    records = list(repository.journal.records())
+    repository.compact()
+    # An interrupted compaction leaves the journal behind after the shards were written
+    repository.journal.append(records)
+
+    reloaded = open_repository()
+    assert [task.description for _, task in reloaded.sorted_tasks()] == ["Once"]
+
+
+def test_truncated_journal_line_is_ignored(repository, open_repository):
+    task = seed(repository, make_task("Survivor", "2026-11-05"))[0]
+    repository.add("daily", make_task("Journal only", "2026-11-06"))
+    repository.save()
+    with open(repository.journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "remove", "type": "dai')
+
+    reloaded = open_repository()
+    assert reloaded.get(task.id) is not None
+    assert [task.description for _, task in reloaded.sorted_tasks()] == ["Survivor", "Journal only"]
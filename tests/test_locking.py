@@ -0,0 +1,40 @@
+from multiprocessing import Pool
+import json
+import os
+
+from concurrency import check_results, seed_tasks, worker
+from repository import TaskRepository
+
+
+def test_concurrent_writers_lose_no_updates(tasks_dir):
+    workers, ops, days = 4, 40, 5
+    seed_ids = seed_tasks(tasks_dir, 60, days)
+    jobs = [(tasks_dir, number, workers, ops, seed_ids, days) for number in range(workers)]
+    with Pool(workers) as pool:
+        results = pool.map(worker, jobs)
+
+    problems, total = check_results(tasks_dir, len(seed_ids), results)
+    assert problems == []
+    assert total == 60 + sum(len(added) - len(removed) for added, _, _, removed in results)
+
+
+def load_ids(tasks_dir):
+    repository = TaskRepository(tasks_dir, load_workers=1)
+    repository.load()
+    return sorted(repository.by_id)
+
+
+def test_readers_agree_on_ids_given_to_legacy_shards(tasks_dir):
+    for day in range(1, 9):
+        path = TaskRepository(tasks_dir).shard_path(f"2030-01-{day:02d}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"daily": [{"description": f"Legacy {day}", "due_date": f"2030-01-{day:02d}",
+                                  "completed": False, "priority": "medium"}], "monthly": []}, f)
+
+    with Pool(4) as pool:
+        seen = pool.map(load_ids, [tasks_dir] * 8)
+
+    on_disk = load_ids(tasks_dir)
+    assert len(on_disk) == 8
+    assert all(ids == on_disk for ids in seen)
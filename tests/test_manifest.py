@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from conftest import make_task, seed
+from repository import TaskRepository
+from task_index import date_ordinal
+
+TODAY = date_ordinal("2026-11-05")
+
+
+@pytest.fixture
+def journaled(repository):
+    """Shards plus unfolded journal records of every kind"""
+    overdue, today, later, gone = seed(repository, make_task("Overdue", "2026-11-01"),
+                                       make_task("Today", "2026-11-05", priority="high"),
+                                       make_task("Later", "2026-11-09"), make_task("Gone", "2026-11-09"))
+    repository.complete("daily", later)
+    repository.remove("daily", gone)
+    was = overdue.to_dict()
+    overdue.apply({"priority": "low", "due_date": "2026-11-05"})
+    repository.update("daily", overdue, was["due_date"], was)
+    repository.add("daily", make_task("New", "2026-11-02", priority="high"))
+    repository.save()
+    return repository
+
+
+def test_summary_from_the_manifest_matches_the_loaded_tasks(journaled, tasks_dir, style, monkeypatch):
+    expected = journaled.summary(TODAY)
+    cold = TaskRepository(tasks_dir, style)
+    monkeypatch.setattr(TaskRepository, "read_shard_file", lambda *args: pytest.fail("a shard was read"))
+    monkeypatch.setattr(TaskRepository, "_read_shards", lambda *args: pytest.fail("a shard was read"))
+
+    summary = cold.summary(TODAY)
+
+    assert summary == expected
+    assert (summary["total"], summary["completed"], summary["overdue"], summary["due_today"]) == (4, 1, 1, 2)
+    assert summary["priorities"] == {"high": 2, "medium": 1, "low": 1}
+
+
+def test_manifest_records_per_shard_counters(journaled):
+    journaled.compact()
+
+    with open(journaled.manifest.path, encoding='utf-8') as f:
+        shards = json.load(f)["shards"]
+    assert sorted(shards) == ["2026-11-02", "2026-11-05", "2026-11-09"]
+    assert {key: shards["2026-11-05"][key] for key in ("count", "completed", "priorities")} == {
+        "count": 2, "completed": 0, "priorities": {"high": 1, "low": 1}}
+    assert shards["2026-11-09"]["completed"] == 1
+
+
+def test_journal_without_previous_state_falls_back_to_loading(journaled, tasks_dir, style):
+    expected = journaled.summary(TODAY)
+    # Older versions journaled removals without the task's previous state
+    legacy = {"seq": 100, "op": "remove", "type": "daily", "date": "2026-11-30", "id": "zzzz"}
+    with open(journaled.journal.path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(legacy) + '\n')
+
+    assert TaskRepository(tasks_dir, style).summary(TODAY) == expected
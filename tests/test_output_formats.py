@@ -0,0 +1,54 @@
+import json
+import sys
+
+from color import Colors
+from conftest import make_task, seed
+
+
+def colored_manager(manager):
+    manager.style = manager.repository.style = Colors(enabled=True)
+    manager.load_tasks()
+    seed(manager.repository, make_task("Essay\twith tab", "2099-01-05", priority="high", notes="line\nbreak"),
+         make_task("Done", "2099-01-06", completed=True))
+    return manager
+
+
+def test_json_task_report_has_no_styling(manager, capsys):
+    colored_manager(manager).write_tasks("json", limit=1)
+
+    out = capsys.readouterr().out
+    assert "\033[" not in out
+    report = json.loads(out)
+    assert [(task["number"], task["description"], task["type"]) for task in report["tasks"]] == [
+        (1, "Essay\twith tab", "daily")]
+    assert report["summary"] == {"total": 2, "completed": 1, "pending": 1, "matching": 2}
+
+
+def test_tsv_task_report_keeps_one_row_per_task(manager, capsys):
+    colored_manager(manager).write_tasks("tsv", offset=1)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert "\033[" not in "".join(lines)
+    assert lines[0].split('\t')[:4] == ["number", "id", "type", "description"]
+    assert len(lines) == 2
+    row = dict(zip(lines[0].split('\t'), lines[1].split('\t')))
+    assert (row["number"], row["description"], row["completed"]) == ("2", "Done", "true")
+
+
+def test_tsv_values_never_break_rows(manager, capsys):
+    colored_manager(manager).write_tasks("tsv")
+
+    lines = capsys.readouterr().out.splitlines()
+    row = dict(zip(lines[0].split('\t'), lines[1].split('\t')))
+    assert (row["description"], row["notes"]) == ("Essay with tab", "line break")
+
+
+def test_colors_are_off_without_a_terminal_or_with_no_color(monkeypatch):
+    monkeypatch.delenv("NO_COLOR", raising=False)
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: False)
+    assert Colors().error_msg("x") == "x"
+
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+    assert Colors().error_msg("x") == "\033[31mx\033[0m"
+    monkeypatch.setenv("NO_COLOR", "1")
+    assert Colors().error_msg("x") == "x"
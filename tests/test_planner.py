@@ -0,0 +1,69 @@
+from datetime import date
+import random
+
+from planner import Planner, plan_slots
+from task import Task
+
+MONDAY = date(2026, 11, 2).toordinal()
+FREE = {"monday": [(540, 600), (720, 780)], "tuesday": [(540, 660)], "wednesday": [(600, 720)]}
+
+
+def task(task_id, due_date, effort, priority="medium"):
+    return Task("daily", f"Task {task_id}", due_date, False, priority, {"effort": effort}, task_id)
+
+
+def test_slots_of_today_are_clipped_at_the_current_minute():
+    assert plan_slots(FREE, MONDAY, MONDAY + 1)[:2] == [(MONDAY, 540, 600), (MONDAY, 720, 780)]
+    assert plan_slots(FREE, MONDAY, MONDAY + 1, 500)[0] == (MONDAY, 540, 600)
+    assert plan_slots(FREE, MONDAY, MONDAY + 1, 570)[:2] == [(MONDAY, 570, 600), (MONDAY, 720, 780)]
+    assert plan_slots(FREE, MONDAY, MONDAY + 1, 600) == [(MONDAY, 720, 780), (MONDAY + 1, 540, 660)]
+    assert plan_slots(FREE, MONDAY, MONDAY + 1, 1439) == [(MONDAY + 1, 540, 660)]
+
+
+def test_occurrences_wait_for_their_own_date():
+    planner = Planner()
+    occurrence = task("rule1@2026-11-04", "2026-11-04", 90, "high")
+    regular = task("t1", "2026-11-10", 60, "low")
+    planner.update(plan_slots(FREE, MONDAY, MONDAY + 2), [("daily", occurrence), ("daily", regular)])
+
+    blocks, summary = planner.plan()
+    assert [(ordinal - MONDAY, begin, end, task.id) for ordinal, begin, end, _, task, _, _ in blocks] == [
+        (0, 540, 600, "t1"), (2, 600, 690, "rule1@2026-11-04")]
+    assert summary["planned"] == 2
+
+
+def test_occurrence_after_the_window_is_not_planned():
+    planner = Planner()
+    planner.update(plan_slots(FREE, MONDAY, MONDAY + 2), [("daily", task("rule1@2026-11-20", "2026-11-20", 30))])
+    blocks, summary = planner.plan()
+    assert blocks == []
+    assert (summary["partial"], summary["unplanned"]) == (0, 1)
+
+
+def test_incremental_updates_match_a_fresh_plan():
+    rng = random.Random(7)
+    tasks = {}
+    for number in range(60):
+        due = MONDAY + rng.randrange(14)
+        task_id = f"r{number}@{date.fromordinal(due)}" if number % 4 == 0 else f"t{number}"
+        tasks[task_id] = task(task_id, str(date.fromordinal(due)), rng.randrange(10, 120),
+                              rng.choice(["low", "medium", "high"]))
+    planner = Planner()
+    now = None
+    for step in range(200):
+        change = rng.random()
+        if change < 0.3:
+            tasks[rng.choice(sorted(tasks))].extra["effort"] = rng.randrange(10, 120)
+        elif change < 0.5:
+            del tasks[rng.choice(sorted(tasks))]
+        elif change < 0.7:
+            tasks[f"n{step}"] = task(f"n{step}", str(date.fromordinal(MONDAY + rng.randrange(14))), 30)
+        else:
+            now = rng.randrange(500, 800)
+        slots = plan_slots(FREE, MONDAY, MONDAY + 13, now)
+        entries = [("daily", entry) for entry in tasks.values()]
+        planner.update(slots, entries if change < 0.7 else None)
+
+        fresh = Planner()
+        fresh.update(slots, entries)
+        assert planner.plan() == fresh.plan()
@@ -0,0 +1,20 @@
+import io
+
+from conftest import make_task
+from profiling import PROFILER
+
+
+def test_task_views_report_the_load(manager):
+    manager.repository.add("daily", make_task("Profiled", "2026-11-05"))
+    manager.save_tasks()
+    PROFILER.operations = {}
+    PROFILER.enable()
+    try:
+        manager.view_tasks(limit=5)
+        manager.write_tasks("json", out=io.StringIO())
+    finally:
+        PROFILER.disable()
+    operations, PROFILER.operations = PROFILER.operations, {}
+
+    assert operations["load_tasks"]["calls"] == 2
+    assert operations["view_tasks"]["calls"] == operations["write_tasks"]["calls"] == 1
@@ -0,0 +1,69 @@
+import pytest
+
+from conftest import make_task, seed
+from recurrence import RecurrenceRule
+from task_index import date_ordinal, ordinal_to_str
+
+
+def dates(rule, start, first, last):
+    return [ordinal_to_str(ordinal) for ordinal in
+            RecurrenceRule.parse(rule).occurrences(date_ordinal(start), date_ordinal(first), date_ordinal(last))]
+
+
+def test_rules_generate_only_the_requested_window():
+    assert dates("daily", "2026-11-04", "2026-11-01", "2026-11-06") == ["2026-11-04", "2026-11-05", "2026-11-06"]
+    assert dates("weekdays", "2026-11-01", "2026-11-06", "2026-11-09") == ["2026-11-06", "2026-11-09"]
+    assert dates("every 2 weeks", "2026-11-02", "2026-11-10", "2026-12-01") == ["2026-11-16", "2026-11-30"]
+    assert dates("monthly:31", "2026-01-31", "2026-02-01", "2026-04-30") == ["2026-02-28", "2026-03-31",
+                                                                              "2026-04-30"]
+    # Occurrences are generated lazily, so an open-ended window costs nothing up front
+    daily = RecurrenceRule.parse("daily").occurrences(date_ordinal("2026-11-04"), 1, date_ordinal("9999-12-31"))
+    assert ordinal_to_str(next(daily)) == "2026-11-04"
+
+
+@pytest.mark.parametrize("text", ["hourly", "daily:2", "weekly:0", "monthly:32", "every two weeks"])
+def test_invalid_rules_are_rejected(text):
+    with pytest.raises(ValueError):
+        RecurrenceRule.parse(text)
+
+
+@pytest.fixture
+def gym(manager):
+    return manager.add_recurring(["description=Gym", "rule=weekly", "start=2026-11-02", "until=2026-11-30",
+                                  "priority=high"])
+
+
+def test_occurrences_are_generated_and_completed_by_id(manager, gym):
+    recurring = manager.recurring
+    start, end = date_ordinal("2026-11-01"), date_ordinal("2026-12-31")
+
+    assert [task.id for _, task in recurring.occurrences(start, end)] == [
+        f"{gym}@2026-11-{day:02d}" for day in (2, 9, 16, 23, 30)]
+    assert manager.complete_task_by_id(f"{gym}@2026-11-09")
+    assert not manager.complete_task_by_id(f"{gym}@2026-11-10")
+
+    pending = [task.due_date for _, task in recurring.occurrences(start, end, pending_only=True)]
+    assert pending == ["2026-11-02", "2026-11-16", "2026-11-23", "2026-11-30"]
+    assert recurring.next_due(gym, date_ordinal("2026-11-05")) == "2026-11-16"
+
+
+def test_moving_the_start_keeps_completed_occurrences(manager, gym):
+    manager.complete_task_by_id(f"{gym}@2026-11-16")
+
+    assert manager.edit_task_by_id(gym, ["start=2026-11-09"])
+
+    assert manager.recurring.get(f"{gym}@2026-11-16").completed
+    assert not manager.recurring.get(f"{gym}@2026-11-23").completed
+    assert manager.recurring.get(f"{gym}@2026-11-02") is None
+
+
+def test_task_windows_merge_occurrences_with_stored_tasks(manager, gym):
+    manager.load_tasks()
+    seed(manager.repository, make_task("Essay", "2026-11-10"))
+
+    entries, matching = manager.task_window(date_ordinal("2026-11-08"), date_ordinal("2026-11-17"))
+
+    assert [task.description for _, task in entries] == ["Gym", "Essay", "Gym"]
+    assert matching == 3
+    assert manager.remove_task_by_id(gym)
+    assert manager.task_window(date_ordinal("2026-11-08"), date_ordinal("2026-11-17"))[1] == 1
@@ -0,0 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+import pytest
+
+from conftest import make_task, seed
+import repository as repository_module
+from repository import TaskRepository
+
+
+class LegacyExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor with the Python 3.7/3.8 shutdown() signature"""
+
+    def shutdown(self, wait=True):
+        super().shutdown(wait)
+
+
+def test_parallel_load_uses_a_py37_shutdown(repository, open_repository, monkeypatch):
+    seed(repository, *(make_task(f"Seed {day}", f"2026-11-{day + 1:02d}") for day in range(20)))
+    monkeypatch.setattr(repository_module, "ThreadPoolExecutor", LegacyExecutor)
+
+    loaded = open_repository(load_workers=4)
+
+    assert loaded._load_error is None
+    assert len(loaded.index) == 20
+
+
+def test_failed_load_never_overwrites_shards(repository, open_repository, monkeypatch, capsys):
+    seed(repository, make_task("Seed 0", "2026-11-01"))
+    shard_path = repository.shard_path("2026-11-01")
+    with open(shard_path, 'rb') as f:
+        before = f.read()
+
+    def broken(self, paths):
+        raise TypeError("simulated load failure")
+
+    monkeypatch.setattr(TaskRepository, "_read_shards", broken)
+    failed = open_repository()
+    failed.add("daily", make_task("Added after the failure", "2026-11-01"))
+    failed.save()
+    failed.compact()
+    with pytest.raises(OSError):
+        failed.add_many([("daily", make_task("Batch", "2026-11-01"))])
+
+    with open(shard_path, 'rb') as f:
+        assert f.read() == before
+    assert "Not saving 1 change(s)" in capsys.readouterr().err
+
+    monkeypatch.undo()
+    failed.save()
+    failed.compact()
+    with open(shard_path, encoding='utf-8') as f:
+        descriptions = [data["description"] for data in json.load(f)["daily"]]
+    assert descriptions == ["Seed 0", "Added after the failure"]
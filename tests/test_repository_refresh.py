@@ -0,0 +1,40 @@
+from conftest import make_task, seed
+
+
+def test_refresh_rereads_only_changed_shards(repository, open_repository):
+    first, second = seed(repository, make_task("First", "2026-11-05"), make_task("Second", "2026-11-06"))
+    other = open_repository()
+    untouched = other.shards["2026-11-05"]
+
+    repository.complete("daily", repository.get(second.id)[1])
+    repository.compact()
+    other.STAT_INTERVAL = 0
+    other.refresh()
+
+    assert other.shards["2026-11-05"] is untouched
+    assert other.get(second.id)[1].completed
+    assert not other.get(first.id)[1].completed
+
+
+def test_refresh_picks_up_new_and_deleted_shards(repository, open_repository):
+    (gone,) = seed(repository, make_task("Gone", "2026-11-05"))
+    other = open_repository()
+
+    repository.remove("daily", repository.get(gone.id)[1])
+    seed(repository, make_task("Added", "2026-11-07"))
+    other.STAT_INTERVAL = 0
+    other.refresh()
+
+    assert other.get(gone.id) is None
+    assert [task.description for _, task in other.sorted_tasks()] == ["Added"]
+
+
+def test_unsaved_changes_survive_a_refresh(repository):
+    seed(repository, make_task("First", "2026-11-05"))
+    pending = make_task("Pending", "2026-11-06")
+    repository.add("daily", pending)
+
+    repository.STAT_INTERVAL = 0
+    repository.refresh()
+
+    assert repository.get(pending.id)[1] is pending
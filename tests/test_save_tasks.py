@@ -0,0 +1,46 @@
+import os
+
+from conftest import make_task, seed
+
+
+def shard_files(repository, *due_dates):
+    return {due_date: os.stat(repository.shard_path(due_date)) for due_date in due_dates}
+
+
+def test_save_rewrites_only_dirty_shards(manager):
+    manager.load_tasks()
+    repository = manager.repository
+    first, second = seed(repository, make_task("First", "2026-11-05"), make_task("Second", "2026-11-06"))
+    before = shard_files(repository, "2026-11-05", "2026-11-06")
+
+    repository.complete("daily", second)
+    manager.save_tasks()
+    repository.compact()
+
+    after = shard_files(repository, "2026-11-05", "2026-11-06")
+    assert (after["2026-11-05"].st_ino, after["2026-11-05"].st_mtime_ns) == (
+        before["2026-11-05"].st_ino, before["2026-11-05"].st_mtime_ns)
+    assert after["2026-11-06"].st_ino != before["2026-11-06"].st_ino
+
+
+def test_save_without_changes_writes_nothing(manager):
+    manager.load_tasks()
+    seed(manager.repository, make_task("First", "2026-11-05"))
+    before = shard_files(manager.repository, "2026-11-05")
+
+    manager.save_tasks()
+
+    assert not os.path.exists(manager.repository.journal.path)
+    assert shard_files(manager.repository, "2026-11-05") == before
+
+
+def test_emptied_shards_are_removed(manager, open_repository):
+    manager.load_tasks()
+    (task,) = seed(manager.repository, make_task("Only", "2026-11-05"))
+
+    manager.repository.remove("daily", task)
+    manager.save_tasks()
+    manager.repository.compact()
+
+    assert not os.path.exists(manager.repository.shard_path("2026-11-05"))
+    assert len(open_repository().index) == 0
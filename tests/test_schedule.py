@@ -0,0 +1,44 @@
+import json
+import os
+
+import pytest
+
+SCHEDULE = {"schedule": {
+    "monday": [
+        {"time": "09:00-10:30", "subject": "Algebra", "professor": "Noether", "room": "A1"},
+        {"time": "soon", "subject": "Broken", "professor": "", "room": ""},
+    ],
+    "tuesday": [{"subject": "No time"}],
+}}
+
+
+@pytest.fixture
+def scheduled(manager):
+    os.makedirs(os.path.dirname(manager.schedule_path), exist_ok=True)
+    with open(manager.schedule_path, 'w', encoding='utf-8') as f:
+        json.dump(SCHEDULE, f)
+    return manager
+
+
+def test_malformed_sessions_keep_json_output_clean(scheduled, capsys):
+    scheduled.write_schedule("json")
+
+    out, err = capsys.readouterr()
+    monday = json.loads(out)["schedule"]["monday"]
+    assert [session["time"] for session in monday["sessions"]] == ["09:00-10:30"]
+    assert monday["free"] == ["10:30-13:00", "15:00-19:00"]
+    assert "Skipping session with invalid time on monday: soon" in err
+    assert "Skipping session with invalid time on tuesday" in err
+
+
+def test_malformed_sessions_keep_tsv_output_clean(scheduled, capsys):
+    scheduled.write_schedule("tsv")
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split('\t') == ["day", "kind", "time", "subject", "professor", "room"]
+    assert all(len(line.split('\t')) == 6 for line in lines)
+
+
+def test_malformed_sessions_keep_the_json_plan_clean(scheduled, capsys):
+    scheduled.plan_tasks(1, "json")
+    assert json.loads(capsys.readouterr().out)["summary"]["pending"] == 0
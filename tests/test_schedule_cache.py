@@ -0,0 +1,55 @@
+import json
+import os
+
+from schedule_cache import ScheduleCache
+
+
+def write(path, data, mtime_ns=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_schedule_is_reread_only_after_a_change(tmp_path):
+    path = str(tmp_path / "schedule.json")
+    write(path, {"schedule": {}}, mtime_ns=10 ** 18)
+    cache = ScheduleCache(path)
+
+    first, changed = cache.load()
+    assert changed
+    assert cache.load() == (first, False)
+
+    write(path, {"schedule": {"monday": []}}, mtime_ns=10 ** 18 + 1)
+    assert cache.load() == ({"schedule": {"monday": []}}, True)
+
+
+def test_unsaved_edits_win_until_saved(tmp_path):
+    path = str(tmp_path / "schedule" / "schedule.json")
+    cache = ScheduleCache(path)
+    edited = {"schedule": {"friday": [{"time": "09:00-10:00"}]}}
+
+    cache.mark_modified(edited)
+    assert cache.load() == (edited, False)
+    cache.save(edited)
+
+    assert cache.load() == (edited, False)
+    assert ScheduleCache(path).load() == (edited, True)
+
+
+def test_manager_analyzes_the_schedule_once_per_change(manager, monkeypatch):
+    os.makedirs(os.path.dirname(manager.schedule_path), exist_ok=True)
+    write(manager.schedule_path, {"schedule": {"monday": [{"time": "09:00-12:00"}]}}, mtime_ns=10 ** 18)
+    calls = []
+    analyze = manager.analyze_schedule
+    monkeypatch.setattr(manager, "analyze_schedule", lambda: calls.append(1) or analyze())
+
+    manager.load_class_schedule(interactive=False)
+    manager.load_class_schedule(interactive=False)
+    assert len(calls) == 1
+    assert manager.free_slots["monday"][0] == (720, 780)
+
+    write(manager.schedule_path, {"schedule": {}}, mtime_ns=10 ** 18 + 1)
+    manager.load_class_schedule(interactive=False)
+    assert len(calls) == 2
+    assert manager.free_slots["monday"][0] == (540, 780)
@@ -0,0 +1,52 @@
+import json
+import os
+
+from conftest import make_task, seed
+from shard_layout import list_shards, migrate_flat_layout, remove_shard, shard_path
+from task_index import date_ordinal
+
+
+def write_flat(tasks_dir, due_date, description):
+    os.makedirs(tasks_dir, exist_ok=True)
+    path = os.path.join(tasks_dir, f"tasks_{due_date}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"daily": [{"description": description, "due_date": due_date, "completed": False}],
+                   "monthly": []}, f)
+    return path
+
+
+def test_shards_are_partitioned_by_year_and_month(tasks_dir):
+    assert shard_path(tasks_dir, "2026-11-05") == os.path.join(tasks_dir, "2026", "11", "tasks_2026-11-05.json")
+    assert shard_path(tasks_dir, "someday") == os.path.join(tasks_dir, "tasks_someday.json")
+
+
+def test_flat_files_move_into_the_layout_on_load(tasks_dir, open_repository):
+    flat = write_flat(tasks_dir, "2026-11-05", "Essay")
+    undated = write_flat(tasks_dir, "someday", "Undated")
+
+    repository = open_repository()
+
+    assert not os.path.exists(flat)
+    assert os.path.exists(shard_path(tasks_dir, "2026-11-05"))
+    assert os.path.exists(undated)
+    assert sorted(task.description for _, task in repository.sorted_tasks()) == ["Essay", "Undated"]
+    assert migrate_flat_layout(tasks_dir) == 0
+
+
+def test_range_listing_skips_other_months(tasks_dir, repository):
+    seed(repository, *(make_task(f"Task {due}", due) for due in ("2026-10-31", "2026-11-05", "2026-12-01")))
+    write_flat(tasks_dir, "someday", "Undated")
+
+    listed = list_shards(tasks_dir, date_ordinal("2026-11-01"), date_ordinal("2026-11-30"))
+
+    assert sorted(listed) == ["2026-11-05", "someday"]
+
+
+def test_removing_the_last_shard_prunes_empty_directories(tasks_dir, repository):
+    seed(repository, make_task("Only", "2026-11-05"))
+    path = shard_path(tasks_dir, "2026-11-05")
+
+    remove_shard(tasks_dir, path)
+
+    assert not os.path.exists(os.path.join(tasks_dir, "2026"))
+    assert os.path.exists(tasks_dir)
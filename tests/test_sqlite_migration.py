@@ -0,0 +1,85 @@
+import os
+import sqlite3
+
+from conftest import make_task, seed
+from sqlite_store import SQLiteTaskRepository
+
+
+def test_migration_copies_shards_and_uncompacted_journal(tmp_path, tasks_dir, style, repository, capsys):
+    edited, done, gone = seed(repository, make_task("Edit me", "2026-11-05"), make_task("Finish", "2026-11-05"),
+                              make_task("Drop", "2026-11-06"))
+    was = edited.to_dict()
+    edited.apply({"priority": "high", "notes": "from the journal"})
+    repository.update("daily", edited, was["due_date"], was)
+    repository.complete("daily", done)
+    repository.remove("daily", gone)
+    repository.add("daily", make_task("Journal only", "2026-11-07"))
+    repository.save()
+    assert os.path.exists(repository.journal.path)
+    capsys.readouterr()
+
+    store = SQLiteTaskRepository(str(tmp_path / 'tasks.db'), tasks_dir, style)
+    store.load()
+
+    tasks = {task.description: task for _, task in store.sorted_tasks()}
+    assert sorted(tasks) == ["Edit me", "Finish", "Journal only"]
+    assert tasks["Edit me"].priority == "high"
+    assert tasks["Edit me"].get("notes") == "from the journal"
+    assert tasks["Finish"].completed
+    assert store.get(edited.id) is not None
+
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert "Migrated 3 tasks" in err
+
+
+def test_migration_runs_only_for_a_new_database(tmp_path, tasks_dir, style, repository):
+    repository.add("daily", make_task("Once", "2026-11-05"))
+    repository.save()
+    db_path = str(tmp_path / 'tasks.db')
+    SQLiteTaskRepository(db_path, tasks_dir, style).load()
+
+    store = SQLiteTaskRepository(db_path, tasks_dir, style)
+    store.load()
+    assert [task.description for _, task in store.sorted_tasks()] == ["Once"]
+
+
+def test_migration_without_json_data(tmp_path, style):
+    store = SQLiteTaskRepository(str(tmp_path / 'tasks.db'), str(tmp_path / 'missing'), style)
+    store.load()
+    assert store.stats() == (0, 0)
+
+
+def test_corrupt_shard_aborts_the_migration(tmp_path, tasks_dir, style, repository, capsys):
+    seed(repository, make_task("Readable", "2026-11-05"), make_task("Lost?", "2026-11-06"))
+    broken = repository.shard_path("2026-11-06")
+    with open(broken, 'rb') as f:
+        good = f.read()
+    with open(broken, 'wb') as f:
+        f.write(good[:20])
+    db_path = str(tmp_path / 'tasks.db')
+
+    store = SQLiteTaskRepository(db_path, tasks_dir, style)
+    store.load()
+    assert "tasks_2026-11-06.json" in capsys.readouterr().err
+    assert not os.path.exists(db_path)
+
+    with open(broken, 'wb') as f:
+        f.write(good)
+    store = SQLiteTaskRepository(db_path, tasks_dir, style)
+    store.load()
+    assert sorted(task.description for _, task in store.sorted_tasks()) == ["Lost?", "Readable"]
+
+
+def test_database_from_before_the_marker_is_not_migrated_again(tmp_path, tasks_dir, style, repository):
+    seed(repository, make_task("Once", "2026-11-05"))
+    db_path = str(tmp_path / 'tasks.db')
+    SQLiteTaskRepository(db_path, tasks_dir, style).load()
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("DROP TABLE meta")
+    conn.close()
+
+    store = SQLiteTaskRepository(db_path, tasks_dir, style)
+    store.load()
+    assert [task.description for _, task in store.sorted_tasks()] == ["Once"]
@@ -0,0 +1,71 @@
+import pytest
+
+from conftest import make_task
+from sqlite_store import SQLiteTaskRepository
+from task_index import date_ordinal
+
+
+@pytest.fixture
+def open_store(tmp_path, style):
+    def open_store():
+        store = SQLiteTaskRepository(str(tmp_path / 'tasks.db'), None, style)
+        store.load()
+        return store
+    return open_store
+
+
+def test_mutations_survive_a_reopen(open_store):
+    store = open_store()
+    kept, done, gone = (make_task("Keep", "2026-11-05", notes="n"), make_task("Done", "2026-11-06"),
+                        make_task("Gone", "2026-11-07"))
+    store.add_many([("daily", kept), ("daily", done), ("monthly", gone)])
+    kept.apply({"due_date": "2026-11-08", "priority": "high"})
+    store.update("daily", kept)
+    store.complete("daily", done)
+    store.remove("monthly", gone)
+    store.save()
+
+    reopened = open_store()
+    tasks = {task.description: (task_type, task) for task_type, task in reopened.sorted_tasks()}
+    assert sorted(tasks) == ["Done", "Keep"]
+    assert tasks["Keep"][1].due_date == "2026-11-08"
+    assert tasks["Keep"][1].get("notes") == "n"
+    assert tasks["Done"][1].completed
+    assert reopened.get(kept.id)[1].priority == "high"
+    assert reopened.get(gone.id) is None
+
+
+def test_range_queries_and_counters(open_store):
+    store = open_store()
+    store.add_many([("daily", make_task(f"Day {day}", f"2026-11-{day:02d}", completed=day == 2))
+                    for day in range(1, 6)])
+
+    between = store.tasks_between(date_ordinal("2026-11-02"), date_ordinal("2026-11-04"))
+    assert [task.description for _, task in between] == ["Day 2", "Day 3", "Day 4"]
+    entries, matching = store.window(pending_only=True, offset=1, limit=2)
+    assert matching == 4
+    assert [task.description for _, task in entries] == ["Day 3", "Day 4"]
+    summary = store.summary(today=date_ordinal("2026-11-03"))
+    assert (summary["total"], summary["completed"], summary["overdue"], summary["due_today"]) == (5, 1, 1, 1)
+
+
+def test_filters_use_the_indexes(open_store):
+    store = open_store()
+
+    def plan(sql, *params):
+        return " ".join(row[-1] for row in store.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+    assert "idx_tasks_due_date" in plan("SELECT id FROM tasks WHERE due_date BETWEEN ? AND ?", "a", "b")
+    assert "idx_tasks_completed" in plan("SELECT COUNT(*) FROM tasks WHERE completed = 0")
+    assert "idx_tasks_priority" in plan("SELECT id FROM tasks WHERE priority = ?", "high")
+
+
+def test_manager_selects_the_sqlite_backend(open_manager, tmp_path):
+    manager = open_manager(storage="sqlite")
+    manager.load_tasks()
+    manager.repository.add("daily", make_task("Essay", "2026-11-05"))
+    manager.save_tasks()
+
+    assert isinstance(manager.repository, SQLiteTaskRepository)
+    assert (tmp_path / "tasks.db").exists()
+    assert [task.description for _, task in open_manager(storage="sqlite").repository.sorted_tasks()] == ["Essay"]
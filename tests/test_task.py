@@ -0,0 +1,46 @@
+import pytest
+
+from task import PRIORITIES, Task, parse_changes, parse_effort
+
+
+def test_shard_entries_round_trip_unchanged():
+    data = {"id": "a1b2c3d4", "description": "Essay", "due_date": "2026-11-05", "completed": True,
+            "priority": "high", "notes": "draft", "custom": [1, 2]}
+
+    task = Task.from_dict("daily", dict(data))
+
+    assert task.to_dict() == data
+    assert isinstance(task.due, int)
+    assert task.priority is PRIORITIES[0]
+    assert not hasattr(task, "__dict__")
+
+
+def test_invalid_due_dates_and_missing_fields_are_kept():
+    task = Task.from_dict("monthly", {"description": "Someday", "due_date": "soon"})
+
+    assert (task.due, task.due_date) == (0, "soon")
+    assert task.to_dict() == {"description": "Someday", "due_date": "soon", "completed": False}
+    task.due_date = "2026-11-05"
+    assert not task.extra
+    assert task.to_dict()["due_date"] == "2026-11-05"
+
+
+def test_apply_sets_core_fields_and_removes_empty_extras():
+    task = Task("daily", "Essay", "2026-11-05", extra={"notes": "draft"})
+
+    task.apply(parse_changes(["priority=HIGH", "notes=", "category=uni", "completed=yes", "effort=1h30"]))
+
+    assert (task.priority, task.completed) == ("high", True)
+    assert task.get("notes") is None
+    assert (task.get("category"), task.get("effort")) == ("uni", 90)
+
+
+@pytest.mark.parametrize("assignment", ["colour=red", "due_date=2026-02-30", "priority=urgent", "description=",
+                                        "effort=0", "effort=soon"])
+def test_invalid_changes_are_rejected(assignment):
+    with pytest.raises(ValueError):
+        parse_changes([assignment])
+
+
+def test_effort_accepts_minutes_and_hours():
+    assert [parse_effort(value) for value in ("90", "45m", "1.5h", "1h30", "2H")] == [90, 45, 90, 90, 120]
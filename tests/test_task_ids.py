@@ -0,0 +1,57 @@
+import json
+import os
+
+import pytest
+
+from conftest import make_task, seed
+
+
+def test_legacy_tasks_get_stable_ids_once(tasks_dir, open_repository):
+    path = os.path.join(tasks_dir, "2026", "11", "tasks_2026-11-05.json")
+    os.makedirs(os.path.dirname(path))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"daily": [{"description": "Old", "due_date": "2026-11-05", "completed": False}], "monthly": []}, f)
+
+    (_, task), = open_repository().sorted_tasks()
+
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)["daily"][0]["id"] == task.id
+    assert open_repository().get(task.id)[1].description == "Old"
+    assert "#" not in task.id and len(task.id) == 8
+
+
+def run_command(time_master, *argv):
+    args = time_master.build_parser().parse_args(list(argv))
+    with pytest.raises(SystemExit) as exit_info:
+        time_master.handle_arguments(args)
+    return exit_info.value.code
+
+
+@pytest.fixture
+def seeded(time_master):
+    time_master.manager.load_tasks()
+    return seed(time_master.manager.repository, make_task("Essay", "2026-11-05"), make_task("Quiz", "2026-11-06"))
+
+
+def test_commands_act_on_task_ids(time_master, seeded, open_repository):
+    essay, quiz = seeded
+
+    assert run_command(time_master, "--complete", essay.id) == 0
+    assert run_command(time_master, "--edit", f"#{quiz.id}", "priority=high", "due_date=2026-11-09") == 0
+    assert run_command(time_master, "--remove", essay.id) == 0
+
+    (_, task), = open_repository().sorted_tasks()
+    assert (task.id, task.priority, task.due_date) == (quiz.id, "high", "2026-11-09")
+
+
+def test_unknown_ids_and_bad_edits_fail(time_master, seeded, capsys):
+    essay, _ = seeded
+
+    assert run_command(time_master, "--complete", "missing") == 1
+    assert run_command(time_master, "--edit", essay.id, "priority=urgent") == 1
+    assert run_command(time_master, "--edit", essay.id) == 2
+
+    err = capsys.readouterr().err
+    assert "No task with id missing" in err
+    assert "Invalid change" in err
+    assert time_master.manager.repository.get(essay.id)[1].priority == "medium"
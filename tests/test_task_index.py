@@ -0,0 +1,52 @@
+from conftest import make_task
+from task_index import DueDateIndex, date_ordinal
+
+
+def descriptions(entries):
+    return [task.description for _, task in entries]
+
+
+def test_index_orders_by_due_date_then_status():
+    late, done, early = (make_task("Late", "2026-11-09"), make_task("Done", "2026-11-05", completed=True),
+                         make_task("Early", "2026-11-05"))
+    index = DueDateIndex([late, done, early])
+
+    assert descriptions(index) == ["Early", "Done", "Late"]
+    assert (len(index), index.completed, len(index.pending)) == (3, 1, 2)
+
+
+def test_updates_move_tasks_and_keep_counters():
+    first, second = make_task("First", "2026-11-05"), make_task("Second", "2026-11-06")
+    index = DueDateIndex([first, second])
+
+    first.due_date = "2026-11-07"
+    first.completed = True
+    index.update(first)
+    index.remove(second)
+    index.remove(second)
+    index.insert(make_task("Third", "2026-11-01"))
+
+    assert descriptions(index) == ["Third", "First"]
+    assert (index.completed, descriptions(index.pending)) == (1, ["Third"])
+
+
+def test_range_and_window_queries():
+    index = DueDateIndex(make_task(f"Day {day}", f"2026-11-{day:02d}") for day in range(1, 8))
+    start, end = date_ordinal("2026-11-03"), date_ordinal("2026-11-05")
+
+    assert descriptions(index.between(start, end)) == ["Day 3", "Day 4", "Day 5"]
+    assert descriptions(index.between(None, start - 1)) == ["Day 1", "Day 2"]
+    entries, matching = index.window(start, None, offset=1, limit=2)
+    assert (descriptions(entries), matching) == (["Day 4", "Day 5"], 5)
+    assert index.window(start, end, offset=10) == ([], 3)
+
+
+def test_repository_date_queries(repository):
+    repository.add_many([("daily", make_task(name, due)) for name, due in [
+        ("Overdue", "2026-11-01"), ("Today", "2026-11-04"), ("Sunday", "2026-11-08"), ("Next week", "2026-11-10")]])
+    today = date_ordinal("2026-11-04")
+
+    assert descriptions(repository.overdue(today)) == ["Overdue"]
+    assert descriptions(repository.due_today(today)) == ["Today"]
+    assert descriptions(repository.due_this_week(today)) == ["Today", "Sunday"]
+    assert descriptions(repository.due_within(7, today)) == ["Today", "Sunday", "Next week"]
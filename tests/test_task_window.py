@@ -0,0 +1,46 @@
+from conftest import make_task, seed
+
+
+def seed_days(manager, count=10):
+    manager.load_tasks()
+    return seed(manager.repository, *(make_task(f"Task {day}", f"2099-01-{day:02d}", completed=day % 4 == 0)
+                                      for day in range(1, count + 1)))
+
+
+def test_view_formats_only_the_requested_window(manager, capsys):
+    seed_days(manager)
+
+    assert manager.view_tasks(limit=3, offset=2) == 10
+
+    out = capsys.readouterr().out
+    assert [task.description for _, task in manager.task_list] == ["Task 3", "Task 4", "Task 5"]
+    assert "Task 2 " not in out and "Task 6 " not in out
+    assert "Showing 3-5 of 10 matching tasks" in out
+    assert "Total Tasks: 10" in out
+
+
+def test_pending_window_skips_completed_tasks(manager, capsys):
+    seed_days(manager)
+
+    assert manager.view_tasks(limit=3, offset=2, pending_only=True) == 8
+
+    assert [task.description for _, task in manager.task_list] == ["Task 3", "Task 5", "Task 6"]
+    assert "Showing 3-5 of 8 matching tasks" in capsys.readouterr().out
+
+
+def test_pager_moves_between_pages(manager, monkeypatch, capsys):
+    seed_days(manager, 5)
+    answers = iter(["n", "n", "n", "p", "f", "q"])
+    offsets = []
+    view_tasks = manager.view_tasks
+
+    def record_offset(limit, offset, *args):
+        offsets.append(offset)
+        return view_tasks(limit, offset, *args)
+
+    monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+    monkeypatch.setattr(manager, "view_tasks", record_offset)
+
+    manager.page_tasks(page_size=2)
+
+    assert offsets == [0, 2, 4, 4, 2, 0]